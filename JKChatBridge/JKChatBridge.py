@@ -1,16 +1,25 @@
 import asyncio
 import discord
 from redbot.core import Config, commands
-import aiofiles
-import os
-import socket
-from concurrent.futures import ThreadPoolExecutor
-import re
+from redbot.core.data_manager import cog_data_path
 import time
 import logging
 import aiohttp
 from urllib.parse import quote
-import random
+import re
+import shlex
+from datetime import datetime, timezone
+from .bridgetext import latin1_name, to_latin1
+from .archive import ChatArchive, mask_ip
+from .classifier import EVENT_CHAT, EVENT_JOIN, parse_chat_line, remove_color_codes
+from .emotes import EmoteEngine
+from .outbox import DiscordOutbox
+from .server import ServerMonitor
+from .settings import PROFILE_FIELDS, BridgeSettings, ProfileSettings
+from .stats import LEADERBOARD_FIELDS, stat_value
+from .tracker import TrackerError
+from .vpn import VPNChecker
+from .watchdog import Watchdog
 
 # Set up logging
 logging.basicConfig(level=logging.DEBUG)
@@ -19,345 +28,155 @@ logger = logging.getLogger("JKChatBridge")
 class JKChatBridge(commands.Cog):
     """Bridges public chat between Jedi Knight: Jedi Academy and Discord using RCON and log monitoring."""
 
-    # === Adjustable Random Chat Settings ===
-    RANDOM_CHAT_INTERVAL = 360   # 6 minutes
-    RANDOM_CHAT_CHANCE = 0.4     # 40%
+    LEADERBOARD_MAX_ACCOUNTS = 50
+
+    RELAY_THROTTLED_REACTION = "⏳"  # marks Discord messages not relayed because the sender is flooding
+
+    # === Log Reader Watchdog ===
+    WATCHDOG_INTERVAL = 10       # seconds between liveness checks
+    WATCHDOG_STALL_AFTER = 60    # seconds a reader may sit on unread bytes before it is restarted
+
+    # === Server Profiles ===
+    PROFILE_NAME_RE = re.compile(r"^[\w-]{1,32}$")
+    DEFAULT_PROFILE = "default"
+
+    # === Archive Search ===
+    SEARCH_DURATION_RE = re.compile(r"^(\d+)([mhdw])$")
+    SEARCH_UNITS = {"m": 60, "h": 3600, "d": 86400, "w": 604800}
 
     def __init__(self, bot):
         self.bot = bot
         self.config = Config.get_conf(self, identifier=1234567890, force_registration=True)
         self.config.register_global(
+            # Single-server settings from before profiles; moved into the "default" profile on load.
             log_base_path=None,
             discord_channel_id=None,
             rcon_host=None,
             rcon_port=None,
             rcon_password=None,
-            custom_emoji=None,
             join_disconnect_enabled=True,
-            vpn_api_key=None,
-            vpn_check_enabled=False,
             tracker_url=None,
             bot_name=None,
             random_chat_path=None,
-            vpn_auto_kick=False
+            log_position={},
+            parser_worker=False,
+            # Shared by every server
+            custom_emoji=None,
+            vpn_api_key=None,
+            vpn_check_enabled=False,
+            vpn_auto_kick=False,
+            archive_retention_days=90,
+            emotes={},
+            emotes_customized=False,
+            profiles={},
+            selected_profile=self.DEFAULT_PROFILE
+        )
+        self.settings = BridgeSettings()
+        self.servers = {}           # profile name -> ServerMonitor
+        self.channel_servers = {}   # Discord channel ID -> ServerMonitor
+        self.outbox = DiscordOutbox()
+        self.emotes = EmoteEngine()
+        self.session = None
+        self.vpn_checker = None
+        self.archive = None
+        self.watchdog = Watchdog(
+            self.servers.values, interval=self.WATCHDOG_INTERVAL, stall_after=self.WATCHDOG_STALL_AFTER
         )
-        self.executor = ThreadPoolExecutor(max_workers=2)
-        self.monitoring = False
-        self.monitor_task = None
-        self.random_chat_task = None
-        self.is_restarting = False
-        self.restart_map = None
-        self.last_welcome_time = 0
-        self.random_chat_lines = []
-        self.start_monitoring()
-        self.bot.loop.create_task(self._start_random_chat_when_ready())
-        self.bot.loop.create_task(self.auto_reload_monitor())
 
     async def cog_load(self) -> None:
         logger.debug("Cog loaded.")
-        await self.load_random_chat_lines()
-
-    async def _start_random_chat_when_ready(self):
-        await self.bot.wait_until_ready()
-        await self.start_random_chat_task()
-
-    async def load_random_chat_lines(self):
-        path = await self.config.random_chat_path()
-        self.random_chat_lines = []
-        if not path or not os.path.exists(path):
+        await self._migrate_single_server_settings()
+        self.settings = await BridgeSettings.load(self.config)
+        if self.settings.emotes and not self.settings.emotes_customized:
+            # Saved before the flag existed
+            await self.update_setting("emotes_customized", True)
+        self.emotes = EmoteEngine(self.settings.emotes if self.settings.emotes_customized else None)
+        self.session = aiohttp.ClientSession()
+        self.vpn_checker = VPNChecker(self.session, str(cog_data_path(self) / "vpn_cache.json"))
+        await self.vpn_checker.load()
+        self.vpn_checker.start()
+        self.archive = ChatArchive(
+            cog_data_path(self) / "archive.sqlite3", retention_days=self.settings.archive_retention_days
+        )
+        await self.archive.start()
+        profiles = await self.config.profiles()
+        for name, data in profiles.items():
+            self.servers[name] = ServerMonitor(self, name, ProfileSettings.from_dict(data))
+        if self.settings.selected_profile not in self.servers:
+            self.settings.selected_profile = next(iter(self.servers))
+        self.rebuild_channel_map()
+        await asyncio.gather(*(self._start_server(server) for server in self.servers.values()))
+        self.watchdog.start()
+
+    async def _migrate_single_server_settings(self):
+        """Move the pre-profile global server settings into the "default" profile, once."""
+        if await self.config.profiles():
             return
+        data = await self.config.all()
+        profile = ProfileSettings.from_dict(data).to_dict()
+        profile["log_position"] = data["log_position"]
+        await self.config.profiles.set_raw(self.DEFAULT_PROFILE, value=profile)
+        for key in PROFILE_FIELDS + ("log_position",):
+            await getattr(self.config, key).clear()
+        logger.info("Moved server settings into the 'default' profile.")
+
+    async def _start_server(self, server):
+        # A server that fails to start must not keep the others from starting.
         try:
-            async with aiofiles.open(path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = await f.read()
-            lines = [line.strip() for line in content.splitlines() if line.strip() and not line.strip().startswith('#')]
-            self.random_chat_lines = lines
-            logger.info(f"Loaded {len(lines)} random chat lines from {path}")
+            await server.start()
         except Exception as e:
-            logger.error(f"Failed to load random chat lines: {e}")
-
-    async def start_random_chat_task(self):
-        if self.random_chat_task and not self.random_chat_task.done():
-            self.random_chat_task.cancel()
-            try:
-                await self.random_chat_task
-            except asyncio.CancelledError:
-                pass
-        self.random_chat_task = self.bot.loop.create_task(self.random_chat_loop())
+            logger.error(f"Failed to start server '{server.name}': {e}")
+
+    @property
+    def selected_server(self):
+        """The server profile the setting commands apply to."""
+        return self.servers.get(self.settings.selected_profile)
+
+    def server_for(self, channel):
+        """The server bridged to ``channel``, else the selected one."""
+        server = self.channel_servers.get(getattr(channel, "id", None))
+        return server or self.selected_server
+
+    def rebuild_channel_map(self):
+        self.channel_servers = {
+            server.settings.discord_channel_id: server
+            for server in self.servers.values() if server.settings.discord_channel_id
+        }
 
-    async def random_chat_loop(self):
-        while True:
-            try:
-                await asyncio.sleep(self.RANDOM_CHAT_INTERVAL)
-                if not await self.validate_rcon_settings():
-                    continue
-                bot_name = await self.config.bot_name()
-                if not bot_name or not self.random_chat_lines:
-                    continue
-                if random.random() > self.RANDOM_CHAT_CHANCE:
-                    continue
-                line = random.choice(self.random_chat_lines)
-                command = f"sayasbot {bot_name} {line}"
-                await self.bot.loop.run_in_executor(
-                    self.executor,
-                    self.send_rcon_command,
-                    command,
-                    await self.config.rcon_host(),
-                    await self.config.rcon_port(),
-                    await self.config.rcon_password()
-                )
-            except Exception as e:
-                logger.error(f"Error in random_chat_loop: {e}")
-                await asyncio.sleep(60)
+    async def update_setting(self, name, value):
+        """Write a setting to Config and to the in-memory snapshot."""
+        await getattr(self.config, name).set(value)
+        setattr(self.settings, name, value)
 
-    async def auto_reload_monitor(self):
-        """Silent reload every 5 min - no ctx needed"""
-        while True:
-            try:
-                await asyncio.sleep(300)
-                if self.monitor_task and not self.monitor_task.done():
-                    self.monitoring = False
-                    self.monitor_task.cancel()
-                    try:
-                        await self.monitor_task
-                    except asyncio.CancelledError:
-                        pass
-                await asyncio.sleep(0.5)
-                self.is_restarting = False
-                self.restart_map = None
-                self.start_monitoring()
-                logger.debug("Auto-reload triggered")
-            except Exception as e:
-                logger.error(f"Auto-reload error: {e}")
-                await asyncio.sleep(300)
-
-    async def validate_rcon_settings(self) -> bool:
-        return all([
-            await self.config.rcon_host(),
-            await self.config.rcon_port(),
-            await self.config.rcon_password()
-        ])
-
-    def send_rcon_command(self, command, host, port, password):
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        sock.settimeout(1)
-        cmd = self.clean_for_latin1(command)
-        pwd = self.clean_for_latin1(password)
-        packet = b'\xff\xff\xff\xffrcon ' + pwd.encode('latin-1') + b' ' + cmd.encode('latin-1')
-        try:
-            sock.sendto(packet, (host, port))
-            time.sleep(0.1)
-            response = b""
-            start = time.time()
-            while time.time() - start < 5:
-                try:
-                    data, _ = sock.recvfrom(16384)
-                    response += data
-                except socket.timeout:
-                    break
-            return response
-        except Exception as e:
-            raise Exception(f"RCON error: {e}")
-        finally:
-            sock.close()
+    async def save_emotes(self):
+        await self.update_setting("emotes", self.emotes.table)
+        await self.update_setting("emotes_customized", True)
 
-    async def send_welcome_message(self, message: str):
-        await asyncio.sleep(5)
-        try:
-            await self.bot.loop.run_in_executor(
-                self.executor, self.send_rcon_command,
-                message, await self.config.rcon_host(),
-                await self.config.rcon_port(), await self.config.rcon_password()
-            )
-        except Exception as e:
-            logger.error(f"Welcome message failed: {e}")
+    async def update_server_setting(self, name, value):
+        """Write a setting of the selected server profile."""
+        server = self.selected_server
+        await server.update_setting(name, value)
+        if name == "discord_channel_id":
+            self.rebuild_channel_map()
+        return server
 
     def clean_for_latin1(self, text):
-        return ''.join(c if ord(c) < 256 else '' for c in text)
+        return to_latin1(text)
 
     def remove_color_codes(self, text):
-        return re.sub(r'\^\d', '', text or '')
+        return remove_color_codes(text)
 
     def parse_chat_line(self, line):
-        say_idx = line.find("say: ")
-        if say_idx == -1:
-            return None, None
-        chat = line[say_idx + 5:]
-        colon_idx = chat.find(": ")
-        if colon_idx == -1:
-            return None, None
-        name = self.remove_color_codes(chat[:colon_idx].strip())
-        msg = self.remove_color_codes(chat[colon_idx + 2:].strip())
-        return name, msg
-
-    def start_monitoring(self):
-        if self.monitor_task and not self.monitor_task.done():
-            logger.debug("Monitor task already running.")
-            return
-        logger.info("Starting log monitor task.")
-        self.monitor_task = self.bot.loop.create_task(self.monitor_log())
-
-    async def monitor_log(self):
-        self.monitoring = True
-        log_file = os.path.join(await self.config.log_base_path(), "qconsole.log")
-
-        while self.monitoring:
-            try:
-                channel_id = await self.config.discord_channel_id()
-                if not all([await self.config.log_base_path(), channel_id]):
-                    logger.warning("Missing configuration, pausing monitor.")
-                    await asyncio.sleep(5)
-                    continue
-
-                channel = self.bot.get_channel(channel_id)
-                if not channel:
-                    logger.warning(f"Channel not found: {channel_id}")
-                    await asyncio.sleep(5)
-                    continue
-
-                if not os.path.exists(log_file):
-                    logger.error(f"Log file not found: {log_file}")
-                    await asyncio.sleep(5)
-                    continue
-
-                async with aiofiles.open(log_file, mode='r', encoding='latin-1') as f:
-                    await f.seek(0, 2)
-                    while self.monitoring:
-                        line = await f.readline()
-                        if not line:
-                            await asyncio.sleep(0.1)
-                            continue
-                        line = line.strip()
-
-                        # VPN Detection
-                        if "info: IP: " in line and await self.config.vpn_check_enabled():
-                            parts = line.split()
-                            if len(parts) >= 6:
-                                ip = parts[4]
-                                player_id_str = parts[-1]
-                                if player_id_str.isdigit():
-                                    player_id = int(player_id_str)
-                                    logger.info(f"VPN check triggered for Player ID {player_id} | IP {ip}")
-                                    self.bot.loop.create_task(self._handle_vpn_check(player_id, ip))
-                            continue
-
-                        # Game chat
-                        if "say:" in line and "tell:" not in line and "[Discord]" not in line:
-                            player_name, message = self.parse_chat_line(line)
-                            if player_name and message:
-                                message = self.replace_text_emotes_with_emojis(message)
-                                await channel.send(f"**{player_name}**: {message}")
-
-                        # Duel
-                        elif "duel:" in line and "won a duel against" in line:
-                            parts = line.split("duel:")[1].split("won a duel against")
-                            if len(parts) == 2:
-                                winner = parts[0].strip()
-                                loser = parts[1].strip()
-                                if await self.validate_rcon_settings():
-                                    bot_name = await self.config.bot_name()
-                                    if bot_name:
-                                        msg = f"sayasbot {bot_name} {winner} ^7has defeated {loser} ^7in a duel^5! :trophy:"
-                                        await self.bot.loop.run_in_executor(
-                                            self.executor, self.send_rcon_command,
-                                            msg, await self.config.rcon_host(),
-                                            await self.config.rcon_port(), await self.config.rcon_password()
-                                        )
-
-                        # Restart
-                        elif "ShutdownGame:" in line and not self.is_restarting:
-                            self.is_restarting = True
-                            await channel.send("⚠️ **Standby**: Server integration suspended while map changes or server restarts.")
-                            self.bot.loop.create_task(self.reset_restart_flag(channel))
-                        elif "------ Server Initialization ------" in line and not self.is_restarting:
-                            self.is_restarting = True
-                            await channel.send("⚠️ **Standby**: Server integration suspended while map changes or server restarts.")
-                            self.bot.loop.create_task(self.reset_restart_flag(channel))
-
-                        elif "Server: " in line and self.is_restarting:
-                            self.restart_map = line.split("Server: ")[1].strip()
-                            await asyncio.sleep(10)
-                            if self.restart_map:
-                                await channel.send(f"✅ **Server Integration Resumed**: Map {self.restart_map} loaded.")
-                            self.is_restarting = False
-                            self.restart_map = None
-
-                        # Join
-                        elif "Going from CS_PRIMED to CS_ACTIVE for" in line:
-                            join_name = line.split("Going from CS_PRIMED to CS_ACTIVE for ")[1].strip()
-                            join_name_clean = self.remove_color_codes(join_name)
-                            if not join_name_clean.endswith("-Bot") and not self.is_restarting:
-                                if await self.config.join_disconnect_enabled():
-                                    await channel.send(f"<:jk_connect:1349009924306374756> **{join_name_clean}** has joined the game!")
-                                    # Schedule welcome message with cooldown
-                                    bot_name = await self.config.bot_name()
-                                    if bot_name and await self.validate_rcon_settings():
-                                        current_time = time.time()
-                                        if current_time - self.last_welcome_time >= 5:  # 5-second cooldown
-                                            self.last_welcome_time = current_time
-                                            welcome_message = f"sayasbot {bot_name} ^7Hey {join_name}^7, welcome to the server^5! :wave:"
-                                            self.bot.loop.create_task(self.send_welcome_message(welcome_message))
-                                        else:
-                                            logger.debug(f"Skipped welcome message for {join_name_clean} due to cooldown")
-
-                        # Disconnect
-                        elif "disconnected" in line:
-                            match = re.search(r"info:\s*(.+?)\s*disconnected\s*\((\d+)\)", line)
-                            if match:
-                                name = match.group(1)
-                                name_clean = self.remove_color_codes(name)
-                                if not self.is_restarting and not name_clean.endswith("-Bot") and name_clean.strip():
-                                    if await self.config.join_disconnect_enabled():
-                                        await channel.send(f"<:jk_disconnect:1349010016044187713> **{name_clean}** has disconnected.")
-
-            except Exception as e:
-                logger.error(f"Error in monitor_log: {e}")
-                await asyncio.sleep(5)
-
-    async def reset_restart_flag(self, channel):
-        await asyncio.sleep(30)
-        if self.is_restarting:
-            self.is_restarting = False
-            self.restart_map = None
-            await channel.send("Server Integration Resumed: Restart timed out, resuming normal operation.")
-
-    async def _handle_vpn_check(self, player_id: int, ip: str):
-        api_key = await self.config.vpn_api_key()
-        if not api_key:
-            return
-        try:
-            async with aiohttp.ClientSession() as session:
-                url = f"https://vpnapi.io/api/{ip}?key={api_key}"
-                async with session.get(url, timeout=5) as resp:
-                    if resp.status != 200:
-                        return
-                    data = await resp.json()
-                    if data.get("security", {}).get("vpn", False):
-                        bot_name = await self.config.bot_name() or "Server"
-                        msg = f"say_admins VPN Detected ^3(^7IP: {ip} ^3| ^7Player Slot: {player_id}^3) :eyes:"
-                        await self.bot.loop.run_in_executor(
-                            self.executor, self.send_rcon_command,
-                            msg, await self.config.rcon_host(),
-                            await self.config.rcon_port(), await self.config.rcon_password()
-                        )
-                        # Auto-kick if enabled
-                        if await self.config.vpn_auto_kick():
-                            kick_cmd = f"kick {player_id}"
-                            await self.bot.loop.run_in_executor(
-                                self.executor, self.send_rcon_command,
-                                kick_cmd, await self.config.rcon_host(),
-                                await self.config.rcon_port(), await self.config.rcon_password()
-                            )
-        except Exception:
-            pass
+        return parse_chat_line(line)
 
     @commands.command(name="jkvpn")
     @commands.is_owner()
     @commands.has_permissions(administrator=True)
     async def toggle_vpn_kick(self, ctx):
         """Toggle auto-kick on VPN detection."""
-        current = await self.config.vpn_auto_kick()
+        current = self.settings.vpn_auto_kick
         new_state = not current
-        await self.config.vpn_auto_kick.set(new_state)
+        await self.update_setting("vpn_auto_kick", new_state)
         if new_state:
             await ctx.send("**VPN Connections BLOCKED** :no_entry:")
         else:
@@ -370,37 +189,97 @@ class JKChatBridge(commands.Cog):
         """JKChatBridge settings"""
         pass
 
+    @jkbridge.group(name="server", invoke_without_command=True)
+    async def server_group(self, ctx):
+        """Manage the game servers bridged by this cog. Setting commands apply to the selected one."""
+        await ctx.send_help()
+
+    @server_group.command(name="add")
+    async def server_add(self, ctx, name: str):
+        """Add a server profile and select it for configuration."""
+        if not self.PROFILE_NAME_RE.match(name):
+            await ctx.send("Profile names are up to 32 letters, digits, `_` or `-`.")
+            return
+        if name in self.servers:
+            await ctx.send(f"Server `{name}` already exists.")
+            return
+        settings = ProfileSettings()
+        await self.config.profiles.set_raw(name, value=settings.to_dict())
+        server = self.servers[name] = ServerMonitor(self, name, settings)
+        await self._start_server(server)
+        await self.update_setting("selected_profile", name)
+        await ctx.send(f"Server `{name}` added and selected. Configure it with the `jkbridge set...` commands.")
+
+    @server_group.command(name="remove")
+    async def server_remove(self, ctx, name: str):
+        """Stop bridging a server and delete its profile."""
+        if name not in self.servers:
+            await ctx.send(f"No server named `{name}`.")
+            return
+        if name == self.settings.selected_profile:
+            await ctx.send("That server is selected. Select another with `jkbridge server use` first.")
+            return
+        server = self.servers.pop(name)
+        self.rebuild_channel_map()
+        self.watchdog.forget(name)
+        await server.stop()
+        await self.config.profiles.clear_raw(name)
+        await ctx.send(f"Server `{name}` removed.")
+
+    @server_group.command(name="use")
+    async def server_use(self, ctx, name: str):
+        """Select the server that setting and RCON commands apply to."""
+        if name not in self.servers:
+            await ctx.send(f"No server named `{name}`. Known: {', '.join(self.servers)}.")
+            return
+        await self.update_setting("selected_profile", name)
+        await ctx.send(f"Now configuring `{name}`.")
+
+    @server_group.command(name="list")
+    async def server_list(self, ctx):
+        """List the bridged servers and what each is connected to."""
+        lines = []
+        for name, server in self.servers.items():
+            channel = self.bot.get_channel(server.settings.discord_channel_id) if server.settings.discord_channel_id else None
+            state = "reading log" if server.tailer else "waiting"
+            marker = "→" if name == self.settings.selected_profile else " "
+            lines.append(
+                f"{marker} {name:<12} #{channel.name if channel else '-':<16} "
+                f"{server.settings.rcon_host or '-'}:{server.settings.rcon_port or '-'}  {state}, "
+                f"{server.roster.human_count} players"
+            )
+        await ctx.send("```\n" + "\n".join(lines) + "\n```")
+
     @jkbridge.command()
     async def setlogbasepath(self, ctx, path: str):
-        await self.config.log_base_path.set(path)
-        if self.monitor_task and not self.monitor_task.done():
-            self.monitoring = False
-            self.monitor_task.cancel()
-            try:
-                await self.monitor_task
-            except asyncio.CancelledError:
-                pass
-        self.start_monitoring()
+        server = await self.update_server_setting("log_base_path", path)
+        await server.restart()
         await ctx.send(f"Log base path set to: {path}. Monitoring restarted.")
 
     @jkbridge.command()
     async def setchannel(self, ctx, channel: discord.TextChannel):
-        await self.config.discord_channel_id.set(channel.id)
+        owner = self.channel_servers.get(channel.id)
+        if owner is not None and owner is not self.selected_server:
+            await ctx.send(f"{channel.name} is already bridged to server `{owner.name}`.")
+            return
+        server = await self.update_server_setting("discord_channel_id", channel.id)
+        # The monitor only looks the channel up when it (re)starts.
+        server.channel = channel
         await ctx.send(f"Discord channel set to: {channel.name} (ID: {channel.id})")
 
     @jkbridge.command()
     async def setrconhost(self, ctx, host: str):
-        await self.config.rcon_host.set(host)
+        await self.update_server_setting("rcon_host", host)
         await ctx.send(f"RCON host set to: {host}")
 
     @jkbridge.command()
     async def setrconport(self, ctx, port: int):
-        await self.config.rcon_port.set(port)
+        await self.update_server_setting("rcon_port", port)
         await ctx.send(f"RCON port set to: {port}")
 
     @jkbridge.command()
     async def setrconpassword(self, ctx, password: str):
-        await self.config.rcon_password.set(password)
+        await self.update_server_setting("rcon_password", password)
         await ctx.send("RCON password set.")
 
     @jkbridge.command()
@@ -409,49 +288,169 @@ class JKChatBridge(commands.Cog):
 
     @jkbridge.command()
     async def settrackerurl(self, ctx, url: str):
-        await self.config.tracker_url.set(url)
+        server = await self.update_server_setting("tracker_url", url)
+        if server.tracker:
+            server.tracker.set_url(url)
         await ctx.send(f"Tracker URL set to: {url}")
 
     @jkbridge.command()
     async def setbotname(self, ctx, name: str):
-        await self.config.bot_name.set(name)
+        await self.update_server_setting("bot_name", name)
         await ctx.send(f"Bot name set to: {name}")
 
     @jkbridge.command()
     async def setvpnkey(self, ctx, key: str):
-        await self.config.vpn_api_key.set(key)
+        await self.update_setting("vpn_api_key", key)
         await ctx.send("VPN API key set.")
 
     @jkbridge.command()
     async def togglevpncheck(self, ctx):
-        new = not await self.config.vpn_check_enabled()
-        await self.config.vpn_check_enabled.set(new)
+        new = not self.settings.vpn_check_enabled
+        await self.update_setting("vpn_check_enabled", new)
         await ctx.send(f"VPN detection {'enabled' if new else 'disabled'}.")
 
+    @jkbridge.command()
+    async def toggleworker(self, ctx):
+        """Read and parse the log in a separate process instead of on the bot's event loop."""
+        server = self.selected_server
+        new = not server.settings.parser_worker
+        await self.update_server_setting("parser_worker", new)
+        await server.restart()
+        await ctx.send(f"Log parser worker process {'enabled' if new else 'disabled'}. Monitoring restarted.")
+
+    @jkbridge.command()
+    async def setretention(self, ctx, days: int):
+        """Set how many days of chat and events the search archive keeps."""
+        if days < 1:
+            await ctx.send("Retention must be at least 1 day.")
+            return
+        await self.update_setting("archive_retention_days", days)
+        if self.archive:
+            self.archive.retention_days = days
+        await ctx.send(f"Archive retention set to {days} days. Older events are purged within the hour.")
+
+    @jkbridge.command()
+    async def forgetplayer(self, ctx, *, name: str):
+        """Erase a player's archived chat and events, and the VPN verdicts for their IPs."""
+        if self.archive is None:
+            await ctx.send("The archive isn't running yet. Try again in a moment.")
+            return
+        deleted, ips = await self.archive.forget_player(name)
+        forgotten = await self.vpn_checker.forget(ips) if self.vpn_checker else 0
+        await ctx.send(f"Deleted {deleted} archived events for `{name}` and {forgotten} cached VPN verdicts.")
+
     @jkbridge.command()
     async def setchatpath(self, ctx, path: str):
-        await self.config.random_chat_path.set(path)
-        await self.load_random_chat_lines()
-        count = len(self.random_chat_lines)
+        server = await self.update_server_setting("random_chat_path", path)
+        await server.load_random_chat_lines()
+        count = len(server.random_chat_lines)
         await ctx.send(f"Random chat file set to: `{path}`\nLoaded **{count}** lines. Use `[p]reload JKChatBridge` after editing.")
 
+    @jkbridge.command()
+    async def addemote(self, ctx, emote: str, replacement: str):
+        """Add or change a text emote translated between game chat and Discord."""
+        self.emotes.add(emote, replacement)
+        await self.save_emotes()
+        await ctx.send(f"Emote `{emote}` now translates to {replacement}")
+
+    @jkbridge.command()
+    async def removeemote(self, ctx, emote: str):
+        """Stop translating a text emote."""
+        if not self.emotes.remove(emote):
+            await ctx.send(f"Emote `{emote}` is not in the table.")
+            return
+        await self.save_emotes()
+        await ctx.send(f"Emote `{emote}` removed.")
+
+    @jkbridge.command(name="emotes")
+    async def list_emotes(self, ctx):
+        """List the emote translation table."""
+        table = self.emotes.table
+        if not table:
+            await ctx.send("The emote table is empty.")
+            return
+        await ctx.send("\n".join(f"`{emote}` → {replacement}" for emote, replacement in table.items()))
+
+    @jkbridge.command()
+    async def rconstats(self, ctx):
+        """Show RCON scheduler queue depths and wait times per priority lane."""
+        lines = []
+        for server in self.servers.values():
+            lines.append(f"[{server.name}]")
+            lines.append("Lane      | Queued | Sent  | Dropped | Avg wait | Max wait")
+            for name, lane in server.rcon_scheduler.stats().items():
+                lines.append(
+                    f"{name:<9} | {lane['depth']:<6} | {lane['sent']:<5} | {lane['dropped']:<7} | "
+                    f"{lane['avg_wait'] * 1000:>6.0f}ms | {lane['max_wait'] * 1000:>6.0f}ms"
+                )
+        await ctx.send("```\n" + "\n".join(lines) + "\n```")
+
+    @jkbridge.command()
+    async def outboxstats(self, ctx):
+        """Show the Discord outbound queue depth and lag per channel."""
+        stats = self.outbox.stats()
+        if not stats:
+            await ctx.send("Nothing has been relayed to Discord yet.")
+            return
+        lines = ["Channel             | Queued | Msgs  | Lines | Dropped | Avg lag | Max lag"]
+        for channel_id, queue in stats.items():
+            lines.append(
+                f"{channel_id:<19} | {queue['pending']:<6} | {queue['messages_sent']:<5} | {queue['lines_sent']:<5} | "
+                f"{queue['dropped']:<7} | {queue['avg_lag'] * 1000:>5.0f}ms | {queue['max_lag'] * 1000:>5.0f}ms"
+            )
+        await ctx.send("```\n" + "\n".join(lines) + "\n```")
+
+    @jkbridge.command()
+    async def relaystats(self, ctx):
+        """Show how Discord chat is being packed into game say commands."""
+        lines = ["Server       | Queued | Msgs  | Says  | Dropped | Refused | Avg lag | Max lag"]
+        for server in self.servers.values():
+            refused = server.relay.refused
+            for queue in server.relay.stats().values():
+                lines.append(
+                    f"{server.name[:12]:<12} | {queue['pending']:<6} | {queue['messages']:<5} | {queue['commands']:<5} | "
+                    f"{queue['dropped']:<7} | {refused:<7} | {queue['avg_lag'] * 1000:>5.0f}ms | {queue['max_lag'] * 1000:>5.0f}ms"
+                )
+        if len(lines) == 1:
+            await ctx.send("Nothing has been relayed to the game yet.")
+            return
+        await ctx.send("```\n" + "\n".join(lines) + "\n```")
+
+    @jkbridge.command()
+    async def eventstats(self, ctx):
+        """Show how far behind the log reader each event consumer is."""
+        lines = []
+        for server in self.servers.values():
+            lines.append(f"[{server.name}]")
+            lines.append("Consumer  | Queued | Handled | Dropped | Failed | Avg lag | Max lag")
+            for name, queue in server.events.stats().items():
+                lines.append(
+                    f"{name:<9} | {queue['depth']:<6} | {queue['processed']:<7} | {queue['dropped']:<7} | "
+                    f"{queue['failed']:<6} | {queue['avg_lag'] * 1000:>5.0f}ms | {queue['max_lag'] * 1000:>5.0f}ms"
+                )
+        await ctx.send("```\n" + "\n".join(lines) + "\n```")
+
     @jkbridge.command()
     async def showsettings(self, ctx):
-        channel = self.bot.get_channel(await self.config.discord_channel_id()) if await self.config.discord_channel_id() else None
-        chat_path = await self.config.random_chat_path()
-        chat_status = f"{len(self.random_chat_lines)} lines loaded" if chat_path and self.random_chat_lines else "Not set"
+        server = self.selected_server
+        profile = server.settings
+        channel = self.bot.get_channel(profile.discord_channel_id) if profile.discord_channel_id else None
+        chat_path = profile.random_chat_path
+        chat_status = f"{len(server.random_chat_lines)} lines loaded" if chat_path and server.random_chat_lines else "Not set"
         settings_message = (
-            f"**Current Settings:**\n"
-            f"Log Base Path: {await self.config.log_base_path() or 'Not set'}\n"
-            f"Discord Channel: {channel.name if channel else 'Not set'} (ID: {await self.config.discord_channel_id() or 'Not set'})\n"
-            f"RCON Host: {await self.config.rcon_host() or 'Not set'}\n"
-            f"RCON Port: {await self.config.rcon_port() or 'Not set'}\n"
-            f"RCON Password: {'Set' if await self.config.rcon_password() else 'Not set'}\n"
-            f"Custom Emoji: {await self.config.custom_emoji() or 'Not set'}\n"
-            f"Tracker URL: {await self.config.tracker_url() or 'Not set'}\n"
-            f"Bot Name: {await self.config.bot_name() or 'Not set'}\n"
+            f"**Current Settings** (server `{server.name}`, {len(self.servers)} configured):\n"
+            f"Log Base Path: {profile.log_base_path or 'Not set'}\n"
+            f"Discord Channel: {channel.name if channel else 'Not set'} (ID: {profile.discord_channel_id or 'Not set'})\n"
+            f"RCON Host: {profile.rcon_host or 'Not set'}\n"
+            f"RCON Port: {profile.rcon_port or 'Not set'}\n"
+            f"RCON Password: {'Set' if profile.rcon_password else 'Not set'}\n"
+            f"Custom Emoji: {self.settings.custom_emoji or 'Not set'}\n"
+            f"Tracker URL: {profile.tracker_url or 'Not set'}\n"
+            f"Bot Name: {profile.bot_name or 'Not set'}\n"
             f"Random Chat File: `{chat_path or 'Not set'}` → {chat_status}\n"
-            f"VPN Auto-Kick: **{'ON' if await self.config.vpn_auto_kick() else 'OFF'}**"
+            f"VPN Auto-Kick: **{'ON' if self.settings.vpn_auto_kick else 'OFF'}**\n"
+            f"Parser Worker: **{'ON' if profile.parser_worker else 'OFF'}**\n"
+            f"Archive Retention: {self.settings.archive_retention_days} days"
         )
         await ctx.send(settings_message)
 
@@ -460,13 +459,12 @@ class JKChatBridge(commands.Cog):
     @commands.is_owner()
     @commands.has_permissions(administrator=True)
     async def jkexec(self, ctx, filename: str):
-        if not await self.validate_rcon_settings():
+        server = self.server_for(ctx.channel)
+        if not server.validate_rcon_settings():
             await ctx.send("RCON settings not fully configured.")
             return
         try:
-            await self.bot.loop.run_in_executor(
-                self.executor, self.send_rcon_command, f"exec {filename}", await self.config.rcon_host(), await self.config.rcon_port(), await self.config.rcon_password()
-            )
+            await server.rcon_scheduler.run(f"exec {filename}")
             await ctx.send(f"Executed configuration file: {filename}")
         except Exception as e:
             await ctx.send(f"Failed to execute {filename}: {e}")
@@ -475,13 +473,12 @@ class JKChatBridge(commands.Cog):
     @commands.is_owner()
     @commands.has_permissions(administrator=True)
     async def jkrcon(self, ctx, *, command: str):
-        if not await self.validate_rcon_settings():
+        server = self.server_for(ctx.channel)
+        if not server.validate_rcon_settings():
             await ctx.send("RCON settings not fully configured.")
             return
         try:
-            await self.bot.loop.run_in_executor(
-                self.executor, self.send_rcon_command, command, await self.config.rcon_host(), await self.config.rcon_port(), await self.config.rcon_password()
-            )
+            await server.rcon_scheduler.run(command)
             await ctx.send(f"RCON command sent: `{command}`")
         except Exception as e:
             await ctx.send(f"Failed to send RCON command `{command}`: {e}")
@@ -490,124 +487,126 @@ class JKChatBridge(commands.Cog):
     @commands.is_owner()
     @commands.has_permissions(administrator=True)
     async def jktoggle(self, ctx):
-        current_state = await self.config.join_disconnect_enabled()
+        current_state = self.selected_server.settings.join_disconnect_enabled
         new_state = not current_state
-        await self.config.join_disconnect_enabled.set(new_state)
+        await self.update_server_setting("join_disconnect_enabled", new_state)
         state_text = "enabled" if new_state else "disabled"
         await ctx.send(f"Join and disconnect messages are now **{state_text}**.")
 
     @commands.command(name="jkreload", aliases=["jkreloadmonitor"])
     async def reload_monitor(self, ctx: commands.Context = None):
-        if self.monitor_task and not self.monitor_task.done():
-            self.monitoring = False
-            self.monitor_task.cancel()
-            try:
-                await self.monitor_task
-            except asyncio.CancelledError:
-                logger.debug("Monitoring task canceled successfully.")
-            except Exception as e:
-                logger.error(f"Error canceling task: {e}")
-
-        await asyncio.sleep(0.5)
-        self.is_restarting = False
-        self.restart_map = None
-        self.start_monitoring()
+        await asyncio.gather(*(server.restart() for server in list(self.servers.values())))
         if ctx:
             await ctx.send("Log monitoring task reloaded.")
 
+    @commands.command(name="jkhealth")
+    @commands.mod_or_permissions(manage_messages=True)
+    async def health(self, ctx):
+        """Show whether each server's log reader is keeping up, and the bot's event-loop lag."""
+        lag = self.watchdog.loop_lag
+        lines = [
+            f"Event loop lag: last {lag['last'] * 1000:.0f}ms, avg {lag['avg'] * 1000:.0f}ms, max {lag['max'] * 1000:.0f}ms",
+            "",
+            "Server       | Reader   | Last line | Offset      | Behind     | Restarts",
+        ]
+        notes = []
+        for server in self.servers.values():
+            h = self.watchdog.reader_health(server)
+            if not h["running"]:
+                reader = "stopped"
+            elif not h["reading"]:
+                reader = "waiting"
+            elif h["stalled_for"] >= self.watchdog.interval:
+                reader = "stalled"
+            else:
+                reader = "ok"
+            last_line = "never" if h["last_line_age"] is None else f"{h['last_line_age']:.0f}s ago"
+            offset = "-" if h["offset"] is None else f"{h['offset']:,}"
+            behind = "-" if h["backlog"] is None else f"{h['backlog']:,}B"
+            lines.append(
+                f"{server.name[:12]:<12} | {reader:<8} | {last_line:<9} | {offset:<11} | {behind:<10} | {h['restarts']}"
+            )
+            if h["last_reason"]:
+                notes.append(f"{server.name}: last restart because {h['last_reason']}")
+        await ctx.send("```\n" + "\n".join(lines + notes) + "\n```")
+
     @commands.command(name="jkstatus")
     async def status(self, ctx):
-        async with aiohttp.ClientSession() as session:
-            try:
-                tracker_url = await self.config.tracker_url()
-                if not tracker_url:
-                    await ctx.send("Tracker URL not set. Use `jkbridge settrackerurl`.")
-                    return
-
-                async with session.get(tracker_url, timeout=aiohttp.ClientTimeout(total=10)) as resp:
-                    if resp.status != 200:
-                        await ctx.send(f"Failed: HTTP {resp.status}")
-                        return
-                    if 'application/json' not in resp.headers.get('Content-Type', ''):
-                        await ctx.send("Failed: Expected JSON.")
-                        return
-                    data = await resp.json()
-
-                server_info = data.get("serverInfo", {})
-                info = data.get("info", {})
-                players = data.get("players", [])
-
-                server_name = self.remove_color_codes(server_info.get("servername", "Unknown"))
-                map_name = server_info.get("mapname", "Unknown")
-                max_players = int(server_info.get("sv_maxclients", "32"))
-                humans = sum(1 for p in players if p.get("ping", "0") != "0")
-                bots = len(players) - humans
-                player_count = f"{len(players)}/{max_players}"
-
-                player_list = "No players" if not players else "```\n" + \
-                    "ID  | Name              | Score\n" + \
-                    "\n".join(
-                        f"{i:<3} | {(self.remove_color_codes(p.get('name', ''))[:17]):<17} | {p.get('score', '0'):<5}"
-                        for i, p in enumerate(players)
-                    ) + "\n```"
-
-                embed1 = discord.Embed(title=server_name, color=discord.Color.gold())
-                embed1.add_field(name="Players", value=player_count, inline=True)
-                mod = self.remove_color_codes(info.get("gamename", "Unknown"))
-                embed1.add_field(name="Mod", value=mod, inline=True)
-                version = info.get("Lugormod_Version")
-                if version:
-                    embed1.add_field(name="Version", value=self.remove_color_codes(version), inline=True)
-                embed1.add_field(name="Map", value=f"`{map_name}`", inline=True)
-                embed1.add_field(name="IP", value=server_info.get("serverIPAddress", "Unknown"), inline=True)
-                embed1.add_field(name="Location", value=server_info.get("geoIPcountryCode", "??").upper(), inline=True)
-
-                levelshots = server_info.get("levelshotsArray", [])
-                if levelshots and levelshots[0]:
-                    image_url = f"https://pt.dogi.us/{quote(levelshots[0])}"
-                    embed1.set_image(url=image_url)
-
-                embed2 = discord.Embed(color=discord.Color.gold())
-                embed2.add_field(name="Players", value=player_list, inline=False)
-
-                await ctx.send(embed=embed1)
-                await ctx.send(embed=embed2)
-            except Exception as e:
-                await ctx.send(f"Failed to fetch status: {e}")
+        server = self.server_for(ctx.channel)
+        if not server.settings.tracker_url:
+            await ctx.send("Tracker URL not set. Use `jkbridge settrackerurl`.")
+            return
+        if not server.tracker:
+            await ctx.send("Tracker isn't running yet. Try again in a moment.")
+            return
+        try:
+            data = await server.tracker.get()
+        except TrackerError as e:
+            await ctx.send(f"Failed: {e}")
+            return
+        try:
+            server_info = data.get("serverInfo", {})
+            info = data.get("info", {})
+            players = data.get("players", [])
+
+            server_name = self.remove_color_codes(server_info.get("servername", "Unknown"))
+            map_name = server_info.get("mapname", "Unknown")
+            max_players = int(server_info.get("sv_maxclients", "32"))
+            humans = sum(1 for p in players if p.get("ping", "0") != "0")
+            bots = len(players) - humans
+            player_count = f"{len(players)}/{max_players}"
+
+            player_list = "No players" if not players else "```\n" + \
+                "ID  | Name              | Score\n" + \
+                "\n".join(
+                    f"{i:<3} | {(self.remove_color_codes(p.get('name', ''))[:17]):<17} | {p.get('score', '0'):<5}"
+                    for i, p in enumerate(players)
+                ) + "\n```"
+
+            embed1 = discord.Embed(title=server_name, color=discord.Color.gold())
+            embed1.add_field(name="Players", value=player_count, inline=True)
+            mod = self.remove_color_codes(info.get("gamename", "Unknown"))
+            embed1.add_field(name="Mod", value=mod, inline=True)
+            version = info.get("Lugormod_Version")
+            if version:
+                embed1.add_field(name="Version", value=self.remove_color_codes(version), inline=True)
+            embed1.add_field(name="Map", value=f"`{map_name}`", inline=True)
+            embed1.add_field(name="IP", value=server_info.get("serverIPAddress", "Unknown"), inline=True)
+            embed1.add_field(name="Location", value=server_info.get("geoIPcountryCode", "??").upper(), inline=True)
+
+            levelshots = server_info.get("levelshotsArray", [])
+            if levelshots and levelshots[0]:
+                image_url = f"https://pt.dogi.us/{quote(levelshots[0])}"
+                embed1.set_image(url=image_url)
+
+            embed2 = discord.Embed(color=discord.Color.gold())
+            embed2.add_field(name="Players", value=player_list, inline=False)
+            embed2.set_footer(text=f"Updated {int(server.tracker.age or 0)}s ago")
+
+            await ctx.send(embed=embed1)
+            await ctx.send(embed=embed2)
+        except Exception as e:
+            await ctx.send(f"Failed to fetch status: {e}")
 
     @commands.command(name="jkplayer")
     async def player_info(self, ctx, username: str):
-        if not await self.validate_rcon_settings():
+        server = self.server_for(ctx.channel)
+        if not server.validate_rcon_settings():
             await ctx.send("RCON not configured.")
             return
 
-        command = f"accountinfo {username}"
         try:
-            response = await self.bot.loop.run_in_executor(
-                self.executor, self.send_rcon_command,
-                command, await self.config.rcon_host(),
-                await self.config.rcon_port(), await self.config.rcon_password()
-            )
-            text = response.decode('cp1252', errors='replace')
+            stats = (await server.lookup_player_stats([username]))[username]
         except Exception as e:
             await ctx.send(f"Failed to get info: {e}")
             return
 
-        stats = {}
-        for line in text.splitlines():
-            line = line.strip()
-            if not line or line.startswith('\xff'):
-                continue
-            if ":" in line:
-                k, v = map(str.strip, line.split(":", 1))
-                stats[self.remove_color_codes(k)] = self.remove_color_codes(v)
-
-        if "Id" not in stats:
+        if stats is None:
             await ctx.send(f"Player `{username}` not found.")
             return
 
-        wins = int(stats.get("Duels won", "0"))
-        total = int(stats.get("Total duels", "0"))
+        wins = stat_value(stats, "Duels won")
+        total = stat_value(stats, "Total duels")
         losses = max(0, total - wins)
         playtime = stats.get("Time", "N/A")
         if ":" in playtime:
@@ -630,92 +629,212 @@ class JKChatBridge(commands.Cog):
 
         await ctx.send(embed=embed)
 
+    @commands.command(name="jkleaderboard")
+    @commands.cooldown(1, 30, commands.BucketType.channel)
+    async def leaderboard(self, ctx, category: str = "duels", *names: str):
+        """Rank accounts by duels, kills or credits. Defaults to the players online."""
+        category = category.lower()
+        if category not in LEADERBOARD_FIELDS:
+            await ctx.send(f"Category must be one of: {', '.join(LEADERBOARD_FIELDS)}.")
+            return
+        server = self.server_for(ctx.channel)
+        if not server.validate_rcon_settings():
+            await ctx.send("RCON not configured.")
+            return
+
+        if not names and len(server.roster):
+            names = [p.clean_name for p in server.roster if not p.is_bot]
+        if not names:
+            try:
+                data = await server.tracker.get() if server.tracker and server.settings.tracker_url else {}
+            except TrackerError as e:
+                await ctx.send(f"Failed to get the player list: {e}")
+                return
+            names = [
+                self.remove_color_codes(p.get("name", ""))
+                for p in data.get("players", []) if p.get("ping", "0") != "0"
+            ]
+        names = list(dict.fromkeys(name for name in names if name))[:self.LEADERBOARD_MAX_ACCOUNTS]
+        if not names:
+            await ctx.send("No accounts to rank. Name some, e.g. `jkleaderboard kills Kyle Jan`.")
+            return
+
+        async with ctx.typing():
+            try:
+                results = await server.lookup_player_stats(names)
+            except Exception as e:
+                await ctx.send(f"Failed to get info: {e}")
+                return
+
+        field = LEADERBOARD_FIELDS[category]
+        ranked = sorted(
+            ((stats.get("Name", name), stat_value(stats, field)) for name, stats in results.items() if stats),
+            key=lambda item: item[1], reverse=True
+        )
+        if not ranked:
+            await ctx.send("None of those accounts were found.")
+            return
+        table = "```\n" + "#   | Name              | " + field + "\n" + "\n".join(
+            f"{i:<3} | {name[:17]:<17} | {value}" for i, (name, value) in enumerate(ranked, 1)
+        ) + "\n```"
+        embed = discord.Embed(title=f"Leaderboard: {category.capitalize()}", description=table, color=discord.Color.gold())
+        missing = [name for name, stats in results.items() if not stats]
+        if missing:
+            embed.set_footer(text=f"Not found: {', '.join(missing)}"[:2048])
+        await ctx.send(embed=embed)
+
+    @commands.command(name="jkwho")
+    async def who(self, ctx):
+        """Show who is on the server right now."""
+        roster = self.server_for(ctx.channel).roster
+        players = list(roster)
+        if not players:
+            await ctx.send("Nobody is online.")
+            return
+        now = time.time()
+        rows = []
+        for p in players:
+            online = "?" if p.join_time is None else f"{int(now - p.join_time) // 60}m"
+            rows.append(f"{p.slot:<3} | {p.clean_name[:17]:<17} | {'bot' if p.is_bot else online}")
+        humans = roster.human_count
+        table = "```\nID  | Name              | Online\n" + "\n".join(rows) + "\n```"
+        embed = discord.Embed(
+            title=f"{humans} players, {len(players) - humans} bots",
+            description=table[:4096],
+            color=discord.Color.gold()
+        )
+        await ctx.send(embed=embed)
+
+    def _parse_search_time(self, value):
+        """``30m``/``12h``/``7d``/``2w`` ago, or a ``YYYY-MM-DD`` date (UTC), as a timestamp."""
+        match = self.SEARCH_DURATION_RE.match(value)
+        if match:
+            return time.time() - int(match.group(1)) * self.SEARCH_UNITS[match.group(2)]
+        return datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp()
+
+    @commands.command(name="jksearch")
+    @commands.mod_or_permissions(manage_messages=True)
+    async def search_archive(self, ctx, *, query: str):
+        """Search archived chat and player events.
+
+        Words are matched in chat text. Filters: `player:<name>`, `since:<7d|2025-01-31>`,
+        `until:<...>`, `kind:<chat|join|disconnect|duel|vpn>`, `server:<profile>`, `limit:<n>`.
+        Example: `jksearch player:Kyle since:7d cantina`
+        """
+        if self.archive is None:
+            await ctx.send("The archive isn't running yet. Try again in a moment.")
+            return
+        try:
+            tokens = shlex.split(query)
+        except ValueError as e:
+            await ctx.send(f"Couldn't parse that search: {e}")
+            return
+        filters, words = {"limit": 20}, []
+        try:
+            for token in tokens:
+                key, sep, value = token.partition(":")
+                if sep and key.lower() in ("player", "kind", "server"):
+                    filters[key.lower()] = value
+                elif sep and key.lower() in ("since", "until"):
+                    filters[key.lower()] = self._parse_search_time(value)
+                elif sep and key.lower() == "limit":
+                    filters["limit"] = max(1, min(50, int(value)))
+                else:
+                    words.append(token)
+        except ValueError:
+            await ctx.send("Times are like `30m`, `12h`, `7d`, `2w` or `2025-01-31`; limit is a number.")
+            return
+        if not words and len(filters) == 1:
+            await ctx.send("Give some words to search for or a filter, e.g. `jksearch player:Kyle since:7d`.")
+            return
+
+        started = time.perf_counter()
+        rows = await self.archive.search(text=" ".join(words) or None, **filters)
+        elapsed = (time.perf_counter() - started) * 1000
+        if not rows:
+            await ctx.send(f"No matches ({elapsed:.0f} ms).")
+            return
+        lines = []
+        show_server = len(self.servers) > 1 and "server" not in filters
+        show_ips = await self.bot.is_owner(ctx.author) or (ctx.guild is not None and await self.bot.is_admin(ctx.author))
+        for ts, kind, player, text, ip, slot, server in rows:
+            when = datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%d %H:%M")
+            if kind == EVENT_CHAT:
+                detail = f"{player}: {text}"
+            elif kind == "vpn":
+                detail = f"{player or f'slot {slot}'} ({ip if show_ips else mask_ip(ip)}) {text}"
+            elif text:
+                detail = text
+            else:
+                detail = f"{player} {'joined' if kind == EVENT_JOIN else 'left'}"
+            if show_server:
+                detail = f"[{server or '?'}] {detail}"
+            lines.append(f"{when} {kind:<10} {detail}"[:200])
+        body = "\n".join(lines)
+        while len(body) > 1900:
+            body = body.rsplit("\n", 1)[0]
+        await ctx.send(f"```\n{body}\n```{len(rows)} results (newest first, UTC) in {elapsed:.0f} ms.")
+
     # === CHAT LISTENER ===
     @commands.Cog.listener()
     async def on_message(self, message):
-        channel_id = await self.config.discord_channel_id()
-        if not channel_id or message.channel.id != channel_id or message.author.bot:
+        server = self.channel_servers.get(message.channel.id)
+        if server is None or message.author.bot:
             return
         prefixes = await self.bot.get_prefix(message)
         if any(message.content.startswith(p) for p in prefixes):
             return
 
-        username = self.clean_for_latin1(message.author.display_name)
-        content = self.clean_for_latin1(message.content)
+        username = latin1_name(message.author.display_name)
+        # Translate emoji before the Latin-1 filter would strip them.
+        content = self.clean_for_latin1(self.replace_emojis_with_names(message.content))
         for member in message.mentions:
-            clean_name = self.clean_for_latin1(member.display_name)
+            clean_name = latin1_name(member.display_name)
             content = content.replace(f"<@!{member.id}>", f"@{clean_name}").replace(f"<@{member.id}>", f"@{clean_name}")
-        content = self.replace_emojis_with_names(content)
-
-        prefix = f"say ^5:discord: ^7{username}: ^2"
-        max_len = 115
-        chunks = []
-        remaining = content
-        first = True
-        while remaining:
-            cur_max = max_len if first else 128 - 4
-            if len(remaining) <= cur_max:
-                chunks.append(remaining)
-                break
-            split = remaining.rfind(' ', 0, cur_max + 1) or cur_max
-            chunks.append(remaining[:split].strip())
-            remaining = remaining[split:].strip()
-            first = False
-
-        if not await self.validate_rcon_settings():
+
+        content = content.strip()
+        if not content:
+            return
+
+        if not server.validate_rcon_settings():
             await message.channel.send("RCON settings not configured.")
             return
 
-        try:
-            for i, chunk in enumerate(chunks):
-                cmd = f"{prefix if i == 0 else 'say '}{chunk}"
-                await self.bot.loop.run_in_executor(
-                    self.executor, self.send_rcon_command,
-                    cmd, await self.config.rcon_host(),
-                    await self.config.rcon_port(), await self.config.rcon_password()
-                )
-                await asyncio.sleep(0.1)
-        except Exception as e:
-            await message.channel.send(f"Failed to send: {e}")
+        if not server.relay.send(message.channel.id, message.author.id, username, content):
+            try:
+                await message.add_reaction(self.RELAY_THROTTLED_REACTION)
+            except discord.HTTPException:
+                pass
 
     def replace_emojis_with_names(self, text):
-        emoji_map = {
-            ":)": "😊", ":D": "😄", "XD": "😂", "xD": "🤣", ";)": "😉", ":P": "😛", ":(": "😢",
-            ">:(": "😡", ":+1:": "👍", ":-1:": "👎", "<3": "❤️", ":*": "😍", ":S": "😣",
-            ":o": "😮", "=D": "😁", "xD": "😆", "O.o": "😳", "B)": "🤓", "-_-": "😴", "^^;": "😅",
-            ":/": "😒", ":*": "😘", "8)": "😎", "D:": "😱", ":?": "🤔", "\\o/": "🥳", ">^.^<": "🤗", ":p": "🤪",
-            ":pray:": "🙏", ":wave:": "👋", ":-|": "😶", "*.*": "🤩", "O:)": "😇",
-            ":jackolantern:": ":jack_o_lantern:", ":christmastree:": ":christmas_tree:", ":lol:": ":rofl:"
-        }
-        return ''.join(emoji_map.get(c, c) for c in text)
+        return self.emotes.to_text(text)
 
     def replace_text_emotes_with_emojis(self, text):
-        emote_map = {
-            ":)": "😊", ":D": "😄", "XD": "😂", "xD": "🤣", ";)": "😉", ":P": "😛", ":(": "😢",
-            ">:(": "😡", ":+1:": "👍", ":-1:": "👎", "<3": "❤️", ":*": "😍", ":S": "😣",
-            ":o": "😮", "=D": "😁", "xD": "😆", "O.o": "😳", "B)": "🤓", "-_-": "😴", "^^;": "😅",
-            ":/": "😒", ":*": "😘", "8)": "😎", "D:": "😱", ":?": "🤔", "\\o/": "🥳", ">^.^<": "🤗", ":p": "🤪",
-            ":pray:": "🙏", ":wave:": "👋", ":-|": "😶", "*.*": "🤩", "O:)": "😇",
-            ":jackolantern:": ":jack_o_lantern:", ":christmastree:": ":christmas_tree:", ":lol:": ":rofl:"
-        }
-        for k, v in emote_map.items():
-            text = text.replace(k, v)
-        return text
+        return self.emotes.to_emoji(text)
 
     async def cog_unload(self):
-        self.monitoring = False
-        for task in [self.monitor_task, self.random_chat_task]:
-            if task and not task.done():
-                task.cancel()
-                try:
-                    await task
-                except asyncio.CancelledError:
-                    pass
-                except Exception as e:
-                    logger.error(f"Error during task shutdown: {e}")
-
-        self.executor.shutdown(wait=True)
+        await self.watchdog.stop()
+        await asyncio.gather(*(server.stop() for server in self.servers.values()))
+        await self.outbox.stop()
+        if self.archive:
+            await self.archive.stop()
+        if self.vpn_checker:
+            await self.vpn_checker.stop()
+        if self.session:
+            await self.session.close()
         logger.info("JKChatBridge unloaded cleanly.")
 
+    async def red_delete_data_for_user(self, *, requester, user_id):
+        """Nothing stored here is tied to a Discord account.
+
+        The archive and VPN cache hold in-game names and IPs from the server
+        log, which can't be matched to a Discord user ID. The bot owner can
+        erase a player by name with ``[p]jkbridge forgetplayer``.
+        """
+        logger.info(
+            f"Data deletion for Discord user {user_id} ({requester}): JKChatBridge only stores in-game names "
+            "and IPs, which aren't linked to Discord accounts; nothing deleted"
+        )
+
 async def setup(bot):
     await bot.add_cog(JKChatBridge(bot))
\ No newline at end of file
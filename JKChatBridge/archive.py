@@ -0,0 +1,230 @@
+import asyncio
+import logging
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger("JKChatBridge.archive")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    kind TEXT NOT NULL,
+    player TEXT,
+    text TEXT,
+    ip TEXT,
+    slot INTEGER,
+    server TEXT
+);
+CREATE INDEX IF NOT EXISTS events_ts ON events (ts);
+CREATE INDEX IF NOT EXISTS events_player ON events (player COLLATE NOCASE, ts);
+"""
+
+# External-content FTS table kept in step with ``events`` by triggers.
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(
+    player, text, content='events', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS events_ai AFTER INSERT ON events BEGIN
+    INSERT INTO events_fts (rowid, player, text) VALUES (new.id, new.player, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS events_ad AFTER DELETE ON events BEGIN
+    INSERT INTO events_fts (events_fts, rowid, player, text) VALUES ('delete', old.id, old.player, old.text);
+END;
+"""
+
+
+def fts_query(text):
+    """Turn free text into an FTS5 query that matches every word, as typed."""
+    return " ".join('"{}"'.format(word.replace('"', '""')) for word in text.split())
+
+
+def mask_ip(ip):
+    """``203.0.113.7`` -> ``203.0.x.x``, for showing an IP to non-admins."""
+    if not ip:
+        return "?"
+    parts = ip.split(".")
+    if len(parts) == 4:
+        return ".".join(parts[:2] + ["x", "x"])
+    return ip.split(":", 1)[0] + ":x"
+
+
+class ChatArchive:
+    """Append-only SQLite store of chat and player events with full-text search.
+
+    ``add`` only buffers a row; a background task writes the buffer in one
+    transaction every ``flush_interval`` seconds or once ``batch_size`` rows
+    are waiting, and rows older than ``retention_days`` are purged every
+    ``compact_interval`` seconds. All SQLite work runs on one dedicated
+    thread. Falls back to LIKE matching when the SQLite build lacks FTS5.
+    """
+
+    def __init__(self, path, *, retention_days=90, flush_interval=2.0, batch_size=500, compact_interval=3600):
+        self.path = str(path)
+        self.retention_days = retention_days
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.compact_interval = compact_interval
+        self.fts = False
+        self._pending = []
+        self._wakeup = asyncio.Event()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="jkarchive")
+        self._conn = None
+        self._task = None
+        self.written = 0
+
+    async def _call(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    def _open(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.executescript(_SCHEMA)
+        if "server" not in {row[1] for row in conn.execute("PRAGMA table_info(events)")}:
+            # Archives from before multi-server profiles; their rows stay unlabelled.
+            conn.execute("ALTER TABLE events ADD COLUMN server TEXT")
+        try:
+            conn.executescript(_FTS_SCHEMA)
+            self.fts = True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"SQLite has no FTS5 ({e}), archive text search will be slower")
+        self._conn = conn
+
+    async def start(self):
+        await self._call(self._open)
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._conn is not None:
+            await self.flush()
+            await self._call(self._conn.close)
+            self._conn = None
+        self._executor.shutdown(wait=False)
+
+    def add(self, kind, player=None, text=None, *, ip=None, slot=None, ts=None, server=None):
+        self._pending.append((ts or time.time(), kind, player, text, ip, slot, server))
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    async def flush(self):
+        if not self._pending or self._conn is None:
+            return
+        rows, self._pending = self._pending, []
+        try:
+            await self._call(self._insert, rows)
+            self.written += len(rows)
+        except sqlite3.Error as e:
+            logger.error(f"Failed to archive {len(rows)} events: {e}")
+
+    def _insert(self, rows):
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO events (ts, kind, player, text, ip, slot, server) VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+
+    async def _run(self):
+        next_compact = time.monotonic()
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+            if time.monotonic() >= next_compact:
+                next_compact = time.monotonic() + self.compact_interval
+                try:
+                    deleted = await self.compact()
+                except sqlite3.Error as e:
+                    logger.error(f"Archive compaction failed: {e}")
+                else:
+                    if deleted:
+                        logger.info(f"Purged {deleted} archived events older than {self.retention_days} days")
+
+    async def compact(self) -> int:
+        """Delete events older than the retention period and return how many went."""
+        if self._conn is None:
+            return 0
+        return await self._call(self._compact, time.time() - self.retention_days * 86400)
+
+    def _compact(self, cutoff):
+        deleted = 0
+        while True:
+            # Small transactions so searches and inserts never wait long on a big purge.
+            with self._conn:
+                cur = self._conn.execute(
+                    "DELETE FROM events WHERE id IN (SELECT id FROM events WHERE ts < ? ORDER BY id LIMIT 5000)",
+                    (cutoff,)
+                )
+            deleted += cur.rowcount
+            if cur.rowcount < 5000:
+                break
+        if deleted:
+            if self.fts:
+                self._conn.execute("INSERT INTO events_fts (events_fts) VALUES ('optimize')")
+                self._conn.commit()
+            self._conn.execute("PRAGMA incremental_vacuum")
+        return deleted
+
+    async def forget_player(self, player):
+        """Delete every event archived under ``player``; returns the count and the IPs they held."""
+        await self.flush()
+        if self._conn is None:
+            return 0, set()
+        return await self._call(self._forget_player, player)
+
+    def _forget_player(self, player):
+        with self._conn:
+            ips = {row[0] for row in self._conn.execute(
+                "SELECT DISTINCT ip FROM events WHERE player = ? COLLATE NOCASE AND ip IS NOT NULL", (player,)
+            )}
+            cur = self._conn.execute("DELETE FROM events WHERE player = ? COLLATE NOCASE", (player,))
+        return cur.rowcount, ips
+
+    async def search(self, *, player=None, text=None, since=None, until=None, kind=None, server=None,
+                     limit=20) -> list:
+        """Newest-first rows of ``(ts, kind, player, text, ip, slot, server)`` matching every given filter."""
+        await self.flush()
+        return await self._call(self._search, player, text, since, until, kind, server, limit)
+
+    def _search(self, player, text, since, until, kind, server, limit):
+        where, params = [], []
+        source = "events e"
+        if text:
+            if self.fts:
+                source = "events_fts f JOIN events e ON e.id = f.rowid"
+                where.append("events_fts MATCH ?")
+                params.append(f"text : ({fts_query(text)})")
+            else:
+                where.append("e.text LIKE ?")
+                params.append(f"%{text}%")
+        if player:
+            where.append("e.player = ? COLLATE NOCASE")
+            params.append(player)
+        if since is not None:
+            where.append("e.ts >= ?")
+            params.append(since)
+        if until is not None:
+            where.append("e.ts < ?")
+            params.append(until)
+        if kind:
+            where.append("e.kind = ?")
+            params.append(kind)
+        if server:
+            where.append("e.server = ? COLLATE NOCASE")
+            params.append(server)
+        sql = f"SELECT e.ts, e.kind, e.player, e.text, e.ip, e.slot, e.server FROM {source}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY e.ts DESC, e.id DESC LIMIT ?"
+        params.append(limit)
+        return self._conn.execute(sql, params).fetchall()
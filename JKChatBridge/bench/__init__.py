@@ -0,0 +1 @@
+"""Offline benchmarks for JKChatBridge. Not loaded by Red; run the modules with ``python -m``."""
@@ -0,0 +1,221 @@
+"""Replay a recorded qconsole.log through the real monitor pipeline, offline.
+
+The cog runs against a throwaway Red data directory, a fake Discord channel
+and a local UDP server that speaks the ``\\xff\\xff\\xff\\xffrcon`` protocol.
+Run from the directory that contains the cog, e.g.::
+
+    python -m JKChatBridge.bench.harness
+    python -m JKChatBridge.bench.harness --rate 2000 --rcon-probes 200
+    python -m JKChatBridge.bench.harness --log /path/to/qconsole.log --rate 0
+
+Chat lines get a ``~<n>`` tag appended so each Discord line can be matched
+to the moment its source line was written.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+
+from .micro import CORPUS
+
+TAG_RE = re.compile(r"~(\d+)")
+RCON_PASSWORD = "bench"
+
+
+def percentiles(samples, points=(50, 90, 99)):
+    if not samples:
+        return dict({f"p{p}": 0.0 for p in points}, max=0.0)
+    ordered = sorted(samples)
+    result = {f"p{p}": ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))] for p in points}
+    result["max"] = ordered[-1]
+    return result
+
+
+class FakeChannel:
+    def __init__(self, channel_id):
+        self.id = channel_id
+        self.name = "bench"
+        self.received = {}  # tag -> arrival time
+        self.messages = 0
+
+    async def send(self, content=None, **kwargs):
+        now = time.perf_counter()
+        self.messages += 1
+        for tag in TAG_RE.findall(content or ""):
+            self.received.setdefault(int(tag), now)
+
+
+class FakeBot:
+    def __init__(self, channel):
+        self.loop = asyncio.get_running_loop()
+        self.channel = channel
+        self._ready = asyncio.Event()
+
+    def get_channel(self, channel_id):
+        return self.channel if channel_id == self.channel.id else None
+
+    async def wait_until_ready(self):
+        # Never "ready": keeps background chatter such as random chat out of the numbers.
+        await self._ready.wait()
+
+    async def get_prefix(self, message):
+        return ["!"]
+
+
+class RconStub(asyncio.DatagramProtocol):
+    """Answers every rcon packet with a print packet echoing the command."""
+
+    def __init__(self):
+        self.commands = []
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        if not data.startswith(b"\xff\xff\xff\xffrcon "):
+            return
+        _, _, rest = data[9:].partition(b" ")
+        self.commands.append(rest.decode("latin-1"))
+        self.transport.sendto(b"\xff\xff\xff\xffprint\n" + rest + b"\n", addr)
+
+
+async def setup_red(data_path):
+    """Point Red's data manager and JSON driver at a temporary directory."""
+    from redbot.core import data_manager
+    from redbot.core._drivers import BackendType, get_driver_class
+
+    data_manager.basic_config = {
+        "DATA_PATH": data_path,
+        "COG_PATH_APPEND": "cogs",
+        "CORE_PATH_APPEND": "core",
+        "STORAGE_TYPE": "JSON",
+        "STORAGE_DETAILS": {},
+    }
+    data_manager.instance_name = "jkchatbridge-bench"
+    await get_driver_class(BackendType.JSON).initialize()
+
+
+def load_lines(path):
+    with open(path, "r", encoding="latin-1") as f:
+        lines = [line.rstrip("\r\n") for line in f]
+    tagged = []
+    for i, line in enumerate(lines):
+        if "say: " in line and "tell:" not in line and "[Discord]" not in line:
+            line = f"{line} ~{i}"
+        tagged.append(line)
+    return tagged
+
+
+async def replay(log_file, lines, rate, written):
+    """Append ``lines`` to ``log_file`` at ``rate`` lines/sec (0 = as fast as possible)."""
+    batch = len(lines) if rate <= 0 else max(1, int(rate / 100))
+    start = time.perf_counter()
+    with open(log_file, "a", encoding="latin-1") as f:
+        for i in range(0, len(lines), batch):
+            chunk = lines[i:i + batch]
+            f.write("".join(f"{line}\n" for line in chunk))
+            f.flush()
+            now = time.perf_counter()
+            for j in range(i, i + len(chunk)):
+                written[j] = now
+            if rate > 0:
+                target = start + (i + len(chunk)) / rate
+                await asyncio.sleep(max(0.0, target - time.perf_counter()))
+            else:
+                await asyncio.sleep(0)
+
+
+async def run(args):
+    from ..JKChatBridge import JKChatBridge
+
+    for name in ("JKChatBridge", "asyncio"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    data_path = tempfile.mkdtemp(prefix="jkbench-")
+    try:
+        await setup_red(data_path)
+        loop = asyncio.get_running_loop()
+        stub = RconStub()
+        transport, _ = await loop.create_datagram_endpoint(lambda: stub, local_addr=("127.0.0.1", 0))
+        rcon_port = transport.get_extra_info("sockname")[1]
+
+        log_dir = os.path.join(data_path, "server")
+        os.makedirs(log_dir)
+        log_file = os.path.join(log_dir, "qconsole.log")
+        open(log_file, "w").close()
+
+        channel = FakeChannel(1)
+        cog = JKChatBridge(FakeBot(channel))
+        for key, value in {
+            "log_base_path": log_dir,
+            "discord_channel_id": channel.id,
+            "rcon_host": "127.0.0.1",
+            "rcon_port": rcon_port,
+            "rcon_password": RCON_PASSWORD,
+            "bot_name": "BenchBot",
+        }.items():
+            await getattr(cog.config, key).set(value)
+        await cog.cog_load()
+        if args.discord_rate:
+            cog.outbox.rate = cog.outbox.burst = args.discord_rate
+        server = cog.servers["default"]
+        while server.tailer is None:
+            await asyncio.sleep(0.01)
+
+        lines = load_lines(args.log)
+        written = {}
+        start = time.perf_counter()
+        await replay(log_file, lines, args.rate, written)
+        size_after = os.path.getsize(log_file)
+        while server.tailer.offset < size_after:
+            await asyncio.sleep(0.005)
+        ingest_time = time.perf_counter() - start
+
+        expected = {i for i, line in enumerate(lines) if TAG_RE.search(line)}
+        deadline = time.perf_counter() + args.drain_timeout
+        while not expected <= channel.received.keys() and time.perf_counter() < deadline:
+            await asyncio.sleep(0.05)
+        latencies = [channel.received[i] - written[i] for i in expected if i in channel.received]
+
+        rtts = []
+        for _ in range(args.rcon_probes):
+            sent = time.perf_counter()
+            await server.rcon_scheduler.run("status")
+            rtts.append(time.perf_counter() - sent)
+
+        await cog.cog_unload()
+        transport.close()
+    finally:
+        shutil.rmtree(data_path, ignore_errors=True)
+
+    print(f"log:          {args.log} ({len(lines)} lines, replay rate {args.rate or 'max'} lines/s)")
+    print(f"ingest:       {len(lines) / ingest_time:,.0f} lines/s ({ingest_time:.2f}s)")
+    print(f"discord:      {channel.messages} messages carrying {len(latencies)}/{len(expected)} chat lines")
+    lat = percentiles(latencies)
+    print("log->discord: " + "  ".join(f"{k} {v * 1000:.0f}ms" for k, v in lat.items()))
+    rtt = percentiles(rtts)
+    print(f"rcon rtt:     {len(rtts)} probes  " + "  ".join(f"{k} {v * 1000:.1f}ms" for k, v in rtt.items()))
+    print(f"rcon stub:    {len(stub.commands)} commands received")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a qconsole.log through JKChatBridge offline.")
+    parser.add_argument("--log", default=CORPUS, help="recorded qconsole.log to replay")
+    parser.add_argument("--rate", type=float, default=1000, help="lines per second to write (0 = as fast as possible)")
+    parser.add_argument("--rcon-probes", type=int, default=50, help="status round-trips to time after the replay")
+    parser.add_argument("--discord-rate", type=float, default=0,
+                        help="override the outbox messages/sec budget (default: the cog's Discord-safe limit)")
+    parser.add_argument("--drain-timeout", type=float, default=60, help="seconds to wait for Discord output to drain")
+    args = parser.parse_args(argv)
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""Microbenchmarks for the log parsing and emote translation hot paths.
+
+Run from the directory that contains the cog, e.g.::
+
+    python -m JKChatBridge.bench.micro
+    python -m JKChatBridge.bench.micro --save baseline.json
+    python -m JKChatBridge.bench.micro --compare baseline.json --tolerance 0.15
+
+``--compare`` exits with status 1 if any benchmark got slower than the saved
+baseline by more than the tolerance.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from ..classifier import LogClassifier, parse_chat_line, remove_color_codes
+from ..emotes import DEFAULT_EMOTES, EmoteEngine
+
+CORPUS = os.path.join(os.path.dirname(__file__), "corpus.log")
+
+
+def load_corpus(path=CORPUS):
+    with open(path, "r", encoding="latin-1") as f:
+        return [line.strip() for line in f]
+
+
+def legacy_emote_replace(text):
+    """The per-entry str.replace loop the emote engine replaced, kept for comparison."""
+    for emote, emoji in DEFAULT_EMOTES.items():
+        text = text.replace(emote, emoji)
+    return text
+
+
+def measure(func, items, repeat):
+    """Best-of-``repeat`` time for one pass of ``func`` over ``items``, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            func(item)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def build_benchmarks(lines):
+    classifier = LogClassifier()
+    emotes = EmoteEngine()
+    chat_lines = [line for line in lines if "say: " in line]
+    fragments = []
+    messages = []
+    for line in chat_lines:
+        _, _, chat = line.partition("say: ")
+        name, _, message = chat.partition(": ")
+        fragments.extend((name, message))
+        messages.append(message)
+    # Discord-length messages: 40 chat lines glued together.
+    long_messages = [" ".join(messages[i:i + 40]) for i in range(0, len(messages) - 40, 40)]
+    emoji_messages = [emotes.to_emoji(message) for message in long_messages]
+    return {
+        "parse_chat_line": (parse_chat_line, chat_lines),
+        "remove_color_codes": (remove_color_codes, fragments),
+        "classify": (classifier.classify, lines),
+        "emotes_legacy_short": (legacy_emote_replace, messages),
+        "emotes_to_emoji_short": (emotes.to_emoji, messages),
+        "emotes_legacy_long": (legacy_emote_replace, long_messages),
+        "emotes_to_emoji_long": (emotes.to_emoji, long_messages),
+        "emotes_to_text_long": (emotes.to_text, emoji_messages),
+    }
+
+
+def run(lines, repeat):
+    results = {}
+    for name, (func, items) in build_benchmarks(lines).items():
+        elapsed = measure(func, items, repeat)
+        results[name] = {
+            "items": len(items),
+            "ns_per_item": elapsed / len(items) * 1e9 if items else 0.0,
+            "items_per_sec": len(items) / elapsed if elapsed else 0.0,
+        }
+    return results
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]["ns_per_item"]
+        after = result["ns_per_item"]
+        if before and after > before * (1 + tolerance):
+            regressions.append(f"{name}: {before:.0f} -> {after:.0f} ns/item (+{(after / before - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", default=CORPUS, help="qconsole.log sample to parse")
+    parser.add_argument("--repeat", type=int, default=5, help="passes per benchmark; the best one is reported")
+    parser.add_argument("--save", metavar="FILE", help="write results as JSON")
+    parser.add_argument("--compare", metavar="FILE", help="fail if slower than this JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown for --compare (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    lines = load_corpus(args.corpus)
+    results = run(lines, args.repeat)
+    print(f"corpus: {args.corpus} ({len(lines)} lines)")
+    for name, result in results.items():
+        print(f"{name:<22} {result['items']:>7} items  {result['ns_per_item']:>9.0f} ns/item  {result['items_per_sec']:>12,.0f} items/s")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("Regressions:\n  " + "\n  ".join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""Microbenchmarks for the shared text normalization, against the code it replaced.
+
+Run from the directory that contains the cog, e.g.::
+
+    python -m JKChatBridge.bench.text
+    python -m JKChatBridge.bench.text --save baseline.json
+    python -m JKChatBridge.bench.text --compare baseline.json --tolerance 0.15
+
+Game-side text comes from the JKChatBridge log corpus; Discord-side text is
+the same chat with the emoji and typographic punctuation Discord clients
+add mixed in at a fixed seed.
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+
+from ..bridgetext import TellrawTemplate, latin1_name, mc_clean_name, q3_clean_name, strip_q3_colors, to_latin1
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus.log")
+DISCORD_EXTRAS = ["’", "…", "—", "😂", "👍", "❤️", "“", "”", "🔥"]
+
+
+def legacy_clean_for_latin1(text):
+    return ''.join(c if ord(c) < 256 else '' for c in text)
+
+
+def legacy_remove_color_codes(text):
+    return re.sub(r"\^\d", "", text or "")
+
+
+def legacy_tellraw(author, message):
+    base_json = [
+        {"text": "(", "color": "white"},
+        {"text": "Discord", "color": "aqua"},
+        {"text": ") ", "color": "white"},
+        {"text": f"{author}: ", "color": "white"}
+    ]
+    return f"tellraw @a {json.dumps(base_json + [{'text': message, 'color': 'white'}])}"
+
+
+def load_chat(path=CORPUS):
+    """``(name, message)`` pairs from the ``say:`` lines of a qconsole.log."""
+    pairs = []
+    with open(path, "r", encoding="latin-1") as f:
+        for line in f:
+            _, sep, chat = line.strip().partition("say: ")
+            name, colon, message = chat.partition(": ")
+            if sep and colon:
+                pairs.append((name, message))
+    return pairs
+
+
+def discordify(pairs, seed=0):
+    """Chat as Discord users would type it: display names and messages with some non-Latin-1 characters."""
+    rng = random.Random(seed)
+    out = []
+    for name, message in pairs:
+        name, message = strip_q3_colors(name), strip_q3_colors(message)
+        if rng.random() < 0.3:
+            words = message.split(" ")
+            words.insert(rng.randrange(len(words) + 1), rng.choice(DISCORD_EXTRAS))
+            message = " ".join(words)
+        if rng.random() < 0.1:
+            name += rng.choice(DISCORD_EXTRAS)
+        out.append((name, message))
+    return out
+
+
+def measure(func, items, repeat):
+    """Best-of-``repeat`` time for one pass of ``func`` over ``items``, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            func(*item)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def build_benchmarks(pairs):
+    discord = discordify(pairs)
+    game_names = [(name,) for name, _ in pairs]
+    game_messages = [(message,) for _, message in pairs]
+    discord_names = [(name,) for name, _ in discord]
+    discord_messages = [(message,) for _, message in discord]
+    template = TellrawTemplate([
+        {"text": "(", "color": "white"},
+        {"text": "Discord", "color": "aqua"},
+        {"text": ") ", "color": "white"},
+        {"text": "{author}", "color": "white"},
+        {"text": ": ", "color": "white"},
+        {"text": "{message}", "color": "white"}
+    ])
+    return {
+        "colors_legacy": (legacy_remove_color_codes, game_messages),
+        "colors": (strip_q3_colors, game_messages),
+        "names_legacy": (legacy_remove_color_codes, game_names),
+        "names_cached": (q3_clean_name, game_names),
+        "latin1_legacy": (legacy_clean_for_latin1, discord_messages),
+        "latin1": (to_latin1, discord_messages),
+        "latin1_names_legacy": (legacy_clean_for_latin1, discord_names),
+        "latin1_names_cached": (latin1_name, discord_names),
+        "mc_names_cached": (mc_clean_name, discord_names),
+        "tellraw_legacy": (legacy_tellraw, discord),
+        "tellraw_template": (lambda author, message: template.render(author=author, message=message), discord),
+    }
+
+
+def run(pairs, repeat):
+    results = {}
+    for name, (func, items) in build_benchmarks(pairs).items():
+        elapsed = measure(func, items, repeat)
+        results[name] = {
+            "items": len(items),
+            "ns_per_item": elapsed / len(items) * 1e9 if items else 0.0,
+            "items_per_sec": len(items) / elapsed if elapsed else 0.0,
+        }
+    return results
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]["ns_per_item"]
+        after = result["ns_per_item"]
+        if before and after > before * (1 + tolerance):
+            regressions.append(f"{name}: {before:.0f} -> {after:.0f} ns/item (+{(after / before - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", default=CORPUS, help="qconsole.log sample to take chat from")
+    parser.add_argument("--repeat", type=int, default=5, help="passes per benchmark; the best one is reported")
+    parser.add_argument("--save", metavar="FILE", help="write results as JSON")
+    parser.add_argument("--compare", metavar="FILE", help="fail if slower than this JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown for --compare (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    pairs = load_chat(args.corpus)
+    results = run(pairs, args.repeat)
+    print(f"corpus: {args.corpus} ({len(pairs)} chat lines)")
+    for name, result in results.items():
+        print(f"{name:<22} {result['items']:>7} items  {result['ns_per_item']:>9.0f} ns/item  {result['items_per_sec']:>12,.0f} items/s")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("Regressions:\n  " + "\n  ".join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,20 @@
+"""Text normalization and message packing shared by the chat bridge cogs.
+
+JKChatBridge and MCChatBridge each bundle an identical copy of this
+package, so either installs on its own; change both copies together.
+"""
+from .messages import DISCORD_MESSAGE_LIMIT, pack_lines
+from .minecraft import TellrawTemplate, mc_clean_name, strip_mc_formatting
+from .normalize import latin1_name, q3_clean_name, strip_q3_colors, to_latin1
+
+__all__ = [
+    "DISCORD_MESSAGE_LIMIT",
+    "TellrawTemplate",
+    "latin1_name",
+    "mc_clean_name",
+    "pack_lines",
+    "q3_clean_name",
+    "strip_mc_formatting",
+    "strip_q3_colors",
+    "to_latin1",
+]
@@ -0,0 +1,24 @@
+DISCORD_MESSAGE_LIMIT = 2000
+
+
+def pack_lines(lines, limit=DISCORD_MESSAGE_LIMIT):
+    """Join lines with newlines into as few messages as fit ``limit`` characters each."""
+    messages = []
+    current = ""
+    for line in lines:
+        while len(line) > limit:
+            if current:
+                messages.append(current)
+                current = ""
+            messages.append(line[:limit])
+            line = line[limit:]
+        if not current:
+            current = line
+        elif len(current) + 1 + len(line) <= limit:
+            current = f"{current}\n{line}"
+        else:
+            messages.append(current)
+            current = line
+    if current:
+        messages.append(current)
+    return messages
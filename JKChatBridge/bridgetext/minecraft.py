@@ -0,0 +1,49 @@
+import json
+import re
+from functools import lru_cache
+from json.encoder import encode_basestring_ascii
+
+# Legacy section-sign formatting still renders inside tellraw text.
+MC_FORMAT_RE = re.compile("§[0-9a-fk-orx]", re.IGNORECASE)
+_CONTROL_RE = re.compile(r"[\x00-\x1f\x7f]+")
+_SLOT_RE = re.compile(r'"\{(\w+)\}"')
+
+
+def strip_mc_formatting(text):
+    """Remove ``§`` formatting codes and control characters."""
+    if not text:
+        return ""
+    if "§" in text:
+        text = MC_FORMAT_RE.sub("", text)
+    if not text.isprintable():
+        text = _CONTROL_RE.sub(" ", text)
+    return text
+
+
+@lru_cache(maxsize=4096)
+def mc_clean_name(name):
+    """A name that can't restyle the chat line it is shown in."""
+    return strip_mc_formatting(name).strip()
+
+
+class TellrawTemplate:
+    """A ``tellraw`` command compiled once, with text slots filled per call.
+
+    ``components`` is the usual list of JSON text components. A ``"text"``
+    value written as ``"{name}"`` is a slot: ``render(name=...)`` puts the
+    JSON-escaped value there and the rest of the command is reused as is.
+    """
+
+    def __init__(self, components, target="@a"):
+        command = f"tellraw {target} " + json.dumps(components, separators=(",", ":"))
+        parts = _SLOT_RE.split(command)
+        self._literals = parts[0::2]
+        self.slots = tuple(parts[1::2])
+
+    def render(self, **values) -> str:
+        literals = self._literals
+        out = [literals[0]]
+        for slot, literal in zip(self.slots, literals[1:]):
+            out.append(encode_basestring_ascii(values[slot]))
+            out.append(literal)
+        return "".join(out)
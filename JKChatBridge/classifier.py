@@ -0,0 +1,139 @@
+import re
+
+# The log worker runs as a script and imports this module from its own directory.
+if __package__:
+    from .bridgetext import q3_clean_name, strip_q3_colors as remove_color_codes
+else:
+    from bridgetext import q3_clean_name, strip_q3_colors as remove_color_codes
+
+EVENT_PLAYER_IP = "player_ip"
+EVENT_CHAT = "chat"
+EVENT_DUEL = "duel"
+EVENT_SHUTDOWN = "shutdown"
+EVENT_INIT = "init"
+EVENT_MAP_LOADED = "map_loaded"
+EVENT_JOIN = "join"
+EVENT_DISCONNECT = "disconnect"
+EVENT_USERINFO = "userinfo"
+
+# One alternation for every marker we care about. The leftmost marker in the
+# line wins, which for real logs is the one right after the timestamp. The
+# lookahead lets the scanner skip positions that can't start any marker.
+_MARKER_RE = re.compile(
+    r"(?=[isdSGC-])(?:"
+    r"(?P<player_ip>info: IP: )"
+    r"|(?P<chat>say: )"
+    r"|(?P<duel>duel:)"
+    r"|(?P<shutdown>ShutdownGame:)"
+    r"|(?P<init>------ Server Initialization ------)"
+    r"|(?P<map_loaded>Server: )"
+    r"|(?P<join>Going from CS_PRIMED to CS_ACTIVE for )"
+    r"|(?P<userinfo>ClientUserinfoChanged: )"
+    r"|(?P<disconnect>info:\s*(?P<dc_name>.+?)\s*disconnected\s*\((?P<dc_slot>\d+)\))"
+    r")"
+)
+
+
+def parse_chat_line(line):
+    say_idx = line.find("say: ")
+    if say_idx == -1:
+        return None, None
+    chat = line[say_idx + 5:]
+    colon_idx = chat.find(": ")
+    if colon_idx == -1:
+        return None, None
+    name = remove_color_codes(chat[:colon_idx].strip())
+    msg = remove_color_codes(chat[colon_idx + 2:].strip())
+    return name, msg
+
+
+class LogEvent:
+    __slots__ = ("kind", "line", "data")
+
+    def __init__(self, kind, line, data):
+        self.kind = kind
+        self.line = line
+        self.data = data
+
+    def __repr__(self):
+        return f"LogEvent({self.kind!r}, {self.data!r})"
+
+
+class LogClassifier:
+    """Tags log lines with an event type in a single regex pass.
+
+    Lines that match no marker, or whose fields can't be extracted, classify
+    as ``None``. The resulting ``LogEvent``s are routed by ``EventRouter``.
+    """
+
+    def classify(self, line):
+        match = _MARKER_RE.search(line)
+        if match is None:
+            return None
+        kind = match.lastgroup
+        rest = line[match.end():]
+
+        if kind == EVENT_CHAT:
+            if "tell:" in line or "[Discord]" in line:
+                return None
+            colon_idx = rest.find(": ")
+            if colon_idx == -1:
+                return None
+            name = q3_clean_name(rest[:colon_idx].strip())
+            message = remove_color_codes(rest[colon_idx + 2:].strip())
+            if not name or not message:
+                return None
+            return LogEvent(kind, line, {"name": name, "message": message})
+
+        if kind == EVENT_PLAYER_IP:
+            # "<name> <ip> slot <n>"; the name may itself contain spaces.
+            parts = rest.rsplit(None, 3)
+            if len(parts) != 4 or not parts[3].isdigit():
+                return None
+            name, ip, _, slot = parts
+            return LogEvent(kind, line, {
+                "ip": ip,
+                "slot": int(slot),
+                "name": name,
+                "clean_name": q3_clean_name(name),
+            })
+
+        if kind == EVENT_USERINFO:
+            slot, _, info = rest.partition(" ")
+            if not slot.isdigit():
+                return None
+            fields = info.split("\\")
+            userinfo = dict(zip(fields[::2], fields[1::2]))
+            name = userinfo.get("n")
+            if name is None:
+                return None
+            return LogEvent(kind, line, {
+                "slot": int(slot),
+                "name": name,
+                "clean_name": q3_clean_name(name),
+                # Bot userinfo carries a skill level; humans' never does.
+                "is_bot": "skill" in userinfo,
+            })
+
+        if kind == EVENT_DUEL:
+            parts = rest.split("won a duel against")
+            if len(parts) != 2:
+                return None
+            return LogEvent(kind, line, {"winner": parts[0].strip(), "loser": parts[1].strip()})
+
+        if kind == EVENT_JOIN:
+            name = rest.strip()
+            return LogEvent(kind, line, {"name": name, "clean_name": q3_clean_name(name)})
+
+        if kind == EVENT_DISCONNECT:
+            name = match.group("dc_name")
+            return LogEvent(kind, line, {
+                "name": name,
+                "clean_name": q3_clean_name(name),
+                "slot": int(match.group("dc_slot")),
+            })
+
+        if kind == EVENT_MAP_LOADED:
+            return LogEvent(kind, line, {"map": rest.strip()})
+
+        return LogEvent(kind, line, {})
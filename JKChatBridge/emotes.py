@@ -0,0 +1,65 @@
+import re
+
+DEFAULT_EMOTES = {
+    ":)": "😊", ":D": "😄", "XD": "😂", "xD": "😆", ";)": "😉", ":P": "😛", ":(": "😢",
+    ">:(": "😡", ":+1:": "👍", ":-1:": "👎", "<3": "❤️", ":*": "😘", ":S": "😣",
+    ":o": "😮", "=D": "😁", "O.o": "😳", "B)": "🤓", "-_-": "😴", "^^;": "😅",
+    ":/": "😒", "8)": "😎", "D:": "😱", ":?": "🤔", "\\o/": "🥳", ">^.^<": "🤗", ":p": "🤪",
+    ":pray:": "🙏", ":wave:": "👋", ":-|": "😶", "*.*": "🤩", "O:)": "😇",
+    ":jackolantern:": ":jack_o_lantern:", ":christmastree:": ":christmas_tree:", ":lol:": ":rofl:"
+}
+
+
+def _compile(patterns):
+    if not patterns:
+        return re.compile(r"(?!)")
+    # Longest first, so at every position the alternation takes the longest emote.
+    return re.compile("|".join(re.escape(p) for p in sorted(patterns, key=len, reverse=True)))
+
+
+class EmoteEngine:
+    """Translates text emotes to emoji (game -> Discord) and back (Discord -> game).
+
+    Each direction is one compiled matcher that replaces the leftmost-longest
+    emote in a single pass, so results don't depend on table order. Matchers
+    are rebuilt lazily after ``add``/``remove``, never per call.
+    """
+
+    def __init__(self, table=None):
+        self._table = dict(DEFAULT_EMOTES if table is None else table)
+        self._to_emoji = None
+        self._to_text = None
+        self._reverse = {}
+
+    @property
+    def table(self) -> dict:
+        return dict(self._table)
+
+    def add(self, emote, replacement):
+        self._table[emote] = replacement
+        self._to_emoji = None
+
+    def remove(self, emote) -> bool:
+        if self._table.pop(emote, None) is None:
+            return False
+        self._to_emoji = None
+        return True
+
+    def _build(self):
+        self._reverse = {}
+        for emote, replacement in self._table.items():
+            self._reverse.setdefault(replacement, emote)
+        self._to_emoji = _compile(self._table)
+        self._to_text = _compile(self._reverse)
+
+    def to_emoji(self, text):
+        if self._to_emoji is None:
+            self._build()
+        table = self._table
+        return self._to_emoji.sub(lambda m: table[m.group(0)], text)
+
+    def to_text(self, text):
+        if self._to_emoji is None:
+            self._build()
+        reverse = self._reverse
+        return self._to_text.sub(lambda m: reverse[m.group(0)], text)
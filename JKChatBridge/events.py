@@ -0,0 +1,139 @@
+import asyncio
+import logging
+import time
+from collections import Counter, defaultdict, deque
+
+from .classifier import EVENT_CHAT, EVENT_MAP_LOADED, EVENT_PLAYER_IP
+
+logger = logging.getLogger("JKChatBridge.events")
+
+
+class _Consumer:
+    def __init__(self, name, maxsize):
+        self.name = name
+        self.pending = deque(maxlen=maxsize)
+        self.handlers = defaultdict(list)
+        self.wakeup = asyncio.Event()
+        self.task = None
+        self.processed = 0
+        self.dropped = 0
+        self.failed = 0
+        self.total_lag = 0.0
+        self.max_lag = 0.0
+
+
+class EventRouter:
+    """Hands classified log events from the tail loop to independent consumers.
+
+    ``observe`` callbacks are plain functions run inside ``publish`` for cheap
+    state bookkeeping (the roster), so state is current before anything
+    reacts. ``register`` handlers are coroutines run by a named consumer task
+    off its own bounded queue; a consumer that falls behind drops its oldest
+    events instead of holding up the log reader or the other consumers.
+    """
+
+    def __init__(self, *, maxsize=1000):
+        self.maxsize = maxsize
+        self._observers = defaultdict(list)
+        self._consumers = {}
+        self._routes = defaultdict(list)  # kind -> consumers with handlers for it
+
+    def observe(self, kind, callback):
+        self._observers[kind].append(callback)
+
+    def register(self, kind, handler, consumer):
+        queue = self._consumers.get(consumer)
+        if queue is None:
+            queue = self._consumers[consumer] = _Consumer(consumer, self.maxsize)
+        if kind not in queue.handlers:
+            self._routes[kind].append(queue)
+        queue.handlers[kind].append(handler)
+
+    def apply(self, event):
+        """Run only the observers for ``event``, e.g. for stale lines nobody should react to."""
+        for callback in self._observers.get(event.kind, ()):
+            try:
+                callback(event)
+            except Exception as e:
+                logger.error(f"Error observing {event.kind} event: {e}")
+
+    def publish(self, event):
+        """Apply observers and queue ``event`` for its consumers; never waits."""
+        self.apply(event)
+        now = time.monotonic()
+        for queue in self._routes.get(event.kind, ()):
+            if len(queue.pending) == queue.pending.maxlen:
+                queue.dropped += 1
+            queue.pending.append((event, now))
+            queue.wakeup.set()
+
+    def start(self):
+        loop = asyncio.get_running_loop()
+        for queue in self._consumers.values():
+            if queue.task is None or queue.task.done():
+                queue.task = loop.create_task(self._run(queue))
+
+    async def stop(self):
+        for queue in self._consumers.values():
+            if queue.task and not queue.task.done():
+                queue.task.cancel()
+                try:
+                    await queue.task
+                except asyncio.CancelledError:
+                    pass
+            queue.pending.clear()
+
+    def stats(self) -> dict:
+        """Per-consumer queue depth, counters and queue lag in seconds."""
+        now = time.monotonic()
+        return {
+            name: {
+                "depth": len(queue.pending),
+                "processed": queue.processed,
+                "dropped": queue.dropped,
+                "failed": queue.failed,
+                "avg_lag": queue.total_lag / queue.processed if queue.processed else 0.0,
+                "max_lag": queue.max_lag,
+                "oldest_lag": now - queue.pending[0][1] if queue.pending else 0.0,
+            }
+            for name, queue in self._consumers.items()
+        }
+
+    async def _run(self, queue):
+        while True:
+            if not queue.pending:
+                queue.wakeup.clear()
+                await queue.wakeup.wait()
+                continue
+            event, queued = queue.pending.popleft()
+            lag = time.monotonic() - queued
+            queue.total_lag += lag
+            queue.max_lag = max(queue.max_lag, lag)
+            for handler in queue.handlers[event.kind]:
+                try:
+                    await handler(event)
+                except Exception as e:
+                    queue.failed += 1
+                    logger.error(f"Error handling {event.kind} event in {queue.name}: {e}")
+            queue.processed += 1
+
+
+class CatchUpSummary:
+    """Tally of a backlog that was read without reacting to it."""
+
+    def __init__(self, chat_lines=5):
+        self.started = time.monotonic()
+        self.lines = 0
+        self.counts = Counter()
+        self.recent_chat = deque(maxlen=chat_lines)
+        self.ip_events = {}  # slot -> latest IP event
+        self.last_map = None
+
+    def add(self, event):
+        self.counts[event.kind] += 1
+        if event.kind == EVENT_CHAT:
+            self.recent_chat.append(event)
+        elif event.kind == EVENT_PLAYER_IP:
+            self.ip_events[event.data["slot"]] = event
+        elif event.kind == EVENT_MAP_LOADED:
+            self.last_map = event.data["map"]
@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import time
+from collections import deque
+
+from .bridgetext import DISCORD_MESSAGE_LIMIT, pack_lines
+from .ratelimit import TokenBucket
+
+logger = logging.getLogger("JKChatBridge.outbox")
+
+
+class _ChannelQueue:
+    def __init__(self, channel, rate, burst):
+        self.channel = channel
+        self.pending = deque()
+        self.pending_chars = 0
+        self.bucket = TokenBucket(rate, burst)
+        self.wakeup = asyncio.Event()
+        self.task = None
+        self.messages_sent = 0
+        self.lines_sent = 0
+        self.dropped = 0
+        self.unreported_drops = 0
+        self.total_lag = 0.0
+        self.max_lag = 0.0
+        self.last_lag = 0.0
+
+
+class DiscordOutbox:
+    """Per-channel outbound queue that merges bursts of game events into few messages.
+
+    Lines queued within ``window`` seconds of each other are sent as one
+    message (split at Discord's 2000 character limit). Every channel has its
+    own token bucket sized to Discord's per-channel limit, so bursts wait
+    here instead of running into 429s, and log reading never waits on it.
+    The backlog is bounded by what fits in ``max_pending_messages`` full
+    messages; past that the oldest lines are dropped, with a warning.
+    """
+
+    def __init__(self, *, window=0.3, rate=1.0, burst=5, max_pending_messages=100):
+        self.window = window
+        self.rate = rate
+        self.burst = burst
+        self.max_pending_chars = max_pending_messages * DISCORD_MESSAGE_LIMIT
+        self._queues = {}
+
+    def send(self, channel, text):
+        """Queue ``text`` for ``channel`` without waiting."""
+        queue = self._queues.get(channel.id)
+        if queue is None:
+            queue = self._queues[channel.id] = _ChannelQueue(channel, self.rate, self.burst)
+        queue.channel = channel
+        queue.pending.append((text, time.monotonic()))
+        queue.pending_chars += len(text) + 1
+        while queue.pending_chars > self.max_pending_chars:
+            dropped, _ = queue.pending.popleft()
+            queue.pending_chars -= len(dropped) + 1
+            queue.dropped += 1
+            queue.unreported_drops += 1
+        if queue.task is None or queue.task.done():
+            queue.task = asyncio.get_running_loop().create_task(self._run(queue))
+        queue.wakeup.set()
+
+    async def stop(self):
+        for queue in self._queues.values():
+            if queue.task and not queue.task.done():
+                queue.task.cancel()
+                try:
+                    await queue.task
+                except asyncio.CancelledError:
+                    pass
+        self._queues.clear()
+
+    def stats(self) -> dict:
+        """Per-channel queue depth, throughput and queue lag in seconds."""
+        now = time.monotonic()
+        return {
+            channel_id: {
+                "pending": len(queue.pending),
+                "oldest_lag": now - queue.pending[0][1] if queue.pending else 0.0,
+                "messages_sent": queue.messages_sent,
+                "lines_sent": queue.lines_sent,
+                "dropped": queue.dropped,
+                "avg_lag": queue.total_lag / queue.lines_sent if queue.lines_sent else 0.0,
+                "max_lag": queue.max_lag,
+                "last_lag": queue.last_lag,
+            }
+            for channel_id, queue in self._queues.items()
+        }
+
+    async def _run(self, queue):
+        while True:
+            await queue.wakeup.wait()
+            queue.wakeup.clear()
+            if not queue.pending:
+                continue
+            # Give the rest of a burst a moment to arrive before packing.
+            await asyncio.sleep(self.window)
+            batch = list(queue.pending)
+            queue.pending.clear()
+            queue.pending_chars = 0
+            if queue.unreported_drops:
+                logger.warning(
+                    f"Dropped {queue.unreported_drops} queued lines for channel {queue.channel.id}: "
+                    f"more than {self.max_pending_chars} characters were waiting to be sent"
+                )
+                queue.unreported_drops = 0
+            for message in pack_lines([text for text, _ in batch]):
+                delay = queue.bucket.delay()
+                while delay:
+                    await asyncio.sleep(delay)
+                    delay = queue.bucket.delay()
+                queue.bucket.try_acquire()
+                try:
+                    await queue.channel.send(message)
+                    queue.messages_sent += 1
+                except Exception as e:
+                    # Connection errors too; the task must survive to send the next batch.
+                    logger.error(f"Failed to send to channel {queue.channel.id}: {e!r}")
+            now = time.monotonic()
+            for _, queued in batch:
+                lag = now - queued
+                queue.total_lag += lag
+                queue.max_lag = max(queue.max_lag, lag)
+                queue.last_lag = lag
+            queue.lines_sent += len(batch)
+            if queue.pending:
+                queue.wakeup.set()
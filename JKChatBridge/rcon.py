@@ -0,0 +1,153 @@
+import asyncio
+import contextlib
+import logging
+
+logger = logging.getLogger("JKChatBridge.rcon")
+
+RCON_HEADER = b"\xff\xff\xff\xff"
+
+
+class RconError(Exception):
+    """Raised when an RCON command cannot be delivered."""
+
+
+class _RconProtocol(asyncio.DatagramProtocol):
+    def __init__(self, client):
+        self.client = client
+
+    def datagram_received(self, data, addr):
+        self.client._on_datagram(data)
+
+    def error_received(self, exc):
+        logger.debug(f"RCON socket error from {self.client.host}:{self.client.port}: {exc}")
+
+    def connection_lost(self, exc):
+        self.client._on_connection_lost()
+
+
+class RconClient:
+    """Long-lived UDP RCON client for a single Quake 3 engine server.
+
+    The socket stays open between commands. A response ends as soon as the
+    server stops sending packets for ``quiet_period`` seconds, so a typical
+    command returns in a fraction of a second instead of a fixed read window.
+    Commands that wait for a reply are serialized because the protocol has no
+    request IDs; fire-and-forget commands (``say``, ``sayasbot``) never wait,
+    but a waited command lets their replies settle before it is sent.
+    ``collecting`` keeps the reply window open across many sends for bulk
+    lookups whose replies identify themselves.
+    """
+
+    def __init__(self, host, port, password, *, quiet_period=0.2, first_packet_timeout=1.0, max_wait=5.0):
+        self.host = host
+        self.port = int(port)
+        self.password = password
+        self.quiet_period = quiet_period
+        self.first_packet_timeout = first_packet_timeout
+        self.max_wait = max_wait
+        self._transport = None
+        self._inbox = None
+        self._last_unanswered = 0.0
+        self._connect_lock = asyncio.Lock()
+        self._request_lock = asyncio.Lock()
+
+    def matches(self, host, port, password) -> bool:
+        return (self.host, self.port, self.password) == (host, int(port), password)
+
+    async def _ensure_transport(self):
+        if self._transport is not None and not self._transport.is_closing():
+            return
+        async with self._connect_lock:
+            if self._transport is not None and not self._transport.is_closing():
+                return
+            loop = asyncio.get_running_loop()
+            try:
+                self._transport, _ = await loop.create_datagram_endpoint(
+                    lambda: _RconProtocol(self), remote_addr=(self.host, self.port)
+                )
+            except OSError as e:
+                raise RconError(f"RCON error: {e}") from e
+            logger.debug(f"Opened RCON socket to {self.host}:{self.port}")
+
+    def _build_packet(self, command) -> bytes:
+        # Characters outside Latin-1 are dropped, matching what the game can display.
+        pwd = self.password.encode("latin-1", errors="ignore")
+        cmd = command.encode("latin-1", errors="ignore")
+        return RCON_HEADER + b"rcon " + pwd + b" " + cmd
+
+    def _on_datagram(self, data):
+        # Replies to fire-and-forget commands arrive with no one waiting; drop them.
+        if self._inbox is not None:
+            self._inbox.put_nowait(data)
+
+    def _on_connection_lost(self):
+        self._transport = None
+
+    async def send(self, command):
+        """Send a command without waiting for the server's reply."""
+        await self._ensure_transport()
+        try:
+            self._transport.sendto(self._build_packet(command))
+        except OSError as e:
+            raise RconError(f"RCON error: {e}") from e
+        self._last_unanswered = asyncio.get_running_loop().time()
+
+    async def _settle(self):
+        settle = self._last_unanswered + self.quiet_period - asyncio.get_running_loop().time()
+        if settle > 0:
+            await asyncio.sleep(settle)
+
+    async def request(self, command) -> bytes:
+        """Send a command and return the raw response packets concatenated."""
+        async with self._request_lock:
+            await self._ensure_transport()
+            await self._settle()
+            self._inbox = asyncio.Queue()
+            try:
+                self._transport.sendto(self._build_packet(command))
+                return b"".join(await self._collect(self._inbox))
+            except OSError as e:
+                raise RconError(f"RCON error: {e}") from e
+            finally:
+                self._inbox = None
+
+    @contextlib.asynccontextmanager
+    async def collecting(self):
+        """Capture every reply packet while the block sends commands with ``send``.
+
+        Yields a list that is filled in once the block exits and the server has
+        gone quiet, one entry per packet in arrival order. Other waited
+        requests queue behind the block.
+        """
+        async with self._request_lock:
+            await self._ensure_transport()
+            await self._settle()
+            self._inbox = asyncio.Queue()
+            packets = []
+            try:
+                yield packets
+                packets.extend(await self._collect(self._inbox))
+            finally:
+                self._inbox = None
+
+    async def _collect(self, inbox) -> list:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        timeout = self.first_packet_timeout
+        chunks = []
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                data = await asyncio.wait_for(inbox.get(), min(timeout, remaining))
+            except asyncio.TimeoutError:
+                break
+            chunks.append(data)
+            timeout = self.quiet_period
+        return chunks
+
+    def close(self):
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
@@ -0,0 +1,174 @@
+import asyncio
+import logging
+import time
+from collections import deque
+
+from .ratelimit import TokenBucket
+from .scheduler import PRIORITY_CHAT
+
+logger = logging.getLogger("JKChatBridge.relay")
+
+SAY_TEXT_LIMIT = 150           # the game truncates say text beyond this (MAX_SAY_TEXT)
+DISCORD_TAG = "^5:discord: "
+SEPARATOR = " ^5| "
+
+
+def _split_point(text, limit):
+    """Index to cut ``text`` at so the head fits ``limit``: the last space, never inside a color code."""
+    split = text.rfind(" ", 0, limit + 1)
+    if split < limit // 2:
+        split = limit
+    if text[split - 1] == "^":
+        split -= 1
+    return split
+
+
+def pack_say(messages, limit=SAY_TEXT_LIMIT):
+    """Pack ``(username, text)`` pairs into as few ``say`` texts as fit ``limit`` characters each.
+
+    Short messages share a line, separated by ``SEPARATOR``; a message too
+    long for one line carries on in the following ones.
+    """
+    packed = []
+    current = ""
+    for username, text in messages:
+        segment = f"^7{username}: ^2{text}"
+        if current and len(current) + len(SEPARATOR) + len(segment) <= limit:
+            current += SEPARATOR + segment
+            continue
+        if current:
+            packed.append(current)
+        current = DISCORD_TAG + segment
+        while len(current) > limit:
+            split = _split_point(current, limit)
+            packed.append(current[:split].rstrip())
+            current = "^2" + current[split:].strip()
+    if current:
+        packed.append(current)
+    return packed
+
+
+class _ChannelQueue:
+    def __init__(self, rate, burst, max_pending):
+        self.pending = deque(maxlen=max_pending)
+        self.bucket = TokenBucket(rate, burst)
+        self.wakeup = asyncio.Event()
+        self.task = None
+        self.messages = 0
+        self.commands = 0
+        self.dropped = 0
+        self.total_lag = 0.0
+        self.max_lag = 0.0
+
+
+class GameRelay:
+    """Outbound pipeline for Discord chat relayed into the game.
+
+    Each Discord user has a token bucket: messages beyond it are refused
+    instead of flooding the server. Each channel queues its messages and
+    sends them as packed ``say`` commands on the scheduler's chat lane,
+    paced by a per-channel bucket. While a channel waits on its bucket, new
+    messages keep joining the queue, so a busy channel sends fuller lines
+    rather than more of them.
+    """
+
+    def __init__(self, submit, *, window=0.25, user_rate=0.5, user_burst=4,
+                 channel_rate=2.0, channel_burst=4, max_pending=100):
+        self._submit = submit
+        self.window = window
+        self.user_rate = user_rate
+        self.user_burst = user_burst
+        self.channel_rate = channel_rate
+        self.channel_burst = channel_burst
+        self.max_pending = max_pending
+        self._users = {}   # Discord user ID -> TokenBucket
+        self._queues = {}  # Discord channel ID -> _ChannelQueue
+        self.refused = 0
+
+    def send(self, channel_id, user_id, username, text) -> bool:
+        """Queue a message for the game; False if the user is over their rate limit."""
+        bucket = self._users.get(user_id)
+        if bucket is None:
+            if len(self._users) >= 1000:
+                self._prune_users()
+            bucket = self._users[user_id] = TokenBucket(self.user_rate, self.user_burst)
+        if not bucket.try_acquire():
+            self.refused += 1
+            logger.debug(f"Refused relay from Discord user {user_id}: over the rate limit")
+            return False
+        queue = self._queues.get(channel_id)
+        if queue is None:
+            queue = self._queues[channel_id] = _ChannelQueue(self.channel_rate, self.channel_burst, self.max_pending)
+        if len(queue.pending) == queue.pending.maxlen:
+            queue.dropped += 1
+        queue.pending.append((username, text, time.monotonic()))
+        if queue.task is None or queue.task.done():
+            queue.task = asyncio.get_running_loop().create_task(self._run(queue))
+        queue.wakeup.set()
+        return True
+
+    def _prune_users(self):
+        # Buckets that have refilled completely carry no state worth keeping.
+        now = time.monotonic()
+        idle = self.user_burst / self.user_rate
+        for user_id in [uid for uid, bucket in self._users.items() if now - bucket.updated > idle]:
+            del self._users[user_id]
+
+    async def stop(self):
+        for queue in self._queues.values():
+            if queue.task and not queue.task.done():
+                queue.task.cancel()
+                try:
+                    await queue.task
+                except asyncio.CancelledError:
+                    pass
+        self._queues.clear()
+
+    def stats(self) -> dict:
+        """Per-channel queue depth, messages in, say commands out and queue lag in seconds."""
+        now = time.monotonic()
+        return {
+            channel_id: {
+                "pending": len(queue.pending),
+                "oldest_lag": now - queue.pending[0][2] if queue.pending else 0.0,
+                "messages": queue.messages,
+                "commands": queue.commands,
+                "dropped": queue.dropped,
+                "avg_lag": queue.total_lag / queue.messages if queue.messages else 0.0,
+                "max_lag": queue.max_lag,
+            }
+            for channel_id, queue in self._queues.items()
+        }
+
+    async def _wait_for_token(self, queue):
+        delay = queue.bucket.delay()
+        while delay:
+            await asyncio.sleep(delay)
+            delay = queue.bucket.delay()
+        queue.bucket.try_acquire()
+
+    async def _run(self, queue):
+        while True:
+            await queue.wakeup.wait()
+            queue.wakeup.clear()
+            if not queue.pending:
+                continue
+            # Let the rest of a burst arrive, and hold everything while the channel is over its rate.
+            await asyncio.sleep(self.window)
+            await self._wait_for_token(queue)
+            batch = list(queue.pending)
+            queue.pending.clear()
+            commands = pack_say([(username, text) for username, text, _ in batch])
+            for i, command in enumerate(commands):
+                if i:
+                    await self._wait_for_token(queue)
+                self._submit(f"say {command}", PRIORITY_CHAT)
+            now = time.monotonic()
+            for _, _, queued in batch:
+                lag = now - queued
+                queue.total_lag += lag
+                queue.max_lag = max(queue.max_lag, lag)
+            queue.messages += len(batch)
+            queue.commands += len(commands)
+            if queue.pending:
+                queue.wakeup.set()
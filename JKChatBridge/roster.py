@@ -0,0 +1,124 @@
+import re
+import time
+
+from .bridgetext import q3_clean_name
+
+# "  3    12   50 ^1Kyle^7      50 1.2.3.4:29070   1234 25000" from the rcon status table.
+_STATUS_ROW_RE = re.compile(
+    r"^\s*(?P<slot>\d+)\s+-?\d+\s+(?:\d+|CNCT|ZMBI)\s+(?P<name>.*?)\s+\d+\s+(?P<address>\S+)\s+\d+\s+\d+\s*$"
+)
+
+
+def parse_status(text):
+    """Parse an rcon ``status`` reply into ``(slot, name, ip, is_bot)`` tuples."""
+    players = []
+    for line in text.splitlines():
+        match = _STATUS_ROW_RE.match(line)
+        if match is None:
+            continue
+        address = match.group("address")
+        is_bot = address == "bot"
+        ip = None if is_bot or address == "loopback" else address.rsplit(":", 1)[0]
+        name = match.group("name")
+        if name.endswith("^7"):
+            name = name[:-2]
+        players.append((int(match.group("slot")), name, ip, is_bot))
+    return players
+
+
+class Player:
+    __slots__ = ("slot", "name", "clean_name", "ip", "join_time", "is_bot", "active")
+
+    def __init__(self, slot, name="", ip=None, join_time=None, is_bot=False):
+        self.slot = slot
+        self.name = name
+        self.clean_name = q3_clean_name(name)
+        self.ip = ip
+        self.join_time = join_time
+        self.is_bot = is_bot
+        self.active = False
+
+    def __repr__(self):
+        return f"Player({self.slot}, {self.clean_name!r}, ip={self.ip!r}, bot={self.is_bot})"
+
+
+class PlayerRoster:
+    """Who is on the server right now, keyed by client slot.
+
+    Log events update it one player at a time; ``rebuild`` replaces it
+    wholesale from an rcon ``status`` reply. Lookups by slot and by clean
+    name are dictionary hits.
+    """
+
+    def __init__(self):
+        self._players = {}   # slot -> Player
+        self._by_name = {}   # lowercased clean name -> slot
+
+    def __len__(self):
+        return len(self._players)
+
+    def __iter__(self):
+        return iter(sorted(self._players.values(), key=lambda p: p.slot))
+
+    def get(self, slot):
+        return self._players.get(slot)
+
+    def find(self, name):
+        """Player with this name (color codes and case ignored), or None."""
+        slot = self._by_name.get(q3_clean_name(name).lower())
+        return None if slot is None else self._players.get(slot)
+
+    @property
+    def human_count(self):
+        return sum(1 for p in self._players.values() if not p.is_bot)
+
+    def update(self, slot, *, name=None, ip=None, is_bot=None):
+        """Record what a log line told us about ``slot`` and return its Player."""
+        player = self._players.get(slot)
+        if player is None:
+            player = self._players[slot] = Player(slot, join_time=time.time())
+        if name is not None and name != player.name:
+            self._unindex(player)
+            player.name = name
+            player.clean_name = q3_clean_name(name)
+        if ip is not None:
+            player.ip = ip
+        if is_bot is not None:
+            player.is_bot = is_bot
+        self._by_name[player.clean_name.lower()] = slot
+        return player
+
+    def activate(self, name):
+        """Mark the player with this name as in game; returns it, or None if unknown."""
+        player = self.find(name)
+        if player is not None:
+            player.active = True
+        return player
+
+    def remove(self, slot):
+        player = self._players.pop(slot, None)
+        if player is not None:
+            self._unindex(player)
+        return player
+
+    def clear(self):
+        self._players.clear()
+        self._by_name.clear()
+
+    def rebuild(self, players):
+        """Replace the roster with ``(slot, name, ip, is_bot)`` rows, keeping known join times."""
+        previous = self._players
+        self._players = {}
+        self._by_name = {}
+        for slot, name, ip, is_bot in players:
+            old = previous.get(slot)
+            same = old is not None and old.clean_name == q3_clean_name(name)
+            player = Player(slot, name, ip or (old.ip if same else None), old.join_time if same else None, is_bot)
+            player.active = True
+            self._players[slot] = player
+            self._by_name[player.clean_name.lower()] = slot
+
+    def _unindex(self, player):
+        key = player.clean_name.lower()
+        if self._by_name.get(key) == player.slot:
+            del self._by_name[key]
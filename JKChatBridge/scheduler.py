@@ -0,0 +1,196 @@
+import asyncio
+import logging
+import time
+from collections import deque
+
+from .ratelimit import TokenBucket
+
+logger = logging.getLogger("JKChatBridge.scheduler")
+
+PRIORITY_ADMIN = 0      # kicks, VPN alerts and operator commands
+PRIORITY_CHAT = 1       # Discord messages relayed into the game
+PRIORITY_LOOKUP = 2     # accountinfo lookups for jkplayer and jkleaderboard
+PRIORITY_COSMETIC = 3   # random chat, welcomes, duel announcements
+
+LANE_NAMES = {
+    PRIORITY_ADMIN: "admin",
+    PRIORITY_CHAT: "chat",
+    PRIORITY_LOOKUP: "lookup",
+    PRIORITY_COSMETIC: "cosmetic",
+}
+
+
+class CommandDropped(Exception):
+    """Raised on a queued command that was evicted to make room for a more important one."""
+
+
+class _Job:
+    __slots__ = ("command", "expect_response", "future", "enqueued")
+
+    def __init__(self, command, expect_response, future):
+        self.command = command
+        self.expect_response = expect_response
+        self.future = future
+        self.enqueued = time.monotonic()
+
+
+class _LaneStats:
+    __slots__ = ("submitted", "sent", "dropped", "total_wait", "max_wait")
+
+    def __init__(self):
+        self.submitted = 0
+        self.sent = 0
+        self.dropped = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+
+class RconScheduler:
+    """Priority queue in front of the RCON transport.
+
+    Each lane has its own token bucket and all lanes share a global bucket that
+    keeps the total command rate under the server's flood limits. The lanes
+    share one bounded capacity; when it is full the oldest command of the
+    lowest-priority non-empty lane is dropped, and a command less important
+    than everything queued is refused.
+    """
+
+    DEFAULT_LIMITS = {
+        PRIORITY_ADMIN: (5.0, 5),
+        PRIORITY_CHAT: (4.0, 8),
+        PRIORITY_LOOKUP: (3.0, 5),
+        PRIORITY_COSMETIC: (1.0, 2),
+    }
+
+    def __init__(self, send, *, limits=None, global_limit=(8.0, 10), max_queued=64):
+        self._send = send
+        limits = limits or self.DEFAULT_LIMITS
+        self._lanes = {priority: deque() for priority in LANE_NAMES}
+        self._buckets = {priority: TokenBucket(*limits[priority]) for priority in LANE_NAMES}
+        self._global = TokenBucket(*global_limit)
+        self._stats = {priority: _LaneStats() for priority in LANE_NAMES}
+        self.max_queued = max_queued
+        self._wakeup = asyncio.Event()
+        self._task = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        for lane in self._lanes.values():
+            while lane:
+                job = lane.popleft()
+                if not job.future.done():
+                    job.future.cancel()
+
+    def submit(self, command, priority=PRIORITY_CHAT, expect_response=False) -> asyncio.Future:
+        """Queue a command and return a future for its response (b"" when not awaited)."""
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(self._log_failure)
+        self._stats[priority].submitted += 1
+        if self.depth() >= self.max_queued and not self._make_room(priority):
+            self._stats[priority].dropped += 1
+            future.set_exception(CommandDropped(f"RCON queue full, dropped {LANE_NAMES[priority]} command"))
+            return future
+        self._lanes[priority].append(_Job(command, expect_response, future))
+        self._wakeup.set()
+        return future
+
+    async def run(self, command, priority=PRIORITY_ADMIN, expect_response=True) -> bytes:
+        return await self.submit(command, priority, expect_response)
+
+    def depth(self) -> int:
+        return sum(len(lane) for lane in self._lanes.values())
+
+    def stats(self) -> dict:
+        """Per-lane queue depth, counters and wait times in seconds."""
+        now = time.monotonic()
+        result = {}
+        for priority, name in LANE_NAMES.items():
+            lane = self._lanes[priority]
+            stats = self._stats[priority]
+            result[name] = {
+                "depth": len(lane),
+                "submitted": stats.submitted,
+                "sent": stats.sent,
+                "dropped": stats.dropped,
+                "avg_wait": stats.total_wait / stats.sent if stats.sent else 0.0,
+                "max_wait": stats.max_wait,
+                "oldest_wait": now - lane[0].enqueued if lane else 0.0,
+            }
+        return result
+
+    def _make_room(self, priority) -> bool:
+        for victim in sorted(self._lanes, reverse=True):
+            if victim < priority:
+                return False
+            lane = self._lanes[victim]
+            if lane:
+                job = lane.popleft()
+                self._stats[victim].dropped += 1
+                if not job.future.done():
+                    job.future.set_exception(CommandDropped(f"Dropped queued {LANE_NAMES[victim]} command"))
+                return True
+        return False
+
+    def _next_ready(self):
+        """Pop the most important job whose buckets allow it, or return the wait until one does."""
+        now = time.monotonic()
+        wait = None
+        global_delay = self._global.delay(now)
+        for priority in sorted(self._lanes):
+            lane = self._lanes[priority]
+            if not lane:
+                continue
+            delay = max(global_delay, self._buckets[priority].delay(now))
+            if delay == 0:
+                self._buckets[priority].try_acquire(now)
+                self._global.try_acquire(now)
+                return priority, lane.popleft(), None
+            wait = delay if wait is None else min(wait, delay)
+        return None, None, wait
+
+    async def _run(self):
+        while True:
+            priority, job, wait = self._next_ready()
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            if job.future.done():
+                continue
+            stats = self._stats[priority]
+            waited = time.monotonic() - job.enqueued
+            stats.sent += 1
+            stats.total_wait += waited
+            stats.max_wait = max(stats.max_wait, waited)
+            if job.expect_response:
+                # Replies can take a while; don't hold up the commands behind this one.
+                asyncio.get_running_loop().create_task(self._execute(job))
+            else:
+                await self._execute(job)
+
+    async def _execute(self, job):
+        try:
+            result = await self._send(job.command, job.expect_response)
+        except Exception as e:
+            if not job.future.done():
+                job.future.set_exception(e)
+        else:
+            if not job.future.done():
+                job.future.set_result(result)
+
+    @staticmethod
+    def _log_failure(future):
+        if not future.cancelled() and future.exception() is not None:
+            logger.debug(f"RCON command failed: {future.exception()}")
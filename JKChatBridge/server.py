@@ -0,0 +1,572 @@
+import asyncio
+import logging
+import os
+import random
+import time
+
+import aiofiles
+
+from .classifier import (
+    EVENT_CHAT, EVENT_DISCONNECT, EVENT_DUEL, EVENT_INIT, EVENT_JOIN, EVENT_MAP_LOADED, EVENT_PLAYER_IP,
+    EVENT_SHUTDOWN, EVENT_USERINFO, LogClassifier, remove_color_codes
+)
+from .events import CatchUpSummary, EventRouter
+from .rcon import RconClient
+from .relay import GameRelay
+from .roster import PlayerRoster, parse_status
+from .scheduler import PRIORITY_ADMIN, PRIORITY_CHAT, PRIORITY_COSMETIC, PRIORITY_LOOKUP, RconScheduler
+from .stats import PlayerStatsCache, match_replies, parse_accountinfo
+from .tailer import LogTailer
+from .tracker import TrackerPoller
+from .worker import ParserWorker, WorkerExited
+
+logger = logging.getLogger("JKChatBridge.server")
+
+
+class ServerMonitor:
+    """One game server bridged by the cog.
+
+    Owns everything tied to that server: the log reader task, the RCON
+    client and scheduler, the tracker poller, the player roster and the
+    restart state. The cog's Discord outbox, emote table, VPN checker and
+    archive are shared by every server. Each monitor starts, fails and
+    restarts on its own, so one unreachable server never stalls the others.
+    """
+
+    # === Adjustable Random Chat Settings ===
+    RANDOM_CHAT_INTERVAL = 360   # 6 minutes
+    RANDOM_CHAT_CHANCE = 0.4     # 40%
+
+    LOG_POSITION_SAVE_INTERVAL = 5  # seconds between read offset checkpoints
+
+    # === Backlog Catch-up ===
+    CATCHUP_THRESHOLD = 512 * 1024    # unread bytes that switch the tailer to catch-up mode
+    CATCHUP_CHUNK_SIZE = 1024 * 1024  # bytes per read while catching up
+    CATCHUP_CHAT_LINES = 5            # most recent chat lines quoted in the summary
+
+    # === Parser Worker Process ===
+    WORKER_MAX_BACKOFF = 60      # longest wait between worker restarts, in seconds
+    WORKER_HEALTHY_AFTER = 60    # a worker that ran this long resets the backoff
+
+    # === Server Tracker Polling ===
+    TRACKER_POLL_INTERVAL = 30   # seconds between background refreshes
+    TRACKER_MAX_AGE = 90         # jkstatus fetches live if the snapshot is older than this
+
+    PLAYER_STATS_TTL = 300       # seconds an accountinfo result is reused
+
+    ROSTER_REFRESH_DELAY = 15    # seconds after a map loads before re-reading status
+    MAP_RESUME_DELAY = 10        # seconds after a map loads before announcing it
+
+    def __init__(self, cog, name, settings):
+        self.cog = cog
+        self.bot = cog.bot
+        self.name = name
+        self.settings = settings
+        self.rcon_client = None
+        self.rcon_scheduler = RconScheduler(self.send_rcon_command)
+        self.relay = GameRelay(self.queue_rcon)
+        self.tracker = None
+        self.stats_cache = PlayerStatsCache(ttl=self.PLAYER_STATS_TTL)
+        self.monitoring = False
+        self.monitor_task = None
+        self.tailer = None
+        self.channel = None
+        self.last_line_time = None  # monotonic time the reader last returned lines
+        self.last_position_save = 0
+        self.worker_failures = 0
+        self.roster = PlayerRoster()
+        self.roster_task = None
+        self.classifier = LogClassifier()
+        self.events = EventRouter()
+        self._register_log_handlers()
+        self.map_resume_task = None
+        self.random_chat_task = None
+        self.is_restarting = False
+        self.restart_map = None
+        self.last_welcome_time = 0
+        self.random_chat_lines = []
+
+    def __repr__(self):
+        return f"ServerMonitor({self.name!r})"
+
+    async def start(self):
+        self.tracker = TrackerPoller(self.cog.session, interval=self.TRACKER_POLL_INTERVAL, max_age=self.TRACKER_MAX_AGE)
+        self.tracker.set_url(self.settings.tracker_url)
+        self.tracker.start()
+        self.rcon_scheduler.start()
+        self.events.start()
+        await self.load_random_chat_lines()
+        self.random_chat_task = self.bot.loop.create_task(self.random_chat_loop())
+        self.start_monitoring()
+        self.schedule_roster_refresh(0)
+
+    async def stop(self):
+        self.monitoring = False
+        await self.relay.stop()
+        await self.rcon_scheduler.stop()
+        await self.events.stop()
+        if self.tracker:
+            await self.tracker.stop()
+        for task in [self.monitor_task, self.random_chat_task, self.roster_task, self.map_resume_task]:
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+                except Exception as e:
+                    logger.error(f"[{self.name}] Error during task shutdown: {e}")
+        if self.rcon_client:
+            self.rcon_client.close()
+            self.rcon_client = None
+
+    async def restart(self):
+        """Restart the log monitor from the saved read position."""
+        if self.monitor_task and not self.monitor_task.done():
+            self.monitoring = False
+            self.monitor_task.cancel()
+            try:
+                await self.monitor_task
+            except asyncio.CancelledError:
+                logger.debug(f"[{self.name}] Monitoring task canceled successfully.")
+            except Exception as e:
+                logger.error(f"[{self.name}] Error canceling task: {e}")
+        await asyncio.sleep(0.5)
+        self.is_restarting = False
+        self.restart_map = None
+        self.start_monitoring()
+
+    async def update_setting(self, key, value):
+        """Write a profile setting to Config and to the in-memory snapshot."""
+        await self.cog.config.profiles.set_raw(self.name, key, value=value)
+        setattr(self.settings, key, value)
+
+    def validate_rcon_settings(self) -> bool:
+        return self.settings.rcon_configured
+
+    async def load_random_chat_lines(self):
+        path = self.settings.random_chat_path
+        self.random_chat_lines = []
+        if not path or not os.path.exists(path):
+            return
+        try:
+            async with aiofiles.open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                content = await f.read()
+            lines = [line.strip() for line in content.splitlines() if line.strip() and not line.strip().startswith('#')]
+            self.random_chat_lines = lines
+            logger.info(f"[{self.name}] Loaded {len(lines)} random chat lines from {path}")
+        except Exception as e:
+            logger.error(f"[{self.name}] Failed to load random chat lines: {e}")
+
+    async def random_chat_loop(self):
+        await self.bot.wait_until_ready()
+        while True:
+            try:
+                await asyncio.sleep(self.RANDOM_CHAT_INTERVAL)
+                if not self.validate_rcon_settings():
+                    continue
+                bot_name = self.settings.bot_name
+                if not bot_name or not self.random_chat_lines:
+                    continue
+                if random.random() > self.RANDOM_CHAT_CHANCE:
+                    continue
+                line = random.choice(self.random_chat_lines)
+                command = f"sayasbot {bot_name} {line}"
+                self.queue_rcon(command, PRIORITY_COSMETIC)
+            except Exception as e:
+                logger.error(f"[{self.name}] Error in random_chat_loop: {e}")
+                await asyncio.sleep(60)
+
+    # === RCON ===
+    def get_rcon_client(self) -> RconClient:
+        """Return the persistent RCON client, reopening it if the settings changed."""
+        host, port, password = self.settings.rcon_host, self.settings.rcon_port, self.settings.rcon_password
+        if self.rcon_client is None or not self.rcon_client.matches(host, port, password):
+            if self.rcon_client:
+                self.rcon_client.close()
+            self.rcon_client = RconClient(host, port, password)
+        return self.rcon_client
+
+    async def send_rcon_command(self, command, expect_response=True):
+        """Send an RCON command. With expect_response=False the reply is not awaited."""
+        client = self.get_rcon_client()
+        if not expect_response:
+            await client.send(command)
+            return b""
+        return await client.request(command)
+
+    def queue_rcon(self, command, priority=PRIORITY_CHAT, expect_response=False) -> asyncio.Future:
+        """Queue an RCON command on the given priority lane of the scheduler."""
+        return self.rcon_scheduler.submit(command, priority, expect_response)
+
+    async def lookup_player_stats(self, names) -> dict:
+        """Map each account name to its parsed ``accountinfo`` stats, or None if not found.
+
+        Cached results are reused. The rest are requested back to back on the
+        lookup lane while one reply window collects every answer. If some
+        replies can't be told apart by name, the names left over are looked
+        up again one at a time.
+        """
+        results = {name: self.stats_cache.get(name) for name in names}
+        missing = [name for name, stats in results.items() if stats is None]
+        if len(missing) == 1:
+            fetched = {missing[0]: await self._lookup_one(missing[0])}
+        elif missing:
+            async with self.get_rcon_client().collecting() as packets:
+                await asyncio.gather(*(
+                    self.queue_rcon(f"accountinfo {name}", PRIORITY_LOOKUP) for name in missing
+                ))
+            fetched, unidentified = match_replies(missing, packets)
+            if unidentified:
+                for name in [name for name, stats in fetched.items() if stats is None]:
+                    fetched[name] = await self._lookup_one(name)
+        else:
+            fetched = {}
+        for name, stats in fetched.items():
+            if stats is not None:
+                self.stats_cache.store(name, stats)
+            results[name] = stats
+        return results
+
+    async def _lookup_one(self, name):
+        response = await self.rcon_scheduler.run(f"accountinfo {name}", PRIORITY_LOOKUP)
+        stats = parse_accountinfo(response.decode('cp1252', errors='replace'))
+        return stats if "Id" in stats else None
+
+    def schedule_roster_refresh(self, delay):
+        """Rebuild the roster from rcon status after ``delay`` seconds, replacing any pending rebuild."""
+        if self.roster_task and not self.roster_task.done():
+            self.roster_task.cancel()
+        self.roster_task = self.bot.loop.create_task(self.refresh_roster(delay))
+
+    async def refresh_roster(self, delay=0):
+        if delay:
+            await asyncio.sleep(delay)
+        if not self.validate_rcon_settings():
+            return
+        try:
+            response = await self.rcon_scheduler.run("status")
+        except Exception as e:
+            logger.debug(f"[{self.name}] Roster refresh failed: {e}")
+            return
+        players = parse_status(response.decode('latin-1'))
+        # An empty or garbled reply is far more likely than an empty server mid-game.
+        if players or b"map:" in response:
+            self.roster.rebuild(players)
+            logger.debug(f"[{self.name}] Roster rebuilt from status: {len(players)} players")
+
+    async def send_welcome_message(self, message: str):
+        await asyncio.sleep(5)
+        self.queue_rcon(message, PRIORITY_COSMETIC)
+
+    # === LOG MONITOR ===
+    def start_monitoring(self):
+        if self.monitor_task and not self.monitor_task.done():
+            logger.debug(f"[{self.name}] Monitor task already running.")
+            return
+        logger.info(f"[{self.name}] Starting log monitor task.")
+        self.monitor_task = self.bot.loop.create_task(self.monitor_log())
+
+    async def monitor_log(self):
+        self.monitoring = True
+        try:
+            await self._monitor_log()
+        finally:
+            await self.save_log_position(force=True)
+            self.tailer = None
+
+    async def load_log_position(self) -> dict:
+        return await self.cog.config.profiles.get_raw(self.name, "log_position", default={})
+
+    async def save_log_position(self, force=False):
+        """Persist the tailer's read offset, at most once every LOG_POSITION_SAVE_INTERVAL seconds."""
+        if not self.tailer or self.tailer.inode is None:
+            return
+        now = time.monotonic()
+        if not force and now - self.last_position_save < self.LOG_POSITION_SAVE_INTERVAL:
+            return
+        self.last_position_save = now
+        await self.cog.config.profiles.set_raw(self.name, "log_position", value=self.tailer.position)
+
+    async def _monitor_log(self):
+        while self.monitoring:
+            try:
+                channel_id = self.settings.discord_channel_id
+                if not all([self.settings.log_base_path, channel_id]):
+                    logger.warning(f"[{self.name}] Missing configuration, pausing monitor.")
+                    await asyncio.sleep(5)
+                    continue
+                log_file = os.path.join(self.settings.log_base_path, "qconsole.log")
+
+                channel = self.bot.get_channel(channel_id)
+                if not channel:
+                    logger.warning(f"[{self.name}] Channel not found: {channel_id}")
+                    await asyncio.sleep(5)
+                    continue
+
+                if not os.path.exists(log_file):
+                    logger.error(f"[{self.name}] Log file not found: {log_file}")
+                    await asyncio.sleep(5)
+                    continue
+
+                self.channel = channel
+                if self.settings.parser_worker:
+                    await self._run_worker(log_file)
+                    continue
+                async with LogTailer(log_file, await self.load_log_position()) as tailer:
+                    self.tailer = tailer
+                    while self.monitoring:
+                        if tailer.backlog > self.CATCHUP_THRESHOLD:
+                            await self._catch_up(tailer)
+                        lines = await tailer.read_lines()
+                        self.last_line_time = time.monotonic()
+                        for line in lines:
+                            event = self.classifier.classify(line.strip())
+                            if event is not None:
+                                self.events.publish(event)
+                        await self.save_log_position()
+
+            except Exception as e:
+                logger.error(f"[{self.name}] Error in monitor_log: {e}")
+                await asyncio.sleep(5)
+
+    async def _run_worker(self, log_file):
+        """Read events from a worker process until it exits, then back off before the next start."""
+        worker = ParserWorker(
+            log_file, await self.load_log_position(),
+            catchup_threshold=self.CATCHUP_THRESHOLD, catchup_chunk_size=self.CATCHUP_CHUNK_SIZE
+        )
+        started = time.monotonic()
+        summary = None
+        try:
+            await worker.start()
+            self.tailer = worker
+            async for events, record in worker.batches():
+                if record["lines"]:
+                    self.last_line_time = time.monotonic()
+                if record["catchup"]:
+                    if summary is None:
+                        logger.info(f"[{self.name}] Catching up on {record['backlog']} unread bytes of the log")
+                        summary = CatchUpSummary(self.CATCHUP_CHAT_LINES)
+                    summary.lines += record["lines"]
+                    for event in events:
+                        self.events.apply(event)
+                        summary.add(event)
+                else:
+                    if summary is not None:
+                        self._finish_catch_up(summary)
+                        summary = None
+                    for event in events:
+                        self.events.publish(event)
+                await self.save_log_position()
+        except WorkerExited as e:
+            if time.monotonic() - started > self.WORKER_HEALTHY_AFTER:
+                self.worker_failures = 0
+            self.worker_failures += 1
+            delay = min(self.WORKER_MAX_BACKOFF, 2 ** self.worker_failures)
+            logger.error(f"[{self.name}] {e}. Restarting in {delay}s.")
+            await asyncio.sleep(delay)
+        finally:
+            await worker.stop()
+            # The next worker starts from the saved position, so make it exact.
+            await self.save_log_position(force=True)
+
+    async def _catch_up(self, tailer):
+        """Read a large backlog in bulk, updating state without reacting, then post a summary."""
+        logger.info(f"[{self.name}] Catching up on {tailer.backlog} unread bytes of the log")
+        summary = CatchUpSummary(self.CATCHUP_CHAT_LINES)
+        while self.monitoring and tailer.backlog > tailer.chunk_size:
+            lines = await tailer.read_lines(self.CATCHUP_CHUNK_SIZE)
+            self.last_line_time = time.monotonic()
+            summary.lines += len(lines)
+            for line in lines:
+                event = self.classifier.classify(line.strip())
+                if event is None:
+                    continue
+                # Keep the roster right, but don't announce joins, duels or restarts that are long over.
+                self.events.apply(event)
+                summary.add(event)
+            await self.save_log_position()
+        self._finish_catch_up(summary)
+
+    def _finish_catch_up(self, summary):
+        # Players who are still here get their VPN check; the rest left already.
+        for slot, event in summary.ip_events.items():
+            player = self.roster.get(slot)
+            if player is not None and player.ip == event.data["ip"]:
+                self.events.publish(event)
+        self.schedule_roster_refresh(0)
+
+        logger.info(f"[{self.name}] Caught up on {summary.lines} lines in {time.monotonic() - summary.started:.1f}s")
+        counts = summary.counts
+        parts = [
+            f"{counts[kind]:,} {label}" for kind, label in (
+                (EVENT_CHAT, "chat messages"), (EVENT_JOIN, "joins"), (EVENT_DISCONNECT, "disconnects"),
+                (EVENT_DUEL, "duels"), (EVENT_MAP_LOADED, "map loads"),
+            ) if counts[kind]
+        ]
+        message = f"⏩ **Caught up** on {summary.lines:,} log lines the bridge missed"
+        message += f": {', '.join(parts)}." if parts else "."
+        if summary.last_map:
+            message += f" Current map: `{summary.last_map}`."
+        if summary.recent_chat:
+            message += "\nLatest chat:\n" + "\n".join(
+                f"> **{event.data['name']}**: {self.cog.replace_text_emotes_with_emojis(event.data['message'])}"
+                for event in summary.recent_chat
+            )
+        self.cog.outbox.send(self.channel, message)
+
+    # === LOG EVENT HANDLERS ===
+    def _register_log_handlers(self):
+        # Archiving and roster bookkeeping happen as lines are read; everything
+        # that talks to Discord or the game server runs on its own consumer queue.
+        for kind in (EVENT_CHAT, EVENT_JOIN, EVENT_DISCONNECT, EVENT_DUEL):
+            self.events.observe(kind, self._archive_event)
+        self.events.observe(EVENT_USERINFO, self._track_userinfo)
+        self.events.observe(EVENT_PLAYER_IP, self._track_player_ip)
+        self.events.observe(EVENT_JOIN, self._track_join)
+        self.events.observe(EVENT_DISCONNECT, self._track_disconnect)
+        self.events.register(EVENT_CHAT, self._on_chat, "discord")
+        self.events.register(EVENT_SHUTDOWN, self._on_restart, "discord")
+        self.events.register(EVENT_INIT, self._on_restart, "discord")
+        self.events.register(EVENT_MAP_LOADED, self._on_map_loaded, "discord")
+        self.events.register(EVENT_JOIN, self._on_join, "discord")
+        self.events.register(EVENT_DISCONNECT, self._on_disconnect, "discord")
+        self.events.register(EVENT_DUEL, self._on_duel, "rcon")
+        self.events.register(EVENT_PLAYER_IP, self._on_player_ip, "rcon")
+
+    def _archive_event(self, event):
+        archive = self.cog.archive
+        if archive is None:
+            return
+        data = event.data
+        if event.kind == EVENT_CHAT:
+            archive.add(event.kind, data["name"], data["message"], server=self.name)
+        elif event.kind == EVENT_DUEL:
+            winner = remove_color_codes(data["winner"])
+            archive.add(event.kind, winner, f"{winner} won a duel against {remove_color_codes(data['loser'])}",
+                        server=self.name)
+        else:
+            player = self.roster.get(data["slot"]) if "slot" in data else self.roster.find(data["name"])
+            archive.add(event.kind, data["clean_name"], ip=player.ip if player else None,
+                        slot=player.slot if player else None, server=self.name)
+
+    def _track_userinfo(self, event):
+        is_bot = event.data["is_bot"] or event.data["clean_name"].endswith("-Bot")
+        self.roster.update(event.data["slot"], name=event.data["name"], is_bot=is_bot)
+
+    def _track_player_ip(self, event):
+        self.roster.update(event.data["slot"], name=event.data["name"], ip=event.data["ip"])
+
+    def _track_join(self, event):
+        self.roster.activate(event.data["name"])
+
+    def _track_disconnect(self, event):
+        self.roster.remove(event.data["slot"])
+
+    async def _on_player_ip(self, event):
+        settings, vpn_checker = self.cog.settings, self.cog.vpn_checker
+        if not settings.vpn_check_enabled or not settings.vpn_api_key or not vpn_checker:
+            return
+        player_id, ip = event.data["slot"], event.data["ip"]
+        verdict = vpn_checker.cached(ip)
+        if verdict is not None:
+            logger.debug(f"[{self.name}] VPN check cached for Player ID {player_id} | IP {ip}: {verdict}")
+            if verdict:
+                self._report_vpn(player_id, ip)
+            return
+        logger.info(f"[{self.name}] VPN check triggered for Player ID {player_id} | IP {ip}")
+        self.bot.loop.create_task(self._handle_vpn_check(player_id, ip))
+
+    async def _on_chat(self, event):
+        message = self.cog.replace_text_emotes_with_emojis(event.data["message"])
+        self.cog.outbox.send(self.channel, f"**{event.data['name']}**: {message}")
+
+    async def _on_duel(self, event):
+        if self.validate_rcon_settings():
+            bot_name = self.settings.bot_name
+            if bot_name:
+                winner, loser = event.data["winner"], event.data["loser"]
+                msg = f"sayasbot {bot_name} {winner} ^7has defeated {loser} ^7in a duel^5! :trophy:"
+                self.queue_rcon(msg, PRIORITY_COSMETIC)
+
+    async def _on_restart(self, event):
+        if self.is_restarting:
+            return
+        self.is_restarting = True
+        self.cog.outbox.send(self.channel, "⚠️ **Standby**: Server integration suspended while map changes or server restarts.")
+        self.bot.loop.create_task(self.reset_restart_flag(self.channel))
+
+    async def _on_map_loaded(self, event):
+        if not self.is_restarting:
+            return
+        self.restart_map = event.data["map"]
+        self.schedule_roster_refresh(self.ROSTER_REFRESH_DELAY)
+        if self.map_resume_task and not self.map_resume_task.done():
+            self.map_resume_task.cancel()
+        self.map_resume_task = self.bot.loop.create_task(self._announce_map_resumed())
+
+    async def _announce_map_resumed(self):
+        await asyncio.sleep(self.MAP_RESUME_DELAY)
+        if self.restart_map:
+            self.cog.outbox.send(self.channel, f"✅ **Server Integration Resumed**: Map {self.restart_map} loaded.")
+        self.is_restarting = False
+        self.restart_map = None
+
+    async def _on_join(self, event):
+        join_name, join_name_clean = event.data["name"], event.data["clean_name"]
+        if join_name_clean.endswith("-Bot") or self.is_restarting:
+            return
+        if not self.settings.join_disconnect_enabled:
+            return
+        self.cog.outbox.send(self.channel, f"<:jk_connect:1349009924306374756> **{join_name_clean}** has joined the game!")
+        # Schedule welcome message with cooldown
+        bot_name = self.settings.bot_name
+        if bot_name and self.validate_rcon_settings():
+            current_time = time.time()
+            if current_time - self.last_welcome_time >= 5:  # 5-second cooldown
+                self.last_welcome_time = current_time
+                welcome_message = f"sayasbot {bot_name} ^7Hey {join_name}^7, welcome to the server^5! :wave:"
+                self.bot.loop.create_task(self.send_welcome_message(welcome_message))
+            else:
+                logger.debug(f"[{self.name}] Skipped welcome message for {join_name_clean} due to cooldown")
+
+    async def _on_disconnect(self, event):
+        name_clean = event.data["clean_name"]
+        if self.is_restarting or name_clean.endswith("-Bot") or not name_clean.strip():
+            return
+        if self.settings.join_disconnect_enabled:
+            self.cog.outbox.send(self.channel, f"<:jk_disconnect:1349010016044187713> **{name_clean}** has disconnected.")
+
+    async def reset_restart_flag(self, channel):
+        await asyncio.sleep(30)
+        if self.is_restarting:
+            self.is_restarting = False
+            self.restart_map = None
+            self.cog.outbox.send(channel, "Server Integration Resumed: Restart timed out, resuming normal operation.")
+
+    async def _handle_vpn_check(self, player_id: int, ip: str):
+        try:
+            if await self.cog.vpn_checker.is_vpn(ip, self.cog.settings.vpn_api_key):
+                self._report_vpn(player_id, ip)
+        except Exception as e:
+            logger.debug(f"[{self.name}] VPN check failed for {ip}: {e}")
+
+    def _report_vpn(self, player_id: int, ip: str):
+        player = self.roster.get(player_id)
+        if player is not None and player.ip and player.ip != ip:
+            # The lookup outlived the player; someone else has the slot now.
+            logger.debug(f"[{self.name}] Skipping VPN report for slot {player_id}: IP changed")
+            return
+        auto_kick = self.cog.settings.vpn_auto_kick
+        name = f"^7Player: {player.name} ^3| " if player else ""
+        msg = f"say_admins VPN Detected ^3(^7IP: {ip} ^3| {name}^7Player Slot: {player_id}^3) :eyes:"
+        self.queue_rcon(msg, PRIORITY_ADMIN)
+        if self.cog.archive is not None:
+            self.cog.archive.add("vpn", player.clean_name if player else None,
+                                 "VPN detected" + (", kicked" if auto_kick else ""),
+                                 ip=ip, slot=player_id, server=self.name)
+        # Auto-kick if enabled
+        if auto_kick:
+            kick_cmd = f"kick {player_id}"
+            self.queue_rcon(kick_cmd, PRIORITY_ADMIN)
@@ -0,0 +1,56 @@
+from dataclasses import asdict, dataclass, field, fields
+from typing import Optional
+
+
+@dataclass
+class BridgeSettings:
+    """In-memory copy of the cog's global Config.
+
+    Loaded once in ``cog_load`` and kept in sync by the setting commands, so
+    the per-line and per-message paths read plain attributes instead of
+    awaiting Config. Settings for each game server live in ``ProfileSettings``.
+    """
+
+    custom_emoji: Optional[str] = None
+    vpn_api_key: Optional[str] = None
+    vpn_check_enabled: bool = False
+    vpn_auto_kick: bool = False
+    archive_retention_days: int = 90
+    emotes: dict = field(default_factory=dict)
+    emotes_customized: bool = False  # until an emote is added or removed, the built-in table is used
+    selected_profile: str = "default"
+
+    @classmethod
+    async def load(cls, config) -> "BridgeSettings":
+        data = await config.all()
+        return cls(**{f.name: data[f.name] for f in fields(cls) if f.name in data})
+
+
+@dataclass
+class ProfileSettings:
+    """Settings for one game server, stored under ``profiles`` in Config."""
+
+    log_base_path: Optional[str] = None
+    discord_channel_id: Optional[int] = None
+    rcon_host: Optional[str] = None
+    rcon_port: Optional[int] = None
+    rcon_password: Optional[str] = None
+    tracker_url: Optional[str] = None
+    bot_name: Optional[str] = None
+    random_chat_path: Optional[str] = None
+    join_disconnect_enabled: bool = True
+    parser_worker: bool = False
+
+    @classmethod
+    def from_dict(cls, data) -> "ProfileSettings":
+        return cls(**{f.name: data[f.name] for f in fields(cls) if f.name in data})
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @property
+    def rcon_configured(self) -> bool:
+        return all([self.rcon_host, self.rcon_port, self.rcon_password])
+
+
+PROFILE_FIELDS = tuple(f.name for f in fields(ProfileSettings))
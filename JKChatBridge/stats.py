@@ -0,0 +1,89 @@
+import time
+from collections import OrderedDict
+
+from .classifier import remove_color_codes
+
+LEADERBOARD_FIELDS = {
+    "duels": "Duels won",
+    "kills": "Kills",
+    "credits": "Credits",
+}
+
+
+def parse_accountinfo(text):
+    """Parse an ``accountinfo`` reply into a dict of color-stripped fields."""
+    stats = {}
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith('\xff'):
+            continue
+        if ":" in line:
+            k, v = map(str.strip, line.split(":", 1))
+            stats[remove_color_codes(k)] = remove_color_codes(v)
+    return stats
+
+
+def stat_value(stats, field):
+    """Numeric value of a stats field, 0 if missing or not a number."""
+    try:
+        return int(stats.get(field, "0").replace(",", ""))
+    except ValueError:
+        return 0
+
+
+def match_replies(names, packets):
+    """Pair ``accountinfo`` reply packets with the account names they answer.
+
+    A reply is only taken for a name that equals its Name or Username field.
+    Returns the results, with None for names no reply matched, and the number
+    of replies that matched no name; those can't be attributed safely, so the
+    caller has to look the unmatched names up one at a time.
+    """
+    replies = []
+    for packet in packets:
+        stats = parse_accountinfo(packet.decode('cp1252', errors='replace'))
+        if "Id" in stats:
+            replies.append(stats)
+    results = dict.fromkeys(names)
+    unidentified = 0
+    wanted = {name.lower(): name for name in names}
+    for stats in replies:
+        name = wanted.pop(stats.get("Name", "").lower(), None)
+        if name is None:
+            name = wanted.pop(stats.get("Username", "").lower(), None)
+        if name is None:
+            unidentified += 1
+        else:
+            results[name] = stats
+    return results, unidentified
+
+
+class PlayerStatsCache:
+    """Parsed ``accountinfo`` results, kept for ``ttl`` seconds per account."""
+
+    def __init__(self, ttl=300, max_entries=1000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # lowercased name -> (stats, fetched_at)
+
+    def get(self, name):
+        key = name.lower()
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stats, fetched_at = entry
+        if time.monotonic() - fetched_at > self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return stats
+
+    def store(self, name, stats):
+        key = name.lower()
+        self._entries[key] = (stats, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
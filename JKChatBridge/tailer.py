@@ -0,0 +1,186 @@
+import asyncio
+import ctypes
+import ctypes.util
+import logging
+import os
+import struct
+
+import aiofiles
+
+logger = logging.getLogger("JKChatBridge.tailer")
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+_WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class _Inotify:
+    """Minimal inotify watch on a directory, filtered to one file name."""
+
+    def __init__(self, directory, filename):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), _WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory}")
+        self.filename = os.fsencode(filename)
+
+    def drain(self) -> bool:
+        """Consume pending events; True if any of them concern the watched file."""
+        relevant = False
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                return relevant
+            pos = 0
+            while pos + _EVENT_HEADER.size <= len(data):
+                _, _, _, length = _EVENT_HEADER.unpack_from(data, pos)
+                name = data[pos + _EVENT_HEADER.size:pos + _EVENT_HEADER.size + length].rstrip(b"\0")
+                if name == self.filename:
+                    relevant = True
+                pos += _EVENT_HEADER.size + length
+
+    def close(self):
+        os.close(self.fd)
+
+
+class LogTailer:
+    """Follows a growing log file, surviving truncation and rotation.
+
+    Wakes on inotify events when available and falls back to polling
+    otherwise. Even with inotify it checks the file every
+    ``inotify_poll_interval`` seconds, since writes from another host on a
+    network or bind-mounted filesystem raise no events. ``position`` (inode
+    and byte offset of the last complete line) can be persisted and passed
+    back in to resume exactly where reading stopped. Without a saved
+    position reading starts at the end of the file.
+    """
+
+    def __init__(self, path, position=None, *, poll_interval=0.5, inotify_poll_interval=5.0, chunk_size=65536):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.inotify_poll_interval = inotify_poll_interval
+        self.chunk_size = chunk_size
+        self.inode = None
+        self.offset = 0
+        self._saved = position or {}
+        self._file = None
+        self._partial = b""
+        self._inotify = None
+        self._changed = asyncio.Event()
+
+    @property
+    def position(self) -> dict:
+        return {"inode": self.inode, "offset": self.offset}
+
+    @property
+    def backlog(self) -> int:
+        """Bytes written to the file that haven't been returned as lines yet."""
+        try:
+            return max(0, os.stat(self.path).st_size - self.offset)
+        except OSError:
+            return 0
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def open(self):
+        st = os.stat(self.path)
+        if self._saved.get("inode") == st.st_ino and 0 <= self._saved.get("offset", -1) <= st.st_size:
+            start = self._saved["offset"]
+            logger.info(f"Resuming {self.path} at byte {start} of {st.st_size}")
+        elif self._saved.get("inode") is not None:
+            # The file was replaced while we were stopped: everything in it is new.
+            start = 0
+            logger.info(f"{self.path} was rotated since the last run, reading from the start")
+        else:
+            start = st.st_size
+        await self._reopen(st.st_ino, start)
+        try:
+            self._inotify = _Inotify(os.path.dirname(os.path.abspath(self.path)), os.path.basename(self.path))
+            asyncio.get_running_loop().add_reader(self._inotify.fd, self._on_inotify)
+        except (OSError, AttributeError) as e:
+            logger.info(f"inotify unavailable ({e}), polling {self.path} every {self.poll_interval}s")
+            self._inotify = None
+
+    async def close(self):
+        if self._inotify is not None:
+            asyncio.get_running_loop().remove_reader(self._inotify.fd)
+            self._inotify.close()
+            self._inotify = None
+        if self._file is not None:
+            await self._file.close()
+            self._file = None
+
+    async def _reopen(self, inode, offset):
+        if self._file is not None:
+            await self._file.close()
+        self._file = await aiofiles.open(self.path, mode="rb")
+        await self._file.seek(offset)
+        self.inode = inode
+        self.offset = offset
+        self._partial = b""
+
+    def _on_inotify(self):
+        if self._inotify.drain():
+            self._changed.set()
+
+    async def _wait_for_change(self):
+        if self._inotify is None:
+            await asyncio.sleep(self.poll_interval)
+            return
+        try:
+            await asyncio.wait_for(self._changed.wait(), self.inotify_poll_interval)
+        except asyncio.TimeoutError:
+            pass
+        self._changed.clear()
+
+    async def _check_rotation(self) -> bool:
+        """Reopen the file if it was replaced or truncated. True if reading should restart."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        if st.st_ino != self.inode:
+            logger.info(f"{self.path} was rotated, following the new file")
+            await self._reopen(st.st_ino, 0)
+            return True
+        if st.st_size < self.offset:
+            logger.info(f"{self.path} was truncated, reading from the start")
+            await self._reopen(st.st_ino, 0)
+            return True
+        return False
+
+    async def read_lines(self, chunk_size=None) -> list:
+        """Wait for and return the next batch of complete lines, decoded as Latin-1."""
+        while True:
+            chunk = await self._file.read(chunk_size or self.chunk_size)
+            if chunk:
+                data = self._partial + chunk
+                end = data.rfind(b"\n")
+                if end == -1:
+                    self._partial = data
+                    continue
+                self._partial = data[end + 1:]
+                self.offset += end + 1
+                return data[:end].decode("latin-1").splitlines()
+            if await self._check_rotation():
+                continue
+            await self._wait_for_change()
@@ -0,0 +1,111 @@
+import asyncio
+import logging
+import time
+
+import aiohttp
+
+logger = logging.getLogger("JKChatBridge.tracker")
+
+
+class TrackerError(Exception):
+    """Raised when the tracker can't be fetched or doesn't return JSON."""
+
+
+class TrackerPoller:
+    """Keeps a parsed snapshot of the server tracker's JSON fresh in the background.
+
+    Refreshes use ETag/Last-Modified conditional requests when the tracker
+    provides them, so an unchanged status costs a 304. ``get`` serves the
+    snapshot while it is younger than ``max_age`` and otherwise fetches live;
+    concurrent callers share that one fetch.
+    """
+
+    def __init__(self, session, *, interval=30, max_age=90):
+        self.session = session
+        self.interval = interval
+        self.max_age = max_age
+        self.url = None
+        self.data = None
+        self.fetched_at = None
+        self.last_error = None
+        self._etag = None
+        self._last_modified = None
+        self._refresh_lock = asyncio.Lock()
+        self._task = None
+
+    @property
+    def age(self):
+        """Seconds since the snapshot was last confirmed current, or None without one."""
+        return None if self.fetched_at is None else time.monotonic() - self.fetched_at
+
+    def set_url(self, url):
+        if url == self.url:
+            return
+        self.url = url
+        self.data = self.fetched_at = self._etag = self._last_modified = None
+
+    async def refresh(self):
+        if not self.url:
+            raise TrackerError("Tracker URL not set.")
+        url = self.url
+        headers = {}
+        if self._etag:
+            headers["If-None-Match"] = self._etag
+        if self._last_modified:
+            headers["If-Modified-Since"] = self._last_modified
+        try:
+            async with self.session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=10)) as resp:
+                if resp.status == 304 and self.data is not None:
+                    self.fetched_at = time.monotonic()
+                    return self.data
+                if resp.status != 200:
+                    raise TrackerError(f"HTTP {resp.status}")
+                if 'application/json' not in resp.headers.get('Content-Type', ''):
+                    raise TrackerError("Expected JSON.")
+                data = await resp.json()
+                etag, last_modified = resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            # ValueError: malformed JSON served as application/json
+            raise TrackerError(str(e) or e.__class__.__name__) from e
+        if url != self.url:
+            # The URL changed while we were fetching; don't keep the old server's data.
+            return data
+        self.data = data
+        self.fetched_at = time.monotonic()
+        self._etag, self._last_modified = etag, last_modified
+        return data
+
+    async def get(self, max_age=None):
+        """Return the tracker JSON, fetching it if the snapshot is older than ``max_age``."""
+        max_age = self.max_age if max_age is None else max_age
+        if self.data is not None and self.age <= max_age:
+            return self.data
+        async with self._refresh_lock:
+            # Another caller may have refreshed while we waited for the lock.
+            if self.data is not None and self.age <= max_age:
+                return self.data
+            return await self.refresh()
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self):
+        while True:
+            if self.url:
+                try:
+                    async with self._refresh_lock:
+                        await self.refresh()
+                    self.last_error = None
+                except TrackerError as e:
+                    self.last_error = str(e)
+                    logger.debug(f"Tracker refresh failed: {e}")
+            await asyncio.sleep(self.interval)
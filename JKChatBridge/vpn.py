@@ -0,0 +1,147 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+
+import aiofiles
+import aiohttp
+
+logger = logging.getLogger("JKChatBridge.vpn")
+
+VPNAPI_URL = "https://vpnapi.io/api/{ip}?key={key}"
+
+
+class VPNChecker:
+    """IP reputation lookups against vpnapi.io with an LRU/TTL cache.
+
+    Concurrent lookups for the same IP share one request, at most
+    ``max_concurrent`` requests run at once, and all of them reuse the
+    caller's ``aiohttp.ClientSession``. The cache is saved to ``cache_path``
+    every ``save_interval`` seconds while it has changes, and on ``stop``,
+    so regulars aren't looked up again after a reload.
+    """
+
+    def __init__(self, session, cache_path=None, *, ttl=12 * 3600, max_entries=5000, max_concurrent=4,
+                 save_interval=60):
+        self.session = session
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self.save_interval = save_interval
+        self.max_entries = max_entries
+        self._cache = OrderedDict()  # ip -> (is_vpn, checked_at)
+        self._in_flight = {}
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._dirty = False
+        self._save_lock = asyncio.Lock()
+        self._task = None
+        self.hits = 0
+        self.misses = 0
+
+    def cached(self, ip):
+        """Return the cached verdict for ``ip``, or None if unknown or expired."""
+        entry = self._cache.get(ip)
+        if entry is None:
+            return None
+        is_vpn, checked_at = entry
+        if time.time() - checked_at > self.ttl:
+            del self._cache[ip]
+            return None
+        self._cache.move_to_end(ip)
+        return is_vpn
+
+    def _store(self, ip, is_vpn):
+        self._cache[ip] = (is_vpn, time.time())
+        self._cache.move_to_end(ip)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        self._dirty = True
+
+    async def is_vpn(self, ip, api_key):
+        """True/False for a known verdict, None if the lookup failed."""
+        verdict = self.cached(ip)
+        if verdict is not None:
+            self.hits += 1
+            return verdict
+        task = self._in_flight.get(ip)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(self._lookup(ip, api_key))
+            self._in_flight[ip] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(ip, None))
+        return await asyncio.shield(task)
+
+    async def _lookup(self, ip, api_key):
+        async with self._semaphore:
+            try:
+                url = VPNAPI_URL.format(ip=ip, key=api_key)
+                async with self.session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as resp:
+                    if resp.status != 200:
+                        logger.debug(f"VPN lookup for {ip} failed: HTTP {resp.status}")
+                        return None
+                    data = await resp.json()
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                logger.debug(f"VPN lookup for {ip} failed: {e}")
+                return None
+        is_vpn = bool(data.get("security", {}).get("vpn", False))
+        self._store(ip, is_vpn)
+        return is_vpn
+
+    async def forget(self, ips):
+        """Drop the cached verdicts for ``ips``; returns how many there were."""
+        forgotten = 0
+        for ip in ips:
+            if self._cache.pop(ip, None) is not None:
+                forgotten += 1
+        if forgotten:
+            # Saved right away: the owner asked for these to be gone.
+            self._dirty = True
+            await self.save()
+        return forgotten
+
+    async def load(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            async with aiofiles.open(self.cache_path, "r") as f:
+                entries = json.loads(await f.read())
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to load VPN cache: {e}")
+            return
+        now = time.time()
+        for ip, (is_vpn, checked_at) in sorted(entries.items(), key=lambda item: item[1][1]):
+            if now - checked_at <= self.ttl:
+                self._cache[ip] = (is_vpn, checked_at)
+        logger.info(f"Loaded {len(self._cache)} cached VPN verdicts")
+
+    async def save(self):
+        if not self.cache_path or not self._dirty:
+            return
+        async with self._save_lock:
+            self._dirty = False
+            try:
+                async with aiofiles.open(self.cache_path, "w") as f:
+                    await f.write(json.dumps(dict(self._cache)))
+            except OSError as e:
+                self._dirty = True  # try again at the next save
+                logger.error(f"Failed to save VPN cache: {e}")
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop the periodic save and flush whatever it hasn't written yet."""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        await self.save()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.save_interval)
+            await self.save()
@@ -0,0 +1,141 @@
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+
+logger = logging.getLogger("JKChatBridge.watchdog")
+
+MAX_PARTIAL_LINE = 65536  # a backlog this small is checked for a complete line before it counts
+
+
+class _ReaderState:
+    def __init__(self):
+        self.offset = None
+        self.progress_at = time.monotonic()  # last time the reader advanced or had nothing to read
+        self.restarts = 0
+        self.last_restart = None
+        self.last_reason = None
+
+
+class Watchdog:
+    """Restarts a server's log reader only when it has actually stalled.
+
+    Every ``interval`` seconds it compares each reader's offset with the log
+    file's size. A reader that has unread bytes waiting but hasn't advanced
+    for ``stall_after`` seconds is restarted, as is a monitor task that has
+    died. A quiet log with nothing to read is healthy however long it stays
+    quiet, and so is one that stopped partway through a line, which the
+    reader can't return yet. The same tick measures how late the event
+    loop wakes up.
+    """
+
+    def __init__(self, servers, *, interval=10, stall_after=60, lag_samples=30):
+        self.servers = servers  # callable returning the current ServerMonitors
+        self.interval = interval
+        self.stall_after = stall_after
+        self.lags = deque(maxlen=lag_samples)
+        self._states = {}
+        self._task = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def forget(self, name):
+        self._states.pop(name, None)
+
+    @property
+    def loop_lag(self) -> dict:
+        """Latest, average and worst event-loop wake-up delay in seconds over the recent ticks."""
+        if not self.lags:
+            return {"last": 0.0, "avg": 0.0, "max": 0.0}
+        return {"last": self.lags[-1], "avg": sum(self.lags) / len(self.lags), "max": max(self.lags)}
+
+    def reader_health(self, server) -> dict:
+        """Liveness signals for one server's log reader."""
+        state = self._states.get(server.name) or _ReaderState()
+        tailer = server.tailer
+        size = backlog = None
+        if tailer is not None:
+            size, backlog = self._file_backlog(tailer)
+        now = time.monotonic()
+        return {
+            "running": server.monitor_task is not None and not server.monitor_task.done(),
+            "reading": tailer is not None,
+            "last_line_age": None if server.last_line_time is None else now - server.last_line_time,
+            "offset": tailer.offset if tailer is not None else None,
+            "size": size,
+            "backlog": backlog,
+            "stalled_for": now - state.progress_at if backlog else 0.0,
+            "restarts": state.restarts,
+            "last_reason": state.last_reason,
+        }
+
+    @staticmethod
+    def _file_backlog(tailer):
+        try:
+            st = os.stat(tailer.path)
+        except OSError:
+            return None, 0
+        if tailer.inode is None:
+            return st.st_size, 0  # a worker that hasn't reported its position yet
+        # A replaced file hasn't been followed yet: all of it is unread.
+        if st.st_ino != tailer.inode:
+            return st.st_size, st.st_size
+        backlog = max(0, st.st_size - tailer.offset)
+        if 0 < backlog <= MAX_PARTIAL_LINE:
+            # Without a newline it's the start of a line still being written.
+            try:
+                with open(tailer.path, "rb") as f:
+                    f.seek(tailer.offset)
+                    if b"\n" not in f.read(backlog):
+                        backlog = 0
+            except OSError:
+                pass
+        return st.st_size, backlog
+
+    async def _run(self):
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(0.0, time.monotonic() - started - self.interval))
+            for server in list(self.servers()):
+                try:
+                    await self.check(server)
+                except Exception as e:
+                    logger.error(f"[{server.name}] Watchdog check failed: {e}")
+
+    async def check(self, server):
+        state = self._states.setdefault(server.name, _ReaderState())
+        now = time.monotonic()
+        if server.monitor_task is None or server.monitor_task.done():
+            await self._restart(server, state, "monitor task was not running")
+            return
+        tailer = server.tailer
+        if tailer is None:
+            # Waiting for settings, the channel or the log file; the monitor retries on its own.
+            state.offset, state.progress_at = None, now
+            return
+        _, backlog = self._file_backlog(tailer)
+        if not backlog or tailer.offset != state.offset:
+            state.offset, state.progress_at = tailer.offset, now
+            return
+        if now - state.progress_at >= self.stall_after:
+            await self._restart(server, state, f"no progress for {now - state.progress_at:.0f}s with {backlog} bytes unread")
+
+    async def _restart(self, server, state, reason):
+        logger.warning(f"[{server.name}] Restarting log reader: {reason}")
+        state.restarts += 1
+        state.last_restart = time.time()
+        state.last_reason = reason
+        state.offset, state.progress_at = None, time.monotonic()
+        await server.restart()
@@ -0,0 +1,174 @@
+"""Out-of-process log reader for busy servers.
+
+The cog runs this file as a script (``python worker.py --log ...``) so the
+child process doesn't import Red or discord.py. The child tails and
+classifies ``qconsole.log`` and writes one JSON object per batch to stdout:
+the batch's events as ``[kind, data]`` pairs, the number of lines read, the
+read position after the batch, the unread backlog and whether the batch was
+read in catch-up mode. It exits when its stdin is closed.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+
+if __package__:
+    from .classifier import LogClassifier, LogEvent
+    from .tailer import LogTailer
+else:
+    from classifier import LogClassifier, LogEvent
+    from tailer import LogTailer
+
+logger = logging.getLogger("JKChatBridge.worker")
+
+WORKER_SCRIPT = os.path.abspath(__file__)
+STDERR_TAIL = 2000  # bytes of the child's stderr kept for error reports
+
+
+class WorkerExited(Exception):
+    """Raised when the worker process stops sending batches."""
+
+
+class ParserWorker:
+    """Parent-side handle on one worker process.
+
+    Exposes the same ``position``/``inode``/``offset``/``backlog`` as
+    ``LogTailer``, taken from the latest batch, so the cog can checkpoint
+    either one the same way.
+    """
+
+    def __init__(self, path, position=None, *, catchup_threshold, catchup_chunk_size):
+        self.path = path
+        self.start_position = position or {}
+        self.catchup_threshold = catchup_threshold
+        self.catchup_chunk_size = catchup_chunk_size
+        self.inode = None
+        self.offset = 0
+        self.backlog = 0
+        self.process = None
+        self._stderr_task = None
+        self._stderr_tail = b""
+
+    @property
+    def position(self) -> dict:
+        return {"inode": self.inode, "offset": self.offset}
+
+    async def start(self):
+        self.process = await asyncio.create_subprocess_exec(
+            sys.executable, WORKER_SCRIPT,
+            "--log", self.path,
+            "--position", json.dumps(self.start_position),
+            "--catchup-threshold", str(self.catchup_threshold),
+            "--catchup-chunk-size", str(self.catchup_chunk_size),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=16 * 1024 * 1024,
+        )
+        self._stderr_tail = b""
+        self._stderr_task = asyncio.get_running_loop().create_task(self._drain_stderr(self.process))
+        logger.info(f"Started log worker (pid {self.process.pid}) for {self.path}")
+
+    async def _drain_stderr(self, process):
+        """Log the child's stderr as it comes, so a chatty child never blocks on a full pipe."""
+        while True:
+            try:
+                line = await process.stderr.readline()
+            except ValueError:
+                continue  # a line longer than the stream limit; skip it
+            if not line:
+                return
+            self._stderr_tail = (self._stderr_tail + line)[-STDERR_TAIL:]
+            logger.warning(f"Log worker (pid {process.pid}): {line.decode(errors='replace').rstrip()}")
+
+    async def batches(self):
+        """Yield ``(events, record)`` per batch until the worker exits."""
+        while True:
+            line = await self.process.stdout.readline()
+            if not line:
+                break
+            record = json.loads(line)
+            self.inode, self.offset = record["position"]["inode"], record["position"]["offset"]
+            self.backlog = record["backlog"]
+            yield [LogEvent(kind, "", data) for kind, data in record["events"]], record
+        returncode = await self.process.wait()
+        await self._stderr_task
+        stderr = self._stderr_tail.decode(errors="replace").strip()
+        raise WorkerExited(f"Log worker exited with code {returncode}" + (f": {stderr}" if stderr else ""))
+
+    async def stop(self, timeout=3):
+        process = self.process
+        if process is None or process.returncode is not None:
+            return
+        # Closing stdin asks the worker to exit; escalate if it doesn't.
+        process.stdin.close()
+        try:
+            await asyncio.wait_for(process.wait(), timeout)
+        except asyncio.TimeoutError:
+            process.terminate()
+            try:
+                await asyncio.wait_for(process.wait(), timeout)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+        logger.info(f"Log worker (pid {process.pid}) stopped with code {process.returncode}")
+
+
+async def _tail(args, out):
+    classifier = LogClassifier()
+    async with LogTailer(args.log, json.loads(args.position) or None) as tailer:
+        catching_up = False
+        while True:
+            backlog = tailer.backlog
+            # Same hysteresis as the in-process reader: enter above the threshold,
+            # stay until less than one normal read is left.
+            catching_up = backlog > (tailer.chunk_size if catching_up else args.catchup_threshold)
+            lines = await tailer.read_lines(args.catchup_chunk_size if catching_up else None)
+            events = []
+            for line in lines:
+                event = classifier.classify(line.strip())
+                if event is not None:
+                    events.append([event.kind, event.data])
+            record = {
+                "events": events,
+                "lines": len(lines),
+                "position": tailer.position,
+                "backlog": tailer.backlog,
+                "catchup": catching_up,
+            }
+            out.write(json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n")
+            out.flush()
+
+
+async def _main(args):
+    loop = asyncio.get_running_loop()
+    stdin = asyncio.StreamReader()
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(stdin), sys.stdin)
+    tail = asyncio.ensure_future(_tail(args, sys.stdout.buffer))
+    parent_gone = asyncio.ensure_future(stdin.read())
+    done, _ = await asyncio.wait({tail, parent_gone}, return_when=asyncio.FIRST_COMPLETED)
+    for task in (tail, parent_gone):
+        task.cancel()
+    if tail in done and not tail.cancelled():
+        tail.result()  # re-raise whatever stopped the reader
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tail and classify a qconsole.log for JKChatBridge.")
+    parser.add_argument("--log", required=True)
+    parser.add_argument("--position", default="{}")
+    parser.add_argument("--catchup-threshold", type=int, default=512 * 1024)
+    parser.add_argument("--catchup-chunk-size", type=int, default=1024 * 1024)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, stream=sys.stderr, format="%(name)s: %(message)s")
+    try:
+        asyncio.run(_main(args))
+    except (BrokenPipeError, KeyboardInterrupt):
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,16 +4,34 @@ from redbot.core import commands, Config
 import aiohttp
 from aiohttp import web
 import asyncio
-from mcrcon import MCRcon
 import mcstatus
-import json
 import random
 import logging
+from .bridgetext import TellrawTemplate, mc_clean_name, pack_lines, strip_mc_formatting
+from .catalog import match_advancement, match_death
+from .ingest import read_batch, read_event
+from .routing import RESERVED_SERVER_IDS, SERVER_DEFAULTS, SERVER_ID_RE, RoutingTable
+from .sink import MAX_EMBEDS, plan_webhook_posts
 
 class MCChatBridge(commands.Cog):
+    # "(Discord) <author>: <message>", compiled once instead of JSON-encoded per message.
+    DISCORD_TELLRAW = TellrawTemplate([
+        {"text": "(", "color": "white"},
+        {"text": "Discord", "color": "aqua"},
+        {"text": ") ", "color": "white"},
+        {"text": "{author}", "color": "white"},
+        {"text": ": ", "color": "white"},
+        {"text": "{message}", "color": "white"}
+    ])
+    EVENT_QUEUE_SIZE = 2000  # per server: events accepted but not yet posted to Discord
+    CHANNEL_WEBHOOK_FLUSH = 0.5  # seconds a channel webhook batch waits to fill up
+    CHANNEL_WEBHOOK_NAME = "MCChatBridge"
+
     def __init__(self, bot):
         self.bot = bot
         self.config = Config.get_conf(self, identifier=1234567890, force_registration=True)
+        self.config.register_global(webhook_port=8080, servers={})
+        # Single-server settings from before servers were routed by ID; only read to migrate them
         default_guild = {
             "discord_channel_id": None,
             "rcon_host": "localhost",
@@ -21,38 +39,51 @@ class MCChatBridge(commands.Cog):
             "rcon_password": "",
             "webhook_port": 8080,
             "secret_token": "",
-            "server_ip": "localhost:25565"
+            "server_ip": "localhost:25565",
+            "channel_webhook_url": None
         }
         self.config.register_guild(**default_guild)
         self.webhook_app = web.Application()
+        # The server is named in the path, or found by its token on the unnamed paths
         self.webhook_app.router.add_post('/minecraft', self.handle_webhook)
+        self.webhook_app.router.add_post('/minecraft/batch', self.handle_webhook_batch)
+        self.webhook_app.router.add_post('/minecraft/{server_id}', self.handle_webhook)
+        self.webhook_app.router.add_post('/minecraft/{server_id}/batch', self.handle_webhook_batch)
         self.webhook_task = None
-        self.death_emojis = {
-            "fell from a high place": "🪂",
-            "by drowned": "🔱",
-            "drowned": "🌊",
-            "was slain by": "⚔️",
-            "burned to death": "🔥",
-            "was blown up by": "💥",
-            "hit the ground too hard": "🪂",
-            "was shot by": "🏹",
-            "was killed by": "💀"
-        }
         self.logger = logging.getLogger("red.MCChatBridge")
         self.logger.setLevel(logging.DEBUG)
-        try:
-            from mcrcon import MCRcon
-            self.logger.info("mcrcon imported successfully")
-        except ImportError as e:
-            self.logger.error(f"Failed to import mcrcon: {str(e)}")
-            raise
         self.session = aiohttp.ClientSession()
+        self.routes = RoutingTable(session=self.session, queue_size=self.EVENT_QUEUE_SIZE)
 
     async def cog_load(self):
+        await self._migrate_guild_settings()
+        await self.rebuild_routes()
         # Start webhook server in a background task after bot is ready
         self.webhook_task = self.bot.loop.create_task(self.start_webhook_task())
         self.logger.debug("Scheduled webhook server startup task")
 
+    async def _migrate_guild_settings(self):
+        """Turn each guild's single-server settings into a named server."""
+        all_guilds = await self.config.all_guilds()
+        if not all_guilds:
+            return
+        async with self.config.servers() as servers:
+            for guild_id, data in all_guilds.items():
+                server_id = "default" if "default" not in servers else f"default-{guild_id}"
+                servers[server_id] = {**{key: data[key] for key in SERVER_DEFAULTS if key in data}, "guild_id": guild_id}
+                if data.get("webhook_port", 8080) != 8080:
+                    await self.config.webhook_port.set(data["webhook_port"])
+                await self.config.guild_from_id(guild_id).clear()
+                self.logger.info(f"Moved the bridge settings of guild {guild_id} to server '{server_id}'")
+
+    async def rebuild_routes(self):
+        """Reload the routing table from Config; call after any server setting changes."""
+        added, removed = self.routes.rebuild(await self.config.servers())
+        for route in removed:
+            await route.stop()
+        for route in added:
+            route.worker_task = self.bot.loop.create_task(self.event_worker(route))
+
     async def cog_unload(self):
         if self.webhook_task:
             self.webhook_task.cancel()
@@ -60,6 +91,8 @@ class MCChatBridge(commands.Cog):
                 await self.webhook_task
             except asyncio.CancelledError:
                 self.logger.debug("Webhook startup task cancelled")
+        for route in self.routes.by_id.values():
+            await route.stop()
         await self.webhook_app.shutdown()
         await self.webhook_app.cleanup()
         await self.session.close()
@@ -74,12 +107,7 @@ class MCChatBridge(commands.Cog):
             raise
 
     async def start_webhook_server(self):
-        # Check if bot is in any guilds
-        if not self.bot.guilds:
-            self.logger.error("No guilds available. Ensure the bot is invited to at least one server.")
-            raise RuntimeError("Cannot start webhook server: Bot is not in any guilds.")
-        guild = self.bot.guilds[0]
-        port = await self.config.guild(guild).webhook_port()
+        port = await self.config.webhook_port()
         runner = web.AppRunner(self.webhook_app)
         await runner.setup()
         try:
@@ -92,50 +120,130 @@ class MCChatBridge(commands.Cog):
             self.logger.error(f"Port {port} is in use. Use [p]mcbridge setwebhookport <new_port> to change it (e.g., 8081).")
             raise
 
-    async def handle_webhook(self, request):
-        guild = self.bot.guilds[0]
-        secret_token = await self.config.guild(guild).secret_token()
-        if request.headers.get('Authorization') != secret_token:
+    def route_for(self, request):
+        """The server a request is from, by the ID in its path or else its token; None if unauthorized."""
+        server_id = request.match_info.get("server_id")
+        token = request.headers.get('Authorization')
+        route = self.routes.by_id.get(server_id) if server_id else self.routes.by_token.get(token)
+        if route is None or token != route.secret_token:
             self.logger.info(f"Unauthorized webhook request from {request.remote}")
+            return None
+        return route
+
+    def queue_events(self, route, events):
+        """Queue validated events for the server's worker; 503 if they don't all fit, so none are posted twice on retry."""
+        if route.queue.maxsize - route.queue.qsize() < len(events):
+            self.logger.warning(f"Event queue for {route.server_id} full; refusing {len(events)} events from the plugin")
+            raise web.HTTPServiceUnavailable(text="Event queue full", headers={"Retry-After": "5"})
+        for event in events:
+            route.queue.put_nowait(event)
+
+    async def handle_webhook(self, request):
+        route = self.route_for(request)
+        if route is None:
             return web.Response(status=401, text="Unauthorized")
-        
-        data = await request.json()
-        event = data.get('event')
-        content = data.get('data')
-        channel_id = await self.config.guild(guild).discord_channel_id()
-        channel = self.bot.get_channel(channel_id)
-        if not channel:
-            return web.Response(status=400, text="Channel not found")
+        self.queue_events(route, [await read_event(request)])
+        return web.Response(status=202)
 
+    async def handle_webhook_batch(self, request):
+        """Several events in one request, as a JSON array or NDJSON."""
+        route = self.route_for(request)
+        if route is None:
+            return web.Response(status=401, text="Unauthorized")
+        events = await read_batch(request)
+        self.queue_events(route, events)
+        return web.json_response({"accepted": len(events)}, status=202)
+
+    def format_event(self, event, content):
+        """The Discord line for a plugin event, or None if it isn't relayed."""
         if event == "chat":
             try:
                 player_name, message = content.split(": ", 1)
-                await channel.send(f"**{player_name}**: {message}")
+                return f"**{player_name}**: {message}"
             except ValueError:
-                await channel.send(f"**{content}**")
+                return f"**{content}**"
         elif event == "connect":
             player_name = content.split(" joined the server")[0]
-            await channel.send(f"<:jk_connect:1349009924306374756> **{player_name}** has joined the game!")
+            return f"<:jk_connect:1349009924306374756> **{player_name}** has joined the game!"
         elif event == "disconnect":
             player_name = content.split(" left the server")[0]
-            await channel.send(f"<:jk_disconnect:1349010016044187713> **{player_name}** has disconnected.")
+            return f"<:jk_disconnect:1349010016044187713> **{player_name}** has disconnected."
         elif event == "death":
-            emoji = next((e for k, e in self.death_emojis.items() if k in content.lower()), "💀")
-            await channel.send(f"{emoji} **{content}**")
+            return f"{match_death(content).emoji} **{content}**"
         elif event == "advancement":
-            unwanted_advancements = ["recipe", "edit", "remove", "convert", "interacted_with_dirt_golem", "sleep_bed"]
-            if not any(unwanted in content.lower() for unwanted in unwanted_advancements):
-                await channel.send(f"🏆 **{content}**")
-        else:
-            return web.Response(status=400, text="Unknown event")
+            advancement = match_advancement(content)
+            if advancement:
+                return f"{advancement.emoji} **{advancement.text}**"
+        return None
 
-        return web.Response(status=200)
+    async def event_worker(self, route):
+        """Post a server's queued events to Discord, merging whatever queued up during the last send.
 
-    async def send_to_minecraft(self, message, author_name):
-        guild = self.bot.guilds[0]
-        host = await self.config.guild(guild).rcon_host()
-        port = await self.config.guild(guild).rcon_port()
-        password = await self.config.guild(guild).rcon_password()
+        Through a channel webhook, a batch is held for up to
+        ``CHANNEL_WEBHOOK_FLUSH`` seconds or until it fills a request.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await route.queue.get()]
+            if route.channel_webhook:
+                deadline = loop.time() + self.CHANNEL_WEBHOOK_FLUSH
+                while len(batch) < MAX_EMBEDS:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(route.queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+            while not route.queue.empty():
+                batch.append(route.queue.get_nowait())
+            try:
+                await self.post_events(route, batch)
+            except Exception:
+                # Keep the worker alive, or the queue fills and every POST gets a 503.
+                self.logger.exception(f"Failed to post {len(batch)} Minecraft events for {route.server_id}")
+
+    async def post_events(self, route, batch):
+        events = []
+        for event, content in batch:
+            line = self.format_event(event, content)
+            if line:
+                events.append((event, content, line))
+        if route.channel_webhook:
+            events = await self.post_via_channel_webhook(route, events)
+            if not events:
+                return
+        channel = self.bot.get_channel(route.channel_id) if route.channel_id else None
+        if not channel:
+            self.logger.warning(f"Discord channel for {route.server_id} not found; dropping {len(batch)} Minecraft events")
+            return
+        for message in pack_lines([line for _, _, line in events]):
+            try:
+                await channel.send(message)
+            except discord.HTTPException as e:
+                self.logger.error(f"Failed to post Minecraft events to Discord: {str(e)}")
+
+    async def post_via_channel_webhook(self, route, events) -> list:
+        """Post events through the channel webhook; returns those left for the channel if the webhook is gone."""
+        sent = 0
+        for post, count in plan_webhook_posts(events):
+            try:
+                await route.channel_webhook.send(allowed_mentions=discord.AllowedMentions.none(), **post)
+            except (discord.NotFound, discord.Forbidden) as e:
+                self.logger.error(f"Channel webhook for {route.server_id} unusable, posting to the channel instead: {str(e)}")
+                route.channel_webhook = None
+                return events[sent:]
+            except discord.HTTPException as e:
+                self.logger.error(f"Failed to post Minecraft events through the channel webhook: {str(e)}")
+            sent += count
+        return []
+
+    async def send_to_minecraft(self, route, message, author_name):
+        host = route.rcon_host
+        port = route.rcon_port
+        client = route.get_rcon_client()
+        author_name = mc_clean_name(author_name)
+        message = strip_mc_formatting(message)
 
         # Calculate prefix and maximum segment length
         prefix = f"(Discord) {author_name}: "
@@ -144,28 +252,12 @@ class MCChatBridge(commands.Cog):
         max_total_length = 256  # Minecraft's max chat length
         max_content_length = (max_segment_length * 2) - prefix_length  # Max for two segments
 
-        # Construct base JSON message components
-        base_json = [
-            {"text": "(", "color": "white"},
-            {"text": "Discord", "color": "aqua"},
-            {"text": ") ", "color": "white"},
-            {"text": f"{author_name}: ", "color": "white"}
-        ]
-
         # Check if the message fits in one segment
         full_message = f"(Discord) {author_name}: {message}"
         if len(full_message) <= max_total_length:
             self.logger.info(f"Attempting to send to Minecraft: host={host}, port={port}, message={full_message}")
             try:
-                def run_mcrcon():
-                    with MCRcon(host, password, port=port, timeout=5) as client:
-                        json_message = json.dumps(base_json + [{"text": message, "color": "white"}])
-                        response = client.command(f"tellraw @a {json_message}")
-                        return response
-
-                self.logger.debug("Creating RCON client")
-                response = await self.bot.loop.run_in_executor(None, run_mcrcon)
-                self.logger.debug("RCON client connected, sent command")
+                response = await client.command(self.DISCORD_TELLRAW.render(author=author_name, message=message))
                 self.logger.info(f"Sent to Minecraft: {full_message}, Response: {response}")
                 return response
             except Exception as e:
@@ -193,54 +285,48 @@ class MCChatBridge(commands.Cog):
             if current_segment and len(segments) < 2:
                 segments.append(current_segment.strip())
 
-            # Send each segment
-            responses = []
+            # Send the segments together; the client pipelines them on one connection
+            commands = []
             for i, segment in enumerate(segments[:2]):  # Limit to two segments
                 segment_message = f"(Discord) {author_name}: {segment}"
                 if len(segment_message) > max_total_length:
                     self.logger.warning(f"Segment {i+1} too long even after splitting: {len(segment_message)} characters")
                     continue
                 self.logger.info(f"Attempting to send to Minecraft (segment {i+1}/{len(segments)}): host={host}, port={port}, message={segment_message}")
-                try:
-                    def run_mcrcon():
-                        with MCRcon(host, password, port=port, timeout=5) as client:
-                            json_message = json.dumps(base_json + [{"text": segment, "color": "white"}])
-                            response = client.command(f"tellraw @a {json_message}")
-                            return response
-
-                    self.logger.debug(f"Creating RCON client for segment {i+1}")
-                    response = await self.bot.loop.run_in_executor(None, run_mcrcon)
-                    self.logger.debug(f"RCON client connected, sent segment {i+1}")
-                    self.logger.info(f"Sent to Minecraft (segment {i+1}/{len(segments)}): {segment_message}, Response: {response}")
-                    responses.append(response)
-                except Exception as e:
-                    self.logger.error(f"Failed to send to Minecraft (segment {i+1}/{len(segments)}): host={host}, port={port}, error={str(e)}", exc_info=True)
-                    raise
-            return responses
+                commands.append(self.DISCORD_TELLRAW.render(author=author_name, message=segment))
+            try:
+                responses = await asyncio.gather(*(client.command(command) for command in commands))
+                self.logger.info(f"Sent {len(responses)} segments to Minecraft for {author_name}, Responses: {responses}")
+                return responses
+            except Exception as e:
+                self.logger.error(f"Failed to send to Minecraft: host={host}, port={port}, error={str(e)}", exc_info=True)
+                raise
 
     @commands.Cog.listener()
     async def on_message(self, message):
         if message.author.bot:
             return
-        guild = message.guild
-        if not guild:
+        if not message.guild:
             return
-        channel_id = await self.config.guild(guild).discord_channel_id()
-        if message.channel.id != channel_id:
+        route = self.routes.by_channel.get(message.channel.id)
+        if route is None:
             return
         prefixes = await self.bot.get_prefix(message)
         if any(message.content.startswith(prefix) for prefix in prefixes):
             return
         try:
-            await self.send_to_minecraft(message.content, message.author.display_name)
+            await self.send_to_minecraft(route, message.content, message.author.display_name)
         except Exception as e:
             self.logger.error(f"Failed to forward Discord message to Minecraft: {str(e)}")
         await self.bot.process_commands(message)
 
     @commands.command()
-    async def mcstatus(self, ctx):
-        guild = ctx.guild
-        server_ip = await self.config.guild(guild).server_ip()
+    async def mcstatus(self, ctx, server_id: str = None):
+        route = self.routes.by_id.get(server_id) if server_id else self.route_for_context(ctx)
+        if route is None or route.guild_id != ctx.guild.id:
+            await ctx.send("No Minecraft server is bridged here. Name one: [p]mcstatus <server_id>")
+            return
+        server_ip = route.server_ip
 
         try:
             server = await self.bot.loop.run_in_executor(None, mcstatus.JavaServer.lookup, server_ip)
@@ -255,67 +341,216 @@ class MCChatBridge(commands.Cog):
             self.logger.error(f"Failed to get server status: {str(e)}")
             await ctx.send(f"Failed to connect to server: {str(e)}")
 
+    def route_for_context(self, ctx):
+        """The server bridged to the command's channel, or the guild's only server."""
+        route = self.routes.by_channel.get(ctx.channel.id)
+        if route is None:
+            routes = self.routes.for_guild(ctx.guild.id)
+            route = routes[0] if len(routes) == 1 else None
+        return route
+
+    async def resolve_server(self, ctx, server_id):
+        """The server a settings command applies to; tells the user and returns None if it's unclear."""
+        if server_id:
+            route = self.routes.by_id.get(server_id)
+            if route is None or route.guild_id != ctx.guild.id:
+                await ctx.send(f"No Minecraft server `{server_id}` in this Discord server. See [p]mcbridge server list.")
+                return None
+            return route
+        routes = self.routes.for_guild(ctx.guild.id)
+        if not routes:
+            await ctx.send("No Minecraft server is set up here yet. Add one with [p]mcbridge server add <server_id>.")
+            return None
+        route = self.route_for_context(ctx)
+        if route is None:
+            await ctx.send(f"Several servers are set up here; name one: {', '.join(r.server_id for r in routes)}")
+        return route
+
+    async def update_server(self, route, key, value):
+        await self.config.servers.set_raw(route.server_id, key, value=value)
+        await self.rebuild_routes()
+
+    async def find_channel_webhook(self, channel):
+        """The bot's existing bridge webhook in ``channel``, or a new one if there is none."""
+        for webhook in await channel.webhooks():
+            if webhook.name == self.CHANNEL_WEBHOOK_NAME and webhook.token and webhook.user == self.bot.user:
+                return webhook
+        return await channel.create_webhook(name=self.CHANNEL_WEBHOOK_NAME, reason="Minecraft chat bridge")
+
+    async def delete_channel_webhook(self, url):
+        """Delete a bridge webhook that is no longer used; it may already be gone."""
+        try:
+            await discord.Webhook.from_url(url, session=self.session).delete(reason="Minecraft chat bridge moved or disabled")
+        except discord.NotFound:
+            pass
+        except discord.HTTPException as e:
+            self.logger.warning(f"Could not delete the old channel webhook: {str(e)}")
+
     @commands.group(name="mcbridge", aliases=["mc"])
     @commands.is_owner()
     async def mcbridge(self, ctx):
-        """Configure the Minecraft chat bridge (also available as 'mc'). Restricted to bot owner."""
+        """Configure the Minecraft chat bridge (also available as 'mc'). Restricted to bot owner.
+
+        Settings commands take an optional server ID at the end. It can be left
+        out in the server's bridge channel or when only one server is set up.
+        """
+        pass
+
+    @mcbridge.group(name="server")
+    async def mcbridge_server(self, ctx):
+        """Add, remove and list the Minecraft servers bridged to this Discord server."""
         pass
 
+    @mcbridge_server.command(name="add")
+    async def server_add(self, ctx, server_id: str):
+        """Add a Minecraft server; its plugin posts to /minecraft/<server_id>."""
+        if not SERVER_ID_RE.fullmatch(server_id) or server_id in RESERVED_SERVER_IDS:
+            await ctx.send("Server IDs are up to 32 letters, digits, '-' or '_', and can't be 'batch'.")
+            return
+        if server_id in self.routes.by_id:
+            await ctx.send(f"A server named `{server_id}` already exists.")
+            return
+        await self.config.servers.set_raw(server_id, value={**SERVER_DEFAULTS, "guild_id": ctx.guild.id})
+        await self.rebuild_routes()
+        await ctx.send(f"Server `{server_id}` added. Set it up with [p]mcbridge setchannel, setrconhost, setrconpassword and setsecrettoken.")
+
+    @mcbridge_server.command(name="remove")
+    async def server_remove(self, ctx, server_id: str):
+        """Stop bridging a Minecraft server and forget its settings."""
+        route = await self.resolve_server(ctx, server_id)
+        if route is None:
+            return
+        if route.channel_webhook_url:
+            await self.delete_channel_webhook(route.channel_webhook_url)
+        await self.config.servers.clear_raw(server_id)
+        await self.rebuild_routes()
+        await ctx.send(f"Server `{server_id}` removed.")
+
+    @mcbridge_server.command(name="list")
+    async def server_list(self, ctx):
+        """List the Minecraft servers bridged to this Discord server."""
+        routes = self.routes.for_guild(ctx.guild.id)
+        if not routes:
+            await ctx.send("No Minecraft servers are set up here. Add one with [p]mcbridge server add <server_id>.")
+            return
+        lines = []
+        for route in routes:
+            channel = self.bot.get_channel(route.channel_id) if route.channel_id else None
+            lines.append(f"`{route.server_id}`: {channel.mention if channel else 'no channel'}, RCON {route.rcon_host}:{route.rcon_port}, webhook path /minecraft/{route.server_id}")
+        await ctx.send("\n".join(lines))
+
     @mcbridge.command()
-    async def setchannel(self, ctx, channel: discord.TextChannel):
+    async def setchannel(self, ctx, channel: discord.TextChannel, server_id: str = None):
         """Set the Discord channel for the chat bridge."""
-        await self.config.guild(ctx.guild).discord_channel_id.set(channel.id)
+        route = await self.resolve_server(ctx, server_id)
+        if route is None:
+            return
+        owner = self.routes.by_channel.get(channel.id)
+        if owner is not None and owner is not route:
+            await ctx.send(f"{channel.name} is already bridged to `{owner.server_id}`.")
+            return
+        await self.update_server(route, "discord_channel_id", channel.id)
         await ctx.send(f"Discord channel set to: {channel.name} (ID: {channel.id})")
+        if route.channel_webhook_url:
+            # The old webhook posts to the old channel
+            await ctx.invoke(self.setchannelwebhook, enabled=True, server_id=route.server_id)
 
     @mcbridge.command()
-    async def setrconhost(self, ctx, host: str):
+    async def setrconhost(self, ctx, host: str, server_id: str = None):
         """Set the RCON host (IP or address)."""
-        await self.config.guild(ctx.guild).rcon_host.set(host)
+        route = await self.resolve_server(ctx, server_id)
+        if route is None:
+            return
+        await self.update_server(route, "rcon_host", host)
         await ctx.send(f"RCON host set to: {host}")
 
     @mcbridge.command()
-    async def setrconport(self, ctx, port: int):
+    async def setrconport(self, ctx, port: int, server_id: str = None):
         """Set the RCON port."""
-        await self.config.guild(ctx.guild).rcon_port.set(port)
+        route = await self.resolve_server(ctx, server_id)
+        if route is None:
+            return
+        await self.update_server(route, "rcon_port", port)
         await ctx.send(f"RCON port set to: {port}")
 
     @mcbridge.command()
-    async def setrconpassword(self, ctx, password: str):
+    async def setrconpassword(self, ctx, password: str, server_id: str = None):
         """Set the RCON password."""
-        await self.config.guild(ctx.guild).rcon_password.set(password)
+        route = await self.resolve_server(ctx, server_id)
+        if route is None:
+            return
+        await self.update_server(route, "rcon_password", password)
         await ctx.send("RCON password set.")
 
     @mcbridge.command()
     async def setwebhookport(self, ctx, port: int):
-        """Set the webhook port."""
-        await self.config.guild(ctx.guild).webhook_port.set(port)
+        """Set the webhook port, shared by all servers."""
+        await self.config.webhook_port.set(port)
         await ctx.send(f"Webhook port set to: {port}")
         await ctx.send("Please restart the bot to apply webhook port changes")
 
     @mcbridge.command()
-    async def setsecrettoken(self, ctx, token: str):
+    async def setsecrettoken(self, ctx, token: str, server_id: str = None):
         """Set the secret token for webhook authentication."""
-        await self.config.guild(ctx.guild).secret_token.set(token)
+        route = await self.resolve_server(ctx, server_id)
+        if route is None:
+            return
+        await self.update_server(route, "secret_token", token)
         await ctx.send("Secret token set.")
 
     @mcbridge.command()
-    async def setserverip(self, ctx, server_ip: str):
+    async def setchannelwebhook(self, ctx, enabled: bool, server_id: str = None):
+        """Post relayed events through a webhook in the bridge channel, under each player's name and head."""
+        route = await self.resolve_server(ctx, server_id)
+        if route is None:
+            return
+        old_url = route.channel_webhook_url
+        if not enabled:
+            await self.update_server(route, "channel_webhook_url", None)
+            if old_url:
+                await self.delete_channel_webhook(old_url)
+            await ctx.send("Channel webhook disabled; events are posted by the bot.")
+            return
+        channel = self.bot.get_channel(route.channel_id) if route.channel_id else None
+        if not channel:
+            await ctx.send("Set the bridge channel first with [p]mcbridge setchannel.")
+            return
+        try:
+            webhook = await self.find_channel_webhook(channel)
+        except discord.HTTPException as e:
+            await ctx.send(f"Could not create a webhook in {channel.name} (the bot needs Manage Webhooks): {str(e)}")
+            return
+        await self.update_server(route, "channel_webhook_url", webhook.url)
+        if old_url and discord.Webhook.from_url(old_url, session=self.session).id != webhook.id:
+            await self.delete_channel_webhook(old_url)
+        await ctx.send(f"Channel webhook enabled in {channel.name}.")
+
+    @mcbridge.command()
+    async def setserverip(self, ctx, server_ip: str, server_id: str = None):
         """Set the Minecraft server IP and port (e.g., localhost:25565)."""
-        await self.config.guild(ctx.guild).server_ip.set(server_ip)
+        route = await self.resolve_server(ctx, server_id)
+        if route is None:
+            return
+        await self.update_server(route, "server_ip", server_ip)
         await ctx.send(f"Server IP set to: {server_ip}")
 
     @mcbridge.command()
-    async def showsettings(self, ctx):
+    async def showsettings(self, ctx, server_id: str = None):
         """Show the current settings for the Minecraft chat bridge."""
-        channel = self.bot.get_channel(await self.config.guild(ctx.guild).discord_channel_id()) if await self.config.guild(ctx.guild).discord_channel_id() else None
+        route = await self.resolve_server(ctx, server_id)
+        if route is None:
+            return
+        channel = self.bot.get_channel(route.channel_id) if route.channel_id else None
         settings_message = (
-            f"**Current Settings:**\n"
-            f"Discord Channel: {channel.name if channel else 'Not set'} (ID: {await self.config.guild(ctx.guild).discord_channel_id() or 'Not set'})\n"
-            f"RCON Host: {await self.config.guild(ctx.guild).rcon_host() or 'Not set'}\n"
-            f"RCON Port: {await self.config.guild(ctx.guild).rcon_port() or 'Not set'}\n"
-            f"RCON Password: {'Set' if await self.config.guild(ctx.guild).rcon_password() else 'Not set'}\n"
-            f"Webhook Port: {await self.config.guild(ctx.guild).webhook_port() or 'Not set'}\n"
-            f"Secret Token: {'Set' if await self.config.guild(ctx.guild).secret_token() else 'Not set'}\n"
-            f"Server IP: {await self.config.guild(ctx.guild).server_ip() or 'Not set'}"
+            f"**Current Settings ({route.server_id}):**\n"
+            f"Discord Channel: {channel.name if channel else 'Not set'} (ID: {route.channel_id or 'Not set'})\n"
+            f"RCON Host: {route.rcon_host or 'Not set'}\n"
+            f"RCON Port: {route.rcon_port or 'Not set'}\n"
+            f"RCON Password: {'Set' if route.rcon_password else 'Not set'}\n"
+            f"Webhook Port: {await self.config.webhook_port() or 'Not set'}\n"
+            f"Webhook Path: /minecraft/{route.server_id}\n"
+            f"Secret Token: {'Set' if route.secret_token else 'Not set'}\n"
+            f"Channel Webhook: {'Enabled' if route.channel_webhook_url else 'Disabled'}\n"
+            f"Server IP: {route.server_ip or 'Not set'}"
         )
-        await ctx.send(settings_message)
\ No newline at end of file
+        await ctx.send(settings_message)
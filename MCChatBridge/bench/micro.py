@@ -0,0 +1,151 @@
+"""Microbenchmarks for death and advancement classification.
+
+Run from the directory that contains the cog, e.g.::
+
+    python -m MCChatBridge.bench.micro
+    python -m MCChatBridge.bench.micro --save baseline.json
+    python -m MCChatBridge.bench.micro --compare baseline.json --tolerance 0.15
+
+The events are generated from the vanilla catalog at a fixed seed, weighted
+towards the deaths and advancements a survival server sees most.
+``--compare`` exits with status 1 if any benchmark got slower than the saved
+baseline by more than the tolerance.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+
+from ..catalog import match_advancement, match_death
+from ..vanilla import ADVANCEMENTS, DEATH_MESSAGES, ROOT
+
+LEGACY_DEATH_EMOJIS = {
+    "fell from a high place": "🪂",
+    "by drowned": "🔱",
+    "drowned": "🌊",
+    "was slain by": "⚔️",
+    "burned to death": "🔥",
+    "was blown up by": "💥",
+    "hit the ground too hard": "🪂",
+    "was shot by": "🏹",
+    "was killed by": "💀"
+}
+LEGACY_UNWANTED_ADVANCEMENTS = ["recipe", "edit", "remove", "convert", "interacted_with_dirt_golem", "sleep_bed"]
+
+COMMON_DEATHS = ["death.attack.mob", "death.attack.arrow", "death.attack.explosion.player", "death.attack.fall",
+                 "death.fell.accident.generic", "death.attack.lava", "death.attack.drown", "death.attack.player.item"]
+PLAYERS = ["Steve", "Alex", "xX_Slayer_Xx", "Notch", "builder42", "Jakendary"]
+KILLERS = ["Zombie", "Skeleton", "Creeper", "Drowned", "Wither Skeleton", "Enderman", "Steve", "Alex"]
+WEAPONS = ["[Diamond Sword]", "[Bow]", "[Trident]", "[Excalibur]"]
+
+
+def legacy_death_emoji(content):
+    return next((e for k, e in LEGACY_DEATH_EMOJIS.items() if k in content.lower()), "💀")
+
+
+def legacy_advancement_wanted(content):
+    return not any(unwanted in content.lower() for unwanted in LEGACY_UNWANTED_ADVANCEMENTS)
+
+
+def build_corpus(count=5000, seed=0):
+    """``count`` death messages and ``count`` advancement events."""
+    rng = random.Random(seed)
+    keys = list(DEATH_MESSAGES)
+    deaths = []
+    for _ in range(count):
+        key = rng.choice(COMMON_DEATHS) if rng.random() < 0.7 else rng.choice(keys)
+        deaths.append(DEATH_MESSAGES[key].replace("%1$s", rng.choice(PLAYERS))
+                      .replace("%2$s", rng.choice(KILLERS)).replace("%3$s", rng.choice(WEAPONS)))
+    announced = [(adv_id, title) for adv_id, (title, frame) in ADVANCEMENTS.items() if frame != ROOT]
+    advancements = []
+    for _ in range(count):
+        player = rng.choice(PLAYERS)
+        adv_id, title = rng.choice(announced)
+        roll = rng.random()
+        if roll < 0.5:
+            advancements.append(f"{player} has made the advancement [{title}]")
+        elif roll < 0.8:
+            advancements.append(f"{player} minecraft:recipes/misc/{rng.choice(['charcoal', 'bread', 'torch', 'stick'])}")
+        else:
+            advancements.append(f"{player} {adv_id}")
+    return deaths, advancements
+
+
+def measure(func, items, repeat):
+    """Best-of-``repeat`` time for one pass of ``func`` over ``items``, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            func(item)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def build_benchmarks(deaths, advancements):
+    return {
+        "deaths_legacy": (legacy_death_emoji, deaths),
+        "deaths": (match_death, deaths),
+        "advancements_legacy": (legacy_advancement_wanted, advancements),
+        "advancements": (match_advancement, advancements),
+    }
+
+
+def run(deaths, advancements, repeat):
+    results = {}
+    for name, (func, items) in build_benchmarks(deaths, advancements).items():
+        elapsed = measure(func, items, repeat)
+        results[name] = {
+            "items": len(items),
+            "ns_per_item": elapsed / len(items) * 1e9 if items else 0.0,
+            "items_per_sec": len(items) / elapsed if elapsed else 0.0,
+        }
+    return results
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]["ns_per_item"]
+        after = result["ns_per_item"]
+        if before and after > before * (1 + tolerance):
+            regressions.append(f"{name}: {before:.0f} -> {after:.0f} ns/item (+{(after / before - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=5000, help="deaths and advancements to generate")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the generated events")
+    parser.add_argument("--repeat", type=int, default=5, help="passes per benchmark; the best one is reported")
+    parser.add_argument("--save", metavar="FILE", help="write results as JSON")
+    parser.add_argument("--compare", metavar="FILE", help="fail if slower than this JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown for --compare (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    deaths, advancements = build_corpus(args.events, args.seed)
+    results = run(deaths, advancements, args.repeat)
+    print(f"corpus: {len(deaths)} deaths, {len(advancements)} advancements (seed {args.seed})")
+    for name, result in results.items():
+        print(f"{name:<22} {result['items']:>7} items  {result['ns_per_item']:>9.0f} ns/item  {result['items_per_sec']:>12,.0f} items/s")
+    unmatched = sum(1 for death in deaths if match_death(death).key is None)
+    disagree = sum(1 for death in deaths if legacy_death_emoji(death) != match_death(death).emoji)
+    print(f"deaths unmatched by the catalog: {unmatched}; legacy emoji differs on {disagree}")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("Regressions:\n  " + "\n  ".join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
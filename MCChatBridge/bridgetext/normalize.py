@@ -0,0 +1,57 @@
+import codecs
+import re
+from functools import lru_cache
+
+Q3_COLOR_RE = re.compile(r"\^\d")
+
+# Typographic characters Discord clients insert that have plain stand-ins;
+# without these "don’t" would reach the game as "dont".
+_LATIN1_FALLBACKS = {
+    "\u2018": "'", "\u2019": "'", "\u201a": "'", "\u2032": "'",
+    "\u201c": '"', "\u201d": '"', "\u201e": '"', "\u2033": '"',
+    "\u2013": "-", "\u2014": "-", "\u2212": "-",
+    "\u2026": "...",
+    "\u2022": "*",
+    "\u2002": " ", "\u2003": " ", "\u2009": " ", "\u202f": " ",
+}
+
+
+def _latin1_fallback(error):
+    # Only called for the runs the codec can't encode; the rest stays in C.
+    bad = error.object[error.start:error.end]
+    return "".join(_LATIN1_FALLBACKS.get(c, "") for c in bad), error.end
+
+
+# Named after this module, so the copy bundled with each cog registers its own.
+_LATIN1_ERRORS = f"{__name__}.latin1"
+codecs.register_error(_LATIN1_ERRORS, _latin1_fallback)
+
+
+def strip_q3_colors(text):
+    """Remove Quake 3 ``^N`` color codes; ``None`` becomes ``""``."""
+    if not text:
+        return ""
+    if "^" not in text:
+        return text
+    return Q3_COLOR_RE.sub("", text)
+
+
+def to_latin1(text):
+    """Map typographic characters to plain ones and drop whatever Latin-1 can't encode."""
+    if text.isascii():
+        return text
+    return text.encode("latin-1", _LATIN1_ERRORS).decode("latin-1")
+
+
+# Player names repeat on almost every line, so their cleaned forms are cached.
+
+@lru_cache(maxsize=4096)
+def q3_clean_name(name):
+    """A Jedi Academy player name without color codes."""
+    return strip_q3_colors(name)
+
+
+@lru_cache(maxsize=4096)
+def latin1_name(name):
+    """A Discord display name as the game can show it."""
+    return to_latin1(name)
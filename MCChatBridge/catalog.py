@@ -0,0 +1,156 @@
+import re
+
+from .vanilla import ADVANCEMENTS, CHALLENGE, DEATH_EMOJIS, DEATH_MESSAGES, GOAL, ROOT, TASK
+
+DEFAULT_DEATH_EMOJI = "💀"
+ADVANCEMENT_EMOJIS = {TASK: "🏆", GOAL: "🎯", CHALLENGE: "🏅"}
+ADVANCEMENT_VERBS = {TASK: "has made the advancement", GOAL: "has reached the goal", CHALLENGE: "has completed the challenge"}
+
+# Not in the language file, but how plugins and datapacks word a kill; read
+# as the game's own generic kill, with a killer.
+EXTRA_DEATH_MESSAGES = [
+    ("death.attack.genericKill", "%1$s was killed by %2$s"),
+]
+
+_ARG_RE = re.compile(r"%(\d)\$s")
+_ARG_GROUPS = {"2": "k", "3": "w"}  # killer, weapon
+
+
+class Death:
+    __slots__ = ("key", "victim", "killer", "weapon", "emoji")
+
+    def __init__(self, key, victim, killer=None, weapon=None, emoji=DEFAULT_DEATH_EMOJI):
+        self.key = key
+        self.victim = victim
+        self.killer = killer
+        self.weapon = weapon
+        self.emoji = emoji
+
+    def __repr__(self):
+        return f"Death({self.key!r}, victim={self.victim!r}, killer={self.killer!r}, weapon={self.weapon!r})"
+
+
+class Advancement:
+    __slots__ = ("player", "id", "title", "frame", "text")
+
+    def __init__(self, player, id, title, frame=TASK, text=None):
+        self.player = player
+        self.id = id
+        self.title = title
+        self.frame = frame
+        # How the game words it, for events that arrive as a bare ID
+        self.text = text or f"{player} {ADVANCEMENT_VERBS.get(frame, ADVANCEMENT_VERBS[TASK])} [{title}]"
+
+    @property
+    def emoji(self):
+        return ADVANCEMENT_EMOJIS.get(self.frame, "🏆")
+
+    def __repr__(self):
+        return f"Advancement({self.player!r}, {self.id!r}, {self.title!r}, {self.frame!r})"
+
+
+def _death_cause(key):
+    """``death.attack.mob.item`` -> ``attack.mob``; the fell keys keep their second part."""
+    parts = key.split(".")
+    return ".".join(parts[1:3])
+
+
+def _death_bucket(body):
+    """The first two words after the victim; no template has an argument there."""
+    return " ".join(body.split(" ", 2)[:2])
+
+
+def _compile_bucket(branches):
+    """One pattern for a bucket's templates, plus what each branch's groups mean.
+
+    Each template is a branch named ``d<n>``; since it is the last group to
+    close, ``match.lastgroup`` names the template that matched. Branches
+    with more fixed text go first, so "shot by a skull from X" isn't read as
+    "shot by X" and "slain by X using Y" isn't read as "slain by X".
+    """
+    branches = sorted(branches, key=lambda branch: -len(_ARG_RE.sub("", branch[1])))
+    parts = []
+    meta = {}
+    for n, (key, body) in enumerate(branches):
+        pieces = []
+        pos = 0
+        for arg in _ARG_RE.finditer(body):
+            pieces.append(re.escape(body[pos:arg.start()]))
+            pieces.append(f"(?P<{_ARG_GROUPS[arg.group(1)]}{n}>.+?)")
+            pos = arg.end()
+        pieces.append(re.escape(body[pos:]))
+        parts.append(f"(?P<d{n}>{''.join(pieces)})")
+        emoji = DEATH_EMOJIS.get(_death_cause(key), DEFAULT_DEATH_EMOJI)
+        meta[f"d{n}"] = (key, f"k{n}" if "%2$s" in body else None, f"w{n}" if "%3$s" in body else None, emoji)
+    return re.compile("|".join(parts)), meta
+
+
+def _compile_deaths(messages):
+    """Map the first two words after the victim to the compiled pattern for the templates starting with them.
+
+    ``messages`` is a list of ``(key, template)`` pairs; of two keys with the
+    same template, the first one wins. A message then costs a split, a dict
+    lookup and a match against the handful of templates that share its
+    opening, however long the catalog.
+    """
+    buckets = {}
+    seen = set()
+    for key, template in messages:
+        if template in seen:
+            continue  # e.g. mob and player kills read the same
+        seen.add(template)
+        if not template.startswith("%1$s "):
+            raise ValueError(f"{key}: death message must start with the victim")
+        body = template[len("%1$s "):]
+        if "%" in _death_bucket(body):
+            raise ValueError(f"{key}: death message needs two fixed words after the victim")
+        buckets.setdefault(_death_bucket(body), []).append((key, body))
+    return {bucket: _compile_bucket(branches) for bucket, branches in buckets.items()}
+
+
+_DEATH_MATCHERS = _compile_deaths(list(DEATH_MESSAGES.items()) + EXTRA_DEATH_MESSAGES)
+
+_ADVANCEMENT_CHAT_RE = re.compile(
+    r"(?P<player>\S+) has (?:made the advancement|reached the goal|completed the challenge) \[(?P<title>.+)\]"
+)
+_ADVANCEMENT_ID_RE = re.compile(r"(?P<id>[a-z0-9_.-]+:[a-z0-9_./-]+)")
+_ADVANCEMENTS_BY_TITLE = {title: (adv_id, frame) for adv_id, (title, frame) in ADVANCEMENTS.items() if frame != ROOT}
+
+
+def match_death(content):
+    """Classify a death message; unknown messages get the victim's first word and no key."""
+    victim, _, rest = content.partition(" ")
+    matcher = _DEATH_MATCHERS.get(_death_bucket(rest))
+    match = matcher[0].fullmatch(rest) if matcher else None
+    if match is None:
+        return Death(None, victim)
+    key, killer, weapon, emoji = matcher[1][match.lastgroup]
+    return Death(
+        key,
+        victim,
+        match.group(killer) if killer else None,
+        match.group(weapon) if weapon else None,
+        emoji,
+    )
+
+
+def match_advancement(content):
+    """Classify an advancement event, or return None if it shouldn't be announced.
+
+    The game's own "X has made the advancement [Title]" line is always
+    announced. A bare advancement ID is announced only if it is a vanilla
+    advancement that the game would announce too, which leaves out recipe
+    unlocks, tab roots and plugin or datapack bookkeeping.
+    """
+    match = _ADVANCEMENT_CHAT_RE.fullmatch(content)
+    if match is not None:
+        title = match.group("title")
+        adv_id, frame = _ADVANCEMENTS_BY_TITLE.get(title, (None, TASK))
+        return Advancement(match.group("player"), adv_id, title, frame, text=content)
+    match = _ADVANCEMENT_ID_RE.search(content)
+    if match is None:
+        return Advancement(content.split(" ", 1)[0], None, None, text=content)
+    entry = ADVANCEMENTS.get(match.group("id"))
+    if entry is None or entry[1] == ROOT:
+        return None
+    return Advancement(content.split(" ", 1)[0], match.group("id"), *entry)
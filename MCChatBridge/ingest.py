@@ -0,0 +1,72 @@
+import json
+
+from aiohttp import web
+
+KNOWN_EVENTS = frozenset({"chat", "connect", "disconnect", "death", "advancement"})
+MAX_BATCH_EVENTS = 500
+NDJSON_TYPES = frozenset({"application/x-ndjson", "application/ndjson", "application/jsonl", "application/x-jsonlines"})
+
+
+def validate_event(payload):
+    """Return ``(event, data)`` for a well-formed plugin event, or raise ``ValueError``."""
+    if not isinstance(payload, dict):
+        raise ValueError("event must be a JSON object")
+    event = payload.get("event")
+    data = payload.get("data")
+    if event not in KNOWN_EVENTS:
+        raise ValueError(f"unknown event {event!r}")
+    if not isinstance(data, str) or not data:
+        raise ValueError(f"{event} event needs a non-empty string 'data'")
+    return event, data
+
+
+async def read_event(request):
+    """The single event in a ``/minecraft`` request body."""
+    try:
+        payload = await request.json()
+    except ValueError:
+        raise web.HTTPBadRequest(text="Body is not valid JSON")
+    try:
+        return validate_event(payload)
+    except ValueError as e:
+        raise web.HTTPBadRequest(text=str(e))
+
+
+async def read_batch(request):
+    """The events in a ``/minecraft/batch`` body: a JSON array, or NDJSON read line by line.
+
+    The whole batch is rejected if any event is malformed, so the plugin can
+    safely resend it unchanged.
+    """
+    events = []
+
+    def add(payload, where):
+        if len(events) >= MAX_BATCH_EVENTS:
+            raise web.HTTPRequestEntityTooLarge(MAX_BATCH_EVENTS, len(events) + 1, text=f"A batch holds at most {MAX_BATCH_EVENTS} events")
+        try:
+            events.append(validate_event(payload))
+        except ValueError as e:
+            raise web.HTTPBadRequest(text=f"{where}: {e}")
+
+    if request.content_type in NDJSON_TYPES:
+        line_number = 0
+        async for line in request.content:
+            line_number += 1
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                payload = json.loads(line)
+            except ValueError:
+                raise web.HTTPBadRequest(text=f"line {line_number}: not valid JSON")
+            add(payload, f"line {line_number}")
+    else:
+        try:
+            payload = await request.json()
+        except ValueError:
+            raise web.HTTPBadRequest(text="Body is not valid JSON")
+        if not isinstance(payload, list):
+            raise web.HTTPBadRequest(text="Batch body must be a JSON array or NDJSON")
+        for index, item in enumerate(payload):
+            add(item, f"event {index}")
+    return events
@@ -0,0 +1,172 @@
+import asyncio
+import itertools
+import logging
+import struct
+
+logger = logging.getLogger("red.MCChatBridge.rcon")
+
+SERVERDATA_AUTH = 3
+SERVERDATA_AUTH_RESPONSE = 2
+SERVERDATA_EXECCOMMAND = 2
+SERVERDATA_RESPONSE_VALUE = 0
+
+MAX_COMMAND_BYTES = 1446  # the largest request body a Minecraft server reads
+MAX_RESPONSE_FRAGMENT = 4096  # longer replies arrive split into packets of this size
+
+
+class RconError(Exception):
+    """Raised when an RCON command cannot be delivered."""
+
+
+def _pack(request_id, kind, body) -> bytes:
+    payload = struct.pack("<ii", request_id, kind) + body + b"\x00\x00"
+    return struct.pack("<i", len(payload)) + payload
+
+
+class RconClient:
+    """Source RCON client holding one authenticated TCP connection to a Minecraft server.
+
+    The connection is opened and authenticated on first use and kept between
+    commands. Every command carries its own request ID, so several can be in
+    flight at once: each is written as soon as it is issued and resolved when
+    the reply with its ID comes back. After a failed connect, further
+    attempts wait out a backoff that doubles up to ``max_backoff`` seconds;
+    commands issued during it fail at once instead of piling up.
+    """
+
+    def __init__(self, host, port, password, *, timeout=5.0, min_backoff=1.0, max_backoff=30.0):
+        self.host = host
+        self.port = int(port)
+        self.password = password
+        self.timeout = timeout
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self._writer = None
+        self._read_task = None
+        self._pending = {}  # request ID -> (future, response fragments)
+        self._ids = itertools.count(1)
+        self._connect_lock = asyncio.Lock()
+        self._backoff = 0.0
+        self._retry_at = 0.0
+
+    def matches(self, host, port, password) -> bool:
+        return (self.host, self.port, self.password) == (host, int(port), password)
+
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None and not self._writer.is_closing()
+
+    def _next_id(self) -> int:
+        request_id = next(self._ids)
+        if request_id >= 2 ** 31 - 1:
+            self._ids = itertools.count(1)
+        return request_id
+
+    async def _ensure_connected(self):
+        if self.connected:
+            return
+        async with self._connect_lock:
+            if self.connected:
+                return
+            loop = asyncio.get_running_loop()
+            wait = self._retry_at - loop.time()
+            if wait > 0:
+                raise RconError(f"RCON to {self.host}:{self.port} is down; retrying in {wait:.1f}s")
+            try:
+                await asyncio.wait_for(self._connect(), self.timeout)
+            except (OSError, asyncio.TimeoutError, RconError) as e:
+                self._close_connection()
+                self._backoff = min(self.max_backoff, self._backoff * 2 or self.min_backoff)
+                self._retry_at = loop.time() + self._backoff
+                logger.warning(f"RCON connect to {self.host}:{self.port} failed ({e or 'timed out'}); next attempt in {self._backoff:.1f}s")
+                raise RconError(f"RCON error: {e or 'connect timed out'}") from e
+            self._backoff = 0.0
+            logger.info(f"RCON connected to {self.host}:{self.port}")
+
+    async def _connect(self):
+        reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        request_id = self._next_id()
+        self._writer.write(_pack(request_id, SERVERDATA_AUTH, self.password.encode("utf-8")))
+        # Nothing else is in flight yet, so the reply can be read inline.
+        while True:
+            reply_id, kind, _ = await self._read_packet(reader)
+            if kind == SERVERDATA_AUTH_RESPONSE:
+                break
+        if reply_id == -1:
+            raise RconError("RCON authentication failed; check the password")
+        if reply_id != request_id:
+            raise RconError(f"RCON authentication got a reply for request {reply_id}")
+        self._read_task = asyncio.get_running_loop().create_task(self._read_loop(reader, self._writer))
+
+    @staticmethod
+    async def _read_packet(reader):
+        (length,) = struct.unpack("<i", await reader.readexactly(4))
+        if length < 10:
+            raise RconError(f"RCON packet too short ({length} bytes)")
+        data = await reader.readexactly(length)
+        request_id, kind = struct.unpack_from("<ii", data)
+        return request_id, kind, data[8:-2]
+
+    async def _read_loop(self, reader, writer):
+        error = None
+        try:
+            while True:
+                request_id, kind, body = await self._read_packet(reader)
+                entry = self._pending.get(request_id)
+                if entry is None:
+                    continue  # a command that already timed out
+                future, fragments = entry
+                fragments.append(body)
+                # A full-size fragment means more of the same reply follows.
+                if len(body) < MAX_RESPONSE_FRAGMENT:
+                    del self._pending[request_id]
+                    if not future.done():
+                        future.set_result(b"".join(fragments).decode("utf-8", errors="replace"))
+        except asyncio.CancelledError:
+            raise
+        except (OSError, asyncio.IncompleteReadError, RconError) as e:
+            error = e
+        finally:
+            # close() may already have dropped this connection and a new one taken its place.
+            if self._writer is writer:
+                logger.info(f"RCON connection to {self.host}:{self.port} closed{f': {error}' if error else ''}")
+                self._read_task = None
+                self._close_connection()
+                self._fail_pending(RconError(f"RCON connection lost: {error or 'closed'}"))
+
+    def _fail_pending(self, error):
+        pending, self._pending = self._pending, {}
+        for future, _ in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    async def command(self, command) -> str:
+        """Run a command and return the server's reply."""
+        body = command.encode("utf-8")
+        if len(body) > MAX_COMMAND_BYTES:
+            raise RconError(f"RCON command is {len(body)} bytes; the server accepts at most {MAX_COMMAND_BYTES}")
+        await self._ensure_connected()
+        request_id = self._next_id()
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = (future, [])
+        try:
+            self._writer.write(_pack(request_id, SERVERDATA_EXECCOMMAND, body))
+            return await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError:
+            raise RconError(f"RCON command timed out after {self.timeout:.0f}s") from None
+        except OSError as e:
+            raise RconError(f"RCON error: {e}") from e
+        finally:
+            self._pending.pop(request_id, None)
+
+    def _close_connection(self):
+        if self._writer is not None:
+            self._writer.close()
+        self._writer = None
+
+    def close(self):
+        if self._read_task is not None:
+            self._read_task.cancel()
+            self._read_task = None
+        self._close_connection()
+        self._fail_pending(RconError("RCON client closed"))
@@ -0,0 +1,117 @@
+import asyncio
+import logging
+import re
+
+import discord
+
+from .rcon import RconClient
+
+logger = logging.getLogger("red.MCChatBridge.routing")
+
+SERVER_DEFAULTS = {
+    "guild_id": None,
+    "discord_channel_id": None,
+    "rcon_host": "localhost",
+    "rcon_port": 25575,
+    "rcon_password": "",
+    "secret_token": "",
+    "server_ip": "localhost:25565",
+    "channel_webhook_url": None,
+}
+# Server IDs appear in webhook paths; "batch" would shadow /minecraft/batch.
+SERVER_ID_RE = re.compile(r"[A-Za-z0-9_-]{1,32}")
+RESERVED_SERVER_IDS = frozenset({"batch"})
+
+
+class Route:
+    """One bridged Minecraft server: its guild and channel, its console and its event queue."""
+
+    def __init__(self, server_id, settings, *, session, queue_size):
+        self.server_id = server_id
+        self.session = session
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.worker_task = None
+        self.rcon_client = None
+        self.channel_webhook = None
+        self.channel_webhook_url = None
+        self.update(settings)
+
+    def update(self, settings):
+        settings = {**SERVER_DEFAULTS, **settings}
+        self.guild_id = settings["guild_id"]
+        self.channel_id = settings["discord_channel_id"]
+        self.rcon_host = settings["rcon_host"]
+        self.rcon_port = settings["rcon_port"]
+        self.rcon_password = settings["rcon_password"]
+        self.secret_token = settings["secret_token"]
+        self.server_ip = settings["server_ip"]
+        if settings["channel_webhook_url"] != self.channel_webhook_url:
+            self.channel_webhook_url = settings["channel_webhook_url"]
+            self.channel_webhook = (
+                discord.Webhook.from_url(self.channel_webhook_url, session=self.session)
+                if self.channel_webhook_url else None
+            )
+
+    def get_rcon_client(self) -> RconClient:
+        """Return the persistent RCON client, replacing it if the settings changed."""
+        if self.rcon_client is None or not self.rcon_client.matches(self.rcon_host, self.rcon_port, self.rcon_password):
+            if self.rcon_client:
+                self.rcon_client.close()
+            self.rcon_client = RconClient(self.rcon_host, self.rcon_port, self.rcon_password)
+        return self.rcon_client
+
+    async def stop(self):
+        if self.worker_task and not self.worker_task.done():
+            self.worker_task.cancel()
+            try:
+                await self.worker_task
+            except asyncio.CancelledError:
+                pass
+        if self.rcon_client:
+            self.rcon_client.close()
+            self.rcon_client = None
+
+
+class RoutingTable:
+    """In-memory index of the bridged servers by ID, webhook token and Discord channel.
+
+    ``rebuild`` is called with the stored server settings whenever they
+    change. Routes that survive keep their queue, worker and RCON
+    connection; only their settings are refreshed.
+    """
+
+    def __init__(self, *, session, queue_size):
+        self.session = session
+        self.queue_size = queue_size
+        self.by_id = {}
+        self.by_token = {}
+        self.by_channel = {}
+
+    def rebuild(self, servers):
+        """Sync with ``servers`` (server ID -> settings); returns the routes added and removed."""
+        added = []
+        for server_id, settings in servers.items():
+            route = self.by_id.get(server_id)
+            if route is None:
+                route = self.by_id[server_id] = Route(server_id, settings, session=self.session, queue_size=self.queue_size)
+                added.append(route)
+            else:
+                route.update(settings)
+        removed = [self.by_id.pop(server_id) for server_id in list(self.by_id) if server_id not in servers]
+
+        self.by_token = {}
+        shared = set()
+        for route in self.by_id.values():
+            if not route.secret_token:
+                continue
+            if route.secret_token in self.by_token:
+                shared.add(route.secret_token)
+            self.by_token[route.secret_token] = route
+        for token in shared:
+            route = self.by_token.pop(token)
+            logger.warning(f"Server {route.server_id} shares its secret token with another server; both can only be reached as /minecraft/<server_id>")
+        self.by_channel = {route.channel_id: route for route in self.by_id.values() if route.channel_id}
+        return added, removed
+
+    def for_guild(self, guild_id):
+        return [route for route in self.by_id.values() if route.guild_id == guild_id]
@@ -0,0 +1,54 @@
+import discord
+
+from .bridgetext import DISCORD_MESSAGE_LIMIT
+
+MAX_EMBEDS = 10  # per webhook request
+AVATAR_URL = "https://mc-heads.net/avatar/{}/64"
+EVENT_COLORS = {
+    "connect": discord.Color.green(),
+    "disconnect": discord.Color.red(),
+    "death": discord.Color.dark_grey(),
+    "advancement": discord.Color.gold(),
+}
+
+
+def event_player(event, content):
+    """The player an event is about; Minecraft names never contain spaces."""
+    if event == "chat":
+        return content.split(": ", 1)[0]
+    return content.split(" ", 1)[0]
+
+
+def plan_webhook_posts(events):
+    """Group ``(event, content, line)`` tuples into as few webhook requests as keep them in order.
+
+    Chat is posted as plain content under the player's name and head, with
+    consecutive lines from the same player sharing a request. Every other
+    event becomes an embed headed by the player, up to ``MAX_EMBEDS`` per
+    request. Returns ``(kwargs, count)`` pairs: the keyword arguments for
+    each ``Webhook.send`` and how many of ``events`` it carries.
+    """
+    posts = []
+    counts = []
+    for event, content, line in events:
+        last = posts[-1] if posts else None
+        if event == "chat" and ": " in content:
+            player, message = content.split(": ", 1)
+            if (last and last.get("username") == player
+                    and len(last["content"]) + 1 + len(message) <= DISCORD_MESSAGE_LIMIT):
+                last["content"] += "\n" + message
+                counts[-1] += 1
+            else:
+                posts.append({"username": player, "avatar_url": AVATAR_URL.format(player), "content": message[:DISCORD_MESSAGE_LIMIT]})
+                counts.append(1)
+            continue
+        player = event_player(event, content)
+        embed = discord.Embed(description=line, color=EVENT_COLORS.get(event, discord.Color.blurple()))
+        embed.set_author(name=player, icon_url=AVATAR_URL.format(player))
+        if last and "embeds" in last and len(last["embeds"]) < MAX_EMBEDS:
+            last["embeds"].append(embed)
+            counts[-1] += 1
+        else:
+            posts.append({"embeds": [embed]})
+            counts.append(1)
+    return list(zip(posts, counts))
@@ -0,0 +1,262 @@
+"""Vanilla Minecraft (Java Edition 1.21) death messages and advancements.
+
+``DEATH_MESSAGES`` holds the ``death.*`` templates from the game's en_us
+language file: ``%1$s`` is the victim, ``%2$s`` the killer and ``%3$s`` the
+weapon. ``ADVANCEMENTS`` maps each advancement ID to its title and frame;
+roots are listed too, although the game never announces them.
+"""
+
+DEATH_MESSAGES = {
+    "death.attack.anvil": "%1$s was squashed by a falling anvil",
+    "death.attack.anvil.player": "%1$s was squashed by a falling anvil while fighting %2$s",
+    "death.attack.arrow": "%1$s was shot by %2$s",
+    "death.attack.arrow.item": "%1$s was shot by %2$s using %3$s",
+    # %2$s is always the "[Intentional Game Design]" link; spelt out so this
+    # doesn't claim every "was killed by" death as a bed explosion.
+    "death.attack.badRespawnPoint.message": "%1$s was killed by [Intentional Game Design]",
+    "death.attack.cactus": "%1$s was pricked to death",
+    "death.attack.cactus.player": "%1$s walked into a cactus while trying to escape %2$s",
+    "death.attack.cramming": "%1$s was squished too much",
+    "death.attack.cramming.player": "%1$s was squashed by %2$s",
+    "death.attack.dragonBreath": "%1$s was roasted in dragon's breath",
+    "death.attack.dragonBreath.player": "%1$s was roasted in dragon's breath by %2$s",
+    "death.attack.drown": "%1$s drowned",
+    "death.attack.drown.player": "%1$s drowned while trying to escape %2$s",
+    "death.attack.dryout": "%1$s died from dehydration",
+    "death.attack.dryout.player": "%1$s died from dehydration while trying to escape %2$s",
+    "death.attack.even_more_magic": "%1$s was killed by even more magic",
+    "death.attack.explosion": "%1$s blew up",
+    "death.attack.explosion.player": "%1$s was blown up by %2$s",
+    "death.attack.explosion.player.item": "%1$s was blown up by %2$s using %3$s",
+    "death.attack.fall": "%1$s hit the ground too hard",
+    "death.attack.fall.player": "%1$s hit the ground too hard while trying to escape %2$s",
+    "death.attack.fallingBlock": "%1$s was squashed by a falling block",
+    "death.attack.fallingBlock.player": "%1$s was squashed by a falling block while fighting %2$s",
+    "death.attack.fallingStalactite": "%1$s was skewered by a falling stalactite",
+    "death.attack.fallingStalactite.player": "%1$s was skewered by a falling stalactite while fighting %2$s",
+    "death.attack.fireball": "%1$s was fireballed by %2$s",
+    "death.attack.fireball.item": "%1$s was fireballed by %2$s using %3$s",
+    "death.attack.fireworks": "%1$s went off with a bang",
+    "death.attack.fireworks.item": "%1$s went off with a bang due to a firework fired from %3$s by %2$s",
+    "death.attack.fireworks.player": "%1$s went off with a bang while fighting %2$s",
+    "death.attack.flyIntoWall": "%1$s experienced kinetic energy",
+    "death.attack.flyIntoWall.player": "%1$s experienced kinetic energy while trying to escape %2$s",
+    "death.attack.freeze": "%1$s froze to death",
+    "death.attack.freeze.player": "%1$s was frozen to death by %2$s",
+    "death.attack.generic": "%1$s died",
+    "death.attack.generic.player": "%1$s died because of %2$s",
+    "death.attack.genericKill": "%1$s was killed",
+    "death.attack.genericKill.player": "%1$s was killed while fighting %2$s",
+    "death.attack.hotFloor": "%1$s discovered the floor was lava",
+    "death.attack.hotFloor.player": "%1$s walked into the danger zone due to %2$s",
+    "death.attack.inFire": "%1$s went up in flames",
+    "death.attack.inFire.player": "%1$s walked into fire while fighting %2$s",
+    "death.attack.inWall": "%1$s suffocated in a wall",
+    "death.attack.inWall.player": "%1$s suffocated in a wall while fighting %2$s",
+    "death.attack.indirectMagic": "%1$s was killed by %2$s using magic",
+    "death.attack.indirectMagic.item": "%1$s was killed by %2$s using %3$s",
+    "death.attack.lava": "%1$s tried to swim in lava",
+    "death.attack.lava.player": "%1$s tried to swim in lava to escape %2$s",
+    "death.attack.lightningBolt": "%1$s was struck by lightning",
+    "death.attack.lightningBolt.player": "%1$s was struck by lightning while fighting %2$s",
+    "death.attack.mace_smash": "%1$s was smashed by %2$s",
+    "death.attack.mace_smash.item": "%1$s was smashed by %2$s with %3$s",
+    "death.attack.magic": "%1$s was killed by magic",
+    "death.attack.magic.player": "%1$s was killed by magic while trying to escape %2$s",
+    "death.attack.mob": "%1$s was slain by %2$s",
+    "death.attack.mob.item": "%1$s was slain by %2$s using %3$s",
+    "death.attack.onFire": "%1$s burned to death",
+    "death.attack.onFire.item": "%1$s was burned to a crisp while fighting %2$s wielding %3$s",
+    "death.attack.onFire.player": "%1$s was burned to a crisp while fighting %2$s",
+    "death.attack.outOfWorld": "%1$s fell out of the world",
+    "death.attack.outOfWorld.player": "%1$s didn't want to live in the same world as %2$s",
+    "death.attack.outsideBorder": "%1$s left the confines of this world",
+    "death.attack.outsideBorder.player": "%1$s left the confines of this world while fighting %2$s",
+    "death.attack.player": "%1$s was slain by %2$s",
+    "death.attack.player.item": "%1$s was slain by %2$s using %3$s",
+    "death.attack.sonic_boom": "%1$s was obliterated by a sonically-charged shriek",
+    "death.attack.sonic_boom.item": "%1$s was obliterated by a sonically-charged shriek while trying to escape %2$s wielding %3$s",
+    "death.attack.sonic_boom.player": "%1$s was obliterated by a sonically-charged shriek while trying to escape %2$s",
+    "death.attack.spit": "%1$s was spit by %2$s",
+    "death.attack.spit.item": "%1$s was spit by %2$s using %3$s",
+    "death.attack.stalagmite": "%1$s was impaled on a stalagmite",
+    "death.attack.stalagmite.player": "%1$s was impaled on a stalagmite while fighting %2$s",
+    "death.attack.starve": "%1$s starved to death",
+    "death.attack.starve.player": "%1$s starved to death while fighting %2$s",
+    "death.attack.sting": "%1$s was stung to death",
+    "death.attack.sting.item": "%1$s was stung to death by %2$s using %3$s",
+    "death.attack.sting.player": "%1$s was stung to death by %2$s",
+    "death.attack.sweetBerryBush": "%1$s was poked to death by a sweet berry bush",
+    "death.attack.sweetBerryBush.player": "%1$s was poked to death by a sweet berry bush while trying to escape %2$s",
+    "death.attack.thorns": "%1$s was killed while trying to hurt %2$s",
+    "death.attack.thorns.item": "%1$s was killed by %3$s while trying to hurt %2$s",
+    "death.attack.thrown": "%1$s was pummeled by %2$s",
+    "death.attack.thrown.item": "%1$s was pummeled by %2$s using %3$s",
+    "death.attack.trident": "%1$s was impaled by %2$s",
+    "death.attack.trident.item": "%1$s was impaled by %2$s with %3$s",
+    "death.attack.wither": "%1$s withered away",
+    "death.attack.wither.player": "%1$s withered away while fighting %2$s",
+    "death.attack.witherSkull": "%1$s was shot by a skull from %2$s",
+    "death.attack.witherSkull.item": "%1$s was shot by a skull from %2$s using %3$s",
+    "death.fell.accident.generic": "%1$s fell from a high place",
+    "death.fell.accident.ladder": "%1$s fell off a ladder",
+    "death.fell.accident.other_climbable": "%1$s fell while climbing",
+    "death.fell.accident.scaffolding": "%1$s fell off scaffolding",
+    "death.fell.accident.twisting_vines": "%1$s fell off some twisting vines",
+    "death.fell.accident.vines": "%1$s fell off some vines",
+    "death.fell.accident.weeping_vines": "%1$s fell off some weeping vines",
+    "death.fell.assist": "%1$s was doomed to fall by %2$s",
+    "death.fell.assist.item": "%1$s was doomed to fall by %2$s using %3$s",
+    "death.fell.finish": "%1$s fell too far and was finished by %2$s",
+    "death.fell.finish.item": "%1$s fell too far and was finished by %2$s using %3$s",
+    "death.fell.killer": "%1$s was doomed to fall",
+}
+
+# Emoji per death cause: the part of the key after "death." and before any ".player"/".item".
+DEATH_EMOJIS = {
+    "attack.anvil": "🪨", "attack.fallingBlock": "🪨", "attack.fallingStalactite": "🪨",
+    "attack.stalagmite": "🪨", "attack.cramming": "🪨", "attack.inWall": "🪨",
+    "attack.arrow": "🏹", "attack.witherSkull": "🏹", "attack.spit": "🏹",
+    "attack.trident": "🔱",
+    "attack.drown": "🌊", "attack.dryout": "🌊",
+    "attack.explosion": "💥", "attack.fireworks": "💥", "attack.fireball": "💥", "attack.badRespawnPoint": "💥",
+    "attack.inFire": "🔥", "attack.onFire": "🔥", "attack.lava": "🔥", "attack.hotFloor": "🔥",
+    "attack.fall": "🪂", "attack.flyIntoWall": "🪂", "fell.accident": "🪂", "fell.assist": "🪂",
+    "fell.finish": "🪂", "fell.killer": "🪂",
+    "attack.mob": "⚔️", "attack.player": "⚔️", "attack.mace_smash": "⚔️", "attack.thrown": "⚔️",
+    "attack.sting": "⚔️", "attack.thorns": "⚔️",
+    "attack.freeze": "🥶",
+    "attack.lightningBolt": "⚡",
+    "attack.magic": "🧪", "attack.indirectMagic": "🧪", "attack.even_more_magic": "🧪",
+    "attack.dragonBreath": "🧪", "attack.wither": "🧪",
+    "attack.starve": "🍗",
+    "attack.cactus": "🌵", "attack.sweetBerryBush": "🌵",
+    "attack.outOfWorld": "🌌", "attack.outsideBorder": "🌌",
+    "attack.sonic_boom": "🔊",
+}
+
+ROOT, TASK, GOAL, CHALLENGE = "root", "task", "goal", "challenge"
+
+ADVANCEMENTS = {
+    "minecraft:story/root": ("Minecraft", ROOT),
+    "minecraft:story/mine_stone": ("Stone Age", TASK),
+    "minecraft:story/upgrade_tools": ("Getting an Upgrade", TASK),
+    "minecraft:story/smelt_iron": ("Acquire Hardware", TASK),
+    "minecraft:story/obtain_armor": ("Suit Up", TASK),
+    "minecraft:story/lava_bucket": ("Hot Stuff", TASK),
+    "minecraft:story/iron_tools": ("Isn't It Iron Pick", TASK),
+    "minecraft:story/deflect_arrow": ("Not Today, Thank You", TASK),
+    "minecraft:story/form_obsidian": ("Ice Bucket Challenge", TASK),
+    "minecraft:story/mine_diamond": ("Diamonds!", TASK),
+    "minecraft:story/enter_the_nether": ("We Need to Go Deeper", TASK),
+    "minecraft:story/shiny_gear": ("Cover Me with Diamonds", TASK),
+    "minecraft:story/enchant_item": ("Enchanter", TASK),
+    "minecraft:story/cure_zombie_villager": ("Zombie Doctor", GOAL),
+    "minecraft:story/follow_ender_eye": ("Eye Spy", TASK),
+    "minecraft:story/enter_the_end": ("The End?", TASK),
+    "minecraft:nether/root": ("Nether", ROOT),
+    "minecraft:nether/return_to_sender": ("Return to Sender", CHALLENGE),
+    "minecraft:nether/find_bastion": ("Those Were the Days", TASK),
+    "minecraft:nether/obtain_ancient_debris": ("Hidden in the Depths", TASK),
+    "minecraft:nether/fast_travel": ("Subspace Bubble", CHALLENGE),
+    "minecraft:nether/find_fortress": ("A Terrible Fortress", TASK),
+    "minecraft:nether/obtain_crying_obsidian": ("Who is Cutting Onions?", TASK),
+    "minecraft:nether/distract_piglin": ("Oh Shiny", TASK),
+    "minecraft:nether/ride_strider": ("This Boat Has Legs", TASK),
+    "minecraft:nether/uneasy_alliance": ("Uneasy Alliance", CHALLENGE),
+    "minecraft:nether/loot_bastion": ("War Pigs", TASK),
+    "minecraft:nether/use_lodestone": ("Country Lode, Take Me Home", TASK),
+    "minecraft:nether/netherite_armor": ("Cover Me in Debris", CHALLENGE),
+    "minecraft:nether/get_wither_skull": ("Spooky Scary Skeleton", TASK),
+    "minecraft:nether/obtain_blaze_rod": ("Into Fire", TASK),
+    "minecraft:nether/charge_respawn_anchor": ("Not Quite \"Nine\" Lives", TASK),
+    "minecraft:nether/ride_strider_in_overworld_lava": ("Feels Like Home", TASK),
+    "minecraft:nether/explore_nether": ("Hot Tourist Destinations", CHALLENGE),
+    "minecraft:nether/summon_wither": ("Withering Heights", TASK),
+    "minecraft:nether/brew_potion": ("Local Brewery", TASK),
+    "minecraft:nether/create_beacon": ("Bring Home the Beacon", TASK),
+    "minecraft:nether/all_potions": ("A Furious Cocktail", CHALLENGE),
+    "minecraft:nether/create_full_beacon": ("Beaconator", GOAL),
+    "minecraft:nether/all_effects": ("How Did We Get Here?", CHALLENGE),
+    "minecraft:end/root": ("The End", ROOT),
+    "minecraft:end/kill_dragon": ("Free the End", TASK),
+    "minecraft:end/dragon_egg": ("The Next Generation", GOAL),
+    "minecraft:end/enter_end_gateway": ("Remote Getaway", TASK),
+    "minecraft:end/respawn_dragon": ("The End... Again...", GOAL),
+    "minecraft:end/dragon_breath": ("You Need a Mint", GOAL),
+    "minecraft:end/find_end_city": ("The City at the End of the Game", TASK),
+    "minecraft:end/elytra": ("Sky's the Limit", GOAL),
+    "minecraft:end/levitate": ("Great View From Up Here", CHALLENGE),
+    "minecraft:adventure/root": ("Adventure", ROOT),
+    "minecraft:adventure/voluntary_exile": ("Voluntary Exile", TASK),
+    "minecraft:adventure/spyglass_at_parrot": ("Is It a Bird?", TASK),
+    "minecraft:adventure/kill_a_mob": ("Monster Hunter", TASK),
+    "minecraft:adventure/read_power_of_chiseled_bookshelf": ("The Power of Books", TASK),
+    "minecraft:adventure/trade": ("What a Deal!", TASK),
+    "minecraft:adventure/trim_with_any_armor_pattern": ("Crafting a New Look", TASK),
+    "minecraft:adventure/honey_block_slide": ("Sticky Situation", TASK),
+    "minecraft:adventure/ol_betsy": ("Ol' Betsy", TASK),
+    "minecraft:adventure/lightning_rod_with_villager_no_fire": ("Surge Protector", TASK),
+    "minecraft:adventure/fall_from_world_height": ("Caves & Cliffs", TASK),
+    "minecraft:adventure/salvage_sherd": ("Respecting the Remnants", TASK),
+    "minecraft:adventure/avoid_vibration": ("Sneak 100", TASK),
+    "minecraft:adventure/sleep_in_bed": ("Sweet Dreams", TASK),
+    "minecraft:adventure/hero_of_the_village": ("Hero of the Village", CHALLENGE),
+    "minecraft:adventure/spyglass_at_ghast": ("Is It a Balloon?", TASK),
+    "minecraft:adventure/throw_trident": ("A Throwaway Joke", TASK),
+    "minecraft:adventure/kill_mob_near_sculk_catalyst": ("It Spreads", TASK),
+    "minecraft:adventure/shoot_arrow": ("Take Aim", TASK),
+    "minecraft:adventure/kill_all_mobs": ("Monsters Hunted", CHALLENGE),
+    "minecraft:adventure/totem_of_undying": ("Postmortal", GOAL),
+    "minecraft:adventure/summon_iron_golem": ("Hired Help", GOAL),
+    "minecraft:adventure/trade_at_world_height": ("Star Trader", TASK),
+    "minecraft:adventure/trim_with_all_exclusive_armor_patterns": ("Smithing with Style", CHALLENGE),
+    "minecraft:adventure/two_birds_one_arrow": ("Two Birds, One Arrow", CHALLENGE),
+    "minecraft:adventure/whos_the_pillager_now": ("Who's the Pillager Now?", TASK),
+    "minecraft:adventure/arbalistic": ("Arbalistic", CHALLENGE),
+    "minecraft:adventure/craft_decorated_pot_using_only_sherds": ("Careful Restoration", TASK),
+    "minecraft:adventure/adventuring_time": ("Adventuring Time", CHALLENGE),
+    "minecraft:adventure/play_jukebox_in_meadows": ("Sound of Music", TASK),
+    "minecraft:adventure/walk_on_powder_snow_with_leather_boots": ("Light as a Rabbit", TASK),
+    "minecraft:adventure/spyglass_at_dragon": ("Is It a Plane?", TASK),
+    "minecraft:adventure/very_very_frightening": ("Very Very Frightening", TASK),
+    "minecraft:adventure/sniper_duel": ("Sniper Duel", CHALLENGE),
+    "minecraft:adventure/bullseye": ("Bullseye", CHALLENGE),
+    "minecraft:adventure/minecraft_trials_edition": ("Minecraft: Trial(s) Edition", TASK),
+    "minecraft:adventure/under_lock_and_key": ("Under Lock and Key", TASK),
+    "minecraft:adventure/revaulting": ("Revaulting", GOAL),
+    "minecraft:adventure/blowback": ("Blowback", CHALLENGE),
+    "minecraft:adventure/who_needs_rockets": ("Who Needs Rockets?", TASK),
+    "minecraft:adventure/crafters_crafting_crafters": ("Crafters Crafting Crafters", TASK),
+    "minecraft:adventure/lighten_up": ("Lighten Up", TASK),
+    "minecraft:adventure/overoverkill": ("Over-Overkill", CHALLENGE),
+    "minecraft:husbandry/root": ("Husbandry", ROOT),
+    "minecraft:husbandry/safely_harvest_honey": ("Bee Our Guest", TASK),
+    "minecraft:husbandry/breed_an_animal": ("The Parrots and the Bats", TASK),
+    "minecraft:husbandry/allay_deliver_item_to_player": ("You've Got a Friend in Me", TASK),
+    "minecraft:husbandry/ride_a_boat_with_a_goat": ("Whatever Floats Your Goat!", TASK),
+    "minecraft:husbandry/tame_an_animal": ("Best Friends Forever", TASK),
+    "minecraft:husbandry/make_a_sign_glow": ("Glow and Behold!", TASK),
+    "minecraft:husbandry/fishy_business": ("Fishy Business", TASK),
+    "minecraft:husbandry/silk_touch_nest": ("Total Beelocation", TASK),
+    "minecraft:husbandry/tadpole_in_a_bucket": ("Bukkit Bukkit", TASK),
+    "minecraft:husbandry/obtain_sniffer_egg": ("Smells Interesting", TASK),
+    "minecraft:husbandry/plant_seed": ("A Seedy Place", TASK),
+    "minecraft:husbandry/wax_on": ("Wax On", TASK),
+    "minecraft:husbandry/bred_all_animals": ("Two by Two", CHALLENGE),
+    "minecraft:husbandry/allay_deliver_cake_to_note_block": ("Birthday Song", TASK),
+    "minecraft:husbandry/complete_catalogue": ("A Complete Catalogue", CHALLENGE),
+    "minecraft:husbandry/tactical_fishing": ("Tactical Fishing", TASK),
+    "minecraft:husbandry/leash_all_frog_variants": ("When the Squad Hops into Town", TASK),
+    "minecraft:husbandry/feed_snifflet": ("Little Sniffs", TASK),
+    "minecraft:husbandry/balanced_diet": ("A Balanced Diet", CHALLENGE),
+    "minecraft:husbandry/obtain_netherite_hoe": ("Serious Dedication", CHALLENGE),
+    "minecraft:husbandry/wax_off": ("Wax Off", TASK),
+    "minecraft:husbandry/axolotl_in_a_bucket": ("The Cutest Predator", TASK),
+    "minecraft:husbandry/froglights": ("With Our Powers Combined!", GOAL),
+    "minecraft:husbandry/plant_any_sniffer_seed": ("Planting the Past", TASK),
+    "minecraft:husbandry/kill_axolotl_target": ("The Healing Power of Friendship!", GOAL),
+    "minecraft:husbandry/whole_pack": ("The Whole Pack", CHALLENGE),
+    "minecraft:husbandry/repair_wolf_armor": ("Good as New", TASK),
+    "minecraft:husbandry/remove_wolf_armor": ("Shear Brilliance", TASK),
+}
@@ -0,0 +1,26 @@
+from MCChatBridge.catalog import DEFAULT_DEATH_EMOJI, match_death
+from MCChatBridge.vanilla import DEATH_MESSAGES
+
+
+def render(template, killer="Zombie", weapon="[Diamond Sword]"):
+    return template.replace("%1$s", "Steve").replace("%2$s", killer).replace("%3$s", weapon)
+
+
+def test_killed_by_is_a_generic_kill():
+    death = match_death("Steve was killed by Zombie")
+    assert death.key == "death.attack.genericKill"
+    assert (death.victim, death.killer) == ("Steve", "Zombie")
+    assert death.emoji == DEFAULT_DEATH_EMOJI
+
+
+def test_bad_respawn_point_needs_its_link():
+    death = match_death("Steve was killed by [Intentional Game Design]")
+    assert death.key == "death.attack.badRespawnPoint.message"
+    assert death.emoji == "💥"
+
+
+def test_every_vanilla_template_matches_itself():
+    for key, template in DEATH_MESSAGES.items():
+        death = match_death(render(template))
+        assert DEATH_MESSAGES[death.key] == template, key
+        assert death.victim == "Steve"